@@ -0,0 +1,186 @@
+"""
+Headless batch runner: solve many instance files with several algorithms.
+
+Every (instance, algorithm) pair runs in its own worker process, at most --jobs at a
+time. The solver returns its best cover when --time-limit runs out, and the worker is
+killed if it has not answered KILL_GRACE_PERIOD seconds later. One JSON object per
+finished job is written to --output (or stdout) as soon as it is available. Neither tkinter nor
+matplotlib is imported, so this runs on servers without a display:
+
+    python batch.py instances/ "data/scp4*.txt" -a Greedy "Linear Programming" -j 8 -t 60
+
+With --cache FILE, results are kept in an sqlite file shared by the workers and by
+later runs, so repeated instances are answered without solving them again.
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import wait
+from model.model import ALGORITHM_FUNCTIONS, MatrixModel
+from utils.processes import kill_process_group, start_process_group
+
+# Seconds a job may run past its time limit (to return its best cover) before it is killed.
+KILL_GRACE_PERIOD = 5.0
+
+
+def find_instances(patterns):
+    """
+    Expand directories, glob patterns and file names into a sorted list of files.
+
+    :param patterns: List of directory paths, glob patterns or file paths.
+    :return: List of instance file paths.
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.update(os.path.join(pattern, name) for name in os.listdir(pattern))
+        else:
+            paths.update(glob.glob(pattern))
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def run_job(path, fmt, algorithm, use_presolve, cache_path, time_limit, connection):
+    """
+    Solve one instance with one algorithm and send the result record back.
+
+    Runs in a worker process; the dispatch goes through MatrixModel.run_algorithm, the
+    same path the GUI uses.
+    """
+    start_process_group()
+    start_time = time.perf_counter()
+    try:
+        model = MatrixModel()
+        if cache_path:
+            model.enable_cache(path=cache_path)
+        model.load_instance(path, fmt)
+        if time_limit is not None:
+            # Loading counts against the job's limit
+            time_limit = max(0.0, time_limit - (time.perf_counter() - start_time))
+        model.run_algorithm(algorithm, use_presolve=use_presolve, time_limit=time_limit)
+        result = model.get_result(algorithm)
+        record = {
+            'status': result.status,
+            'cover_size': result.objective,
+            'rows': result.rows,
+            'lower_bound': result.lower_bound,
+            'gap': result.gap,
+            'cached': result.details.get('cached', False),
+        }
+    except Exception as e:
+        record = {'status': 'error', 'error': str(e)}
+    record['runtime'] = time.perf_counter() - start_time
+    connection.send(record)
+    connection.close()
+
+
+def run_batch(paths, algorithms, jobs, time_limit, output, fmt=None, use_presolve=True, cache_path=None):
+    """
+    Run every (instance, algorithm) pair and stream one JSON line per finished job.
+
+    :param paths: List of instance file paths.
+    :param algorithms: List of algorithm names (keys of ALGORITHM_FUNCTIONS).
+    :param jobs: Maximum number of jobs running at the same time.
+    :param time_limit: Per-job wall-clock limit in seconds, or None; jobs still running
+                       KILL_GRACE_PERIOD seconds later are killed.
+    :param output: Writable text stream for the JSON lines.
+    :param fmt: Optional instance format name; detected per file when None.
+    :param use_presolve: Whether MatrixModel presolves the instances.
+    :param cache_path: Optional sqlite result cache file shared by all jobs.
+    :return: Tuple of (number of jobs that did not finish with a cover, number of jobs
+             answered from the cache).
+    """
+    pending = [(path, algorithm) for path in paths for algorithm in algorithms]
+    pending.reverse()  # pop() takes jobs in order
+    running = {}  # receiving connection -> (process, path, algorithm, start time)
+    failures = 0
+    cache_hits = 0
+
+    def emit(path, algorithm, record):
+        nonlocal failures, cache_hits
+        if record['status'] in ('error', 'timeout') and not record.get('rows'):
+            failures += 1
+        if record.get('cached'):
+            cache_hits += 1
+        output.write(json.dumps({'instance': path, 'algorithm': algorithm, **record}) + '\n')
+        output.flush()
+
+    while pending or running:
+        # Start jobs until the pool is full
+        while pending and len(running) < jobs:
+            path, algorithm = pending.pop()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=run_job,
+                                              args=(path, fmt, algorithm, use_presolve, cache_path, time_limit,
+                                                    sender))
+            process.start()
+            sender.close()
+            running[receiver] = (process, path, algorithm, time.perf_counter())
+
+        # Wait for a result or for the earliest deadline
+        timeout = None
+        if time_limit is not None:
+            now = time.perf_counter()
+            kill_after = time_limit + KILL_GRACE_PERIOD
+            timeout = max(0.0, min(start + kill_after for _, _, _, start in running.values()) - now)
+        for receiver in wait(list(running), timeout):
+            process, path, algorithm, _ = running.pop(receiver)
+            try:
+                record = receiver.recv()
+            except EOFError:
+                record = {'status': 'error', 'error': f"worker exited with code {process.exitcode}"}
+            receiver.close()
+            process.join()
+            emit(path, algorithm, record)
+
+        # Kill jobs that ran past their time limit
+        if time_limit is not None:
+            now = time.perf_counter()
+            for receiver, (process, path, algorithm, start) in list(running.items()):
+                if now - start >= time_limit + KILL_GRACE_PERIOD:
+                    kill_process_group(process)
+                    receiver.close()
+                    del running[receiver]
+                    emit(path, algorithm, {'status': 'timeout', 'cover_size': None, 'rows': None,
+                                           'runtime': now - start})
+    return failures, cache_hits
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve minimum row coverage instances without the GUI.")
+    parser.add_argument('instances', nargs='+', help="Instance files, directories or glob patterns.")
+    parser.add_argument('-a', '--algorithms', nargs='+', default=['Greedy'], choices=list(ALGORITHM_FUNCTIONS),
+                        help="Algorithms to run on every instance.")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Number of jobs to run in parallel.")
+    parser.add_argument('-t', '--time-limit', type=float, default=None, help="Per-job time limit in seconds.")
+    parser.add_argument('-o', '--output', default=None, help="JSON lines output file (default: stdout).")
+    parser.add_argument('-f', '--format', default=None, help="Instance format (orlib, rail, sparse, packed).")
+    parser.add_argument('--no-presolve', action='store_true', help="Solve the instances without presolve.")
+    parser.add_argument('--cache', default=None, metavar='FILE',
+                        help="sqlite file caching results across jobs and runs.")
+    args = parser.parse_args(argv)
+
+    paths = find_instances(args.instances)
+    if not paths:
+        parser.error("no instance files found")
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        failures, cache_hits = run_batch(paths, args.algorithms, max(1, args.jobs), args.time_limit, output,
+                                         args.format, not args.no_presolve, args.cache)
+    finally:
+        if args.output:
+            output.close()
+    if args.cache:
+        total = len(paths) * len(args.algorithms)
+        print(f"cache: {cache_hits} of {total} jobs answered from the cache ({cache_hits / total:.0%})",
+              file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
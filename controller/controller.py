@@ -1,20 +1,44 @@
 import tkinter as tk
 from model.model import MatrixModel
-from utils.algorithms import branch_and_bound, greedy_algorithm, genetic_algorithm, linear_programming
+from utils.algorithms import OPTIMAL, TIMEOUT
 from view.view import MatrixView
 import matplotlib.pyplot as plt
-import time
+import threading
+from utils.control import SolveControl
+
+# How often the GUI polls the background solver for progress, in milliseconds.
+POLL_INTERVAL_MS = 100
+
+# Seconds of local search spent improving each algorithm's cover when enabled.
+IMPROVE_TIME = 1.0
+
+# Seconds spent computing a lower bound for algorithms that prove none, so every
+# result shows an optimality gap.
+BOUND_TIME = 1.0
+
 class MatrixController:
     def __init__(self, root):
         self.model = MatrixModel()
+        self.model.enable_cache()  # Clicking Calculate again on the same matrix reuses the results
         self.view = MatrixView(root)
         self.view.submit_button['command'] = self.main_logic 
         self.view.visualize_button.config(command=self.handle_visualize)
 
         self.view.compare_performance_button['command'] = self.handle_compare_performance
+        self.view.export_metrics_button['command'] = self.handle_export_metrics
+        self.view.cancel_button['command'] = self.handle_cancel
+
+        self.worker = None  # Background thread running the selected algorithms.
+        self.control = None  # SolveControl of the current or last run.
+        self.worker_error = None
+        self.finished_algorithms = []
+        self.portfolio_run = False  # Whether the last run was a concurrent portfolio.
 
 
     def main_logic(self):
+        if self.worker is not None and self.worker.is_alive():
+            return  # A run is already in progress
+
         try:
             matrix = self.view.get_matrix_input()
             if matrix is None:
@@ -22,46 +46,142 @@ class MatrixController:
 
             self.model.set_matrix(matrix)
             selected_algorithms = self.view.get_selected_algorithms()
-
-            # Run each selected algorithm and collect results
-            all_results = []
-            for algorithm in selected_algorithms:
-                self.model.run_algorithm(algorithm)
-                coverage_rows = self.model.get_coverage_rows(algorithm)
-                result_message = f"{algorithm}: Minimum rows for full coverage: " + ", ".join(str(row + 1) for row in coverage_rows)
-                all_results.append(result_message)
-
-            # Show a consolidated result.
-            final_message = '\n'.join(all_results)
-            self.view.show_result(final_message)
-
+            concurrent = self.view.get_concurrent() and len(selected_algorithms) > 1
+            time_limit = self.view.get_time_limit()
+            improve_time = IMPROVE_TIME if self.view.get_improve() else None
+            trace_memory = self.view.get_trace_memory()
         except Exception as e:
             self.view.show_error(str(e))
+            return
 
-    def determine_coverage(self, matrix, algorithm):
-        start_time = time.time()
-
-        if algorithm == "Branch and Bound":
-            result = branch_and_bound(matrix)
-        elif algorithm == "Greedy":
-            result = greedy_algorithm(matrix)
-        elif algorithm == "Genetic Algorithm":
-            result = genetic_algorithm(matrix)
-        elif algorithm == "Linear Programming":
-            result = linear_programming(matrix)
-        else:
-            raise ValueError(f"Unknown algorithm selected: {algorithm}")
-
-        end_time = time.time()
-        execution_time = end_time - start_time
-
-        # Record the execution time in the model
-        self.model.set_execution_time(algorithm, execution_time)
+        # Solve in a background thread so the window stays responsive; progress is
+        # polled from the Tk main loop.
+        self.control = SolveControl()
+        self.worker_error = None
+        self.finished_algorithms = []
+        self.portfolio_run = concurrent
+        self.worker = threading.Thread(target=self.run_algorithms,
+                                       args=(selected_algorithms, self.control, concurrent, time_limit, improve_time,
+                                             trace_memory),
+                                       daemon=True)
+        self.view.set_running(True)
+        self.worker.start()
+        self.view.root.after(POLL_INTERVAL_MS, self.poll_worker)
+
+    def run_algorithms(self, algorithms, control, concurrent=False, time_limit=None, improve_time=None,
+                       trace_memory=False):
+        """
+        Run the selected algorithms one after another, or all at once when concurrent;
+        called on the worker thread. The time limit applies to each algorithm (to the
+        whole portfolio when concurrent); local search only follows sequential runs.
+        """
+        try:
+            if concurrent:
+                control.report(algorithm="Portfolio")
+                best = self.model.run_portfolio(algorithms, control=control, time_limit=time_limit)
+                # Algorithms that failed or were stopped before returning have no result
+                errors = best.details.get('errors', {})
+                self.finished_algorithms = [algorithm for algorithm in algorithms if algorithm not in errors]
+                return
+            for algorithm in algorithms:
+                if control.cancelled:
+                    break
+                control.report(algorithm=algorithm, incumbent=None, nodes=None, generation=None, iteration=None,
+                               lower_bound=None)
+                self.model.run_algorithm(algorithm, control=control, time_limit=time_limit,
+                                         improve_time=improve_time, bound_time=BOUND_TIME,
+                                         trace_memory=trace_memory)
+                self.finished_algorithms.append(algorithm)
+        except Exception as e:
+            self.worker_error = e
+
+    def poll_worker(self):
+        """
+        Show the worker's progress, and its results once it has finished.
+        """
+        if self.worker.is_alive():
+            self.view.show_progress(self.format_progress(self.control.snapshot()))
+            self.view.root.after(POLL_INTERVAL_MS, self.poll_worker)
+            return
 
-        return result
+        self.view.set_running(False)
+        self.view.show_progress("")
+        if self.worker_error is not None:
+            self.view.show_error(str(self.worker_error))
+        elif self.finished_algorithms:
+            self.show_results(self.finished_algorithms, self.control.cancelled)
+
+    def handle_cancel(self):
+        # The solver stops at its next check and keeps the best cover found so far
+        if self.control is not None:
+            self.control.cancel()
+
+    def format_progress(self, progress):
+        parts = [progress.get('algorithm') or "Solving"]
+        if progress.get('incumbent') is not None:
+            parts.append(f"incumbent {progress['incumbent']} rows")
+        if progress.get('nodes') is not None:
+            parts.append(f"{progress['nodes']} nodes")
+        if progress.get('generation') is not None:
+            parts.append(f"generation {progress['generation']}")
+        if progress.get('iteration') is not None:
+            parts.append(f"iteration {progress['iteration']}")
+        if progress.get('lower_bound') is not None:
+            parts.append(f"bound {progress['lower_bound']}")
+        parts.append(f"{progress['elapsed']:.1f} s")
+        return ", ".join(parts)
+
+    def show_results(self, algorithms, cancelled=False):
+        # Collect the results of each algorithm that ran
+        all_results = []
+        for algorithm in algorithms:
+            coverage_rows = self.model.get_coverage_rows(algorithm)
+            result_message = f"{algorithm}: Minimum rows for full coverage: " + ", ".join(str(row + 1) for row in coverage_rows)
+            result = self.model.get_result(algorithm)
+            if result.gap is not None:
+                result_message += f" [{result.status}, gap {result.gap:.1%}]"
+            elif result.status == TIMEOUT:
+                result_message += f" [{result.status}]"
+            block_count = len(self.model.get_block_sizes(algorithm))
+            if block_count > 1:
+                result_message += f" ({block_count} independent blocks)"
+            if result.details.get('improved_from'):
+                result_message += f" (improved from {result.details['improved_from']} rows)"
+            if result.details.get('cached'):
+                result_message += " (cached)"
+            elif result.details.get('warm_start'):
+                result_message += " (repaired previous cover)"
+            all_results.append(result_message)
+
+        if cancelled:
+            all_results.append("Cancelled: the results above are the best covers found before stopping.")
+
+        if self.portfolio_run:
+            best = self.model.get_portfolio_result()
+            proven = " (proven optimal)" if best.status == OPTIMAL else ""
+            all_results.append(f"Portfolio: best cover of {best.objective} rows{proven} from "
+                               f"{best.details['winner']} after {best.details['winner_time']:.2f} s")
+
+        # Report how much presolve reduced the matrix alongside the results.
+        stats = self.model.get_presolve_stats()
+        if stats:
+            all_results.append(
+                f"Presolve: {stats['original_rows']}x{stats['original_cols']} reduced to "
+                f"{stats['reduced_rows']}x{stats['reduced_cols']}, {stats['fixed_rows']} rows fixed "
+                f"({stats['time']:.3f} s)")
+
+        cache_stats = self.model.get_cache_stats()
+        if cache_stats and cache_stats['hits']:
+            all_results.append(f"Cache: {cache_stats['hits']} of {cache_stats['lookups']} runs reused "
+                               f"({cache_stats['hit_ratio']:.0%})")
+
+        # Show a consolidated result.
+        final_message = '\n'.join(all_results)
+        self.view.show_result(final_message)
 
     def handle_visualize(self):
-        matrix = self.model.get_matrix()
+        # The compact form: expanding a large matrix to lists would be slow
+        matrix = self.model.cover
         # NOTE: This would visualize the result of the last algorithm in the list.
         # You might want to change this behavior.
         last_algorithm = self.view.get_selected_algorithms()[-1] if self.view.get_selected_algorithms() else None
@@ -71,30 +191,31 @@ class MatrixController:
 
     def handle_compare_performance(self):
         selected_algorithms = self.view.get_selected_algorithms()
+        metrics = {algorithm: self.model.get_metrics(algorithm) for algorithm in selected_algorithms
+                   if self.model.get_metrics(algorithm)}
 
-        if len(selected_algorithms) != 2:
-            self.view.show_error("Please select exactly two algorithms for comparison.")
+        if not metrics:
+            self.view.show_error("Please select at least one algorithm that has been run.")
             return
 
-        algorithm1, algorithm2 = selected_algorithms
-
-        performance_metrics = {
-        algorithm1: self.model.get_execution_time(algorithm1),
-        algorithm2: self.model.get_execution_time(algorithm2)
-        }
-
-        # Check for None values and handle them
-        for algorithm, time in performance_metrics.items():
-            if time is None:
-                self.view.show_error(f"Execution time for {algorithm} is not available.")
-                return
-
-        names = list(performance_metrics.keys())
-        values = list(performance_metrics.values())
+        metric_names = [('wall_time', 'Wall time (s)'), ('cpu_time', 'CPU time (s)'), ('rows', 'Cover size (rows)')]
+        if any(entry.get('peak_memory') is not None for entry in metrics.values()):
+            metric_names.append(('peak_memory', 'Peak memory (bytes)'))
 
         # Call the view method to display the plot
-        self.view.display_performance_plot(names, values)
+        self.view.display_performance_plot(metrics, metric_names)
 
+    def handle_export_metrics(self):
+        if not self.model.get_metrics():
+            self.view.show_error("No metrics yet: run at least one algorithm first.")
+            return
+        path = self.view.ask_metrics_path()
+        if not path:
+            return
+        try:
+            self.model.export_metrics(path)
+        except OSError as e:
+            self.view.show_error(str(e))
 
 
 if __name__ == "__main__":
@@ -1,2 +1,8 @@
-from .visualizations import visualize_matrix , compare_algorithms_performance
-# from .model import MatrixModel
\ No newline at end of file
+# The visualization helpers import matplotlib, so they are only loaded when first used;
+# this keeps the model importable in headless runs (see batch.py).
+def __getattr__(name):
+    if name in ('visualize_matrix', 'compare_algorithms_performance', 'MatrixRasterPlot'):
+        from . import visualizations
+        return getattr(visualizations, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+# from .model import MatrixModel
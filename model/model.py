@@ -1,29 +1,162 @@
-import time
+import copy
+import functools
+import numpy as np
 from utils.algorithms import branch_and_bound, greedy_algorithm, genetic_algorithm, linear_programming
+from utils.algorithms import lagrangian_relaxation, dynamic_programming, lp_rounding
+from utils.algorithms import OPTIMAL, TIMEOUT, DP_MAX_COLUMNS, SolverResult, as_solver_result
+from utils.control import SolveControl
+from utils.cover_matrix import CoverMatrix
+from utils.presolve import presolve
+from utils.decomposition import solve_by_components
+from utils.portfolio import solve_portfolio
+from utils.cache import ResultCache, matrix_digest, result_key
+from utils.incremental import diff_matrices, map_rows
+from utils.local_search import improve_cover
+from utils.loaders import load_instance
+from utils.metrics import MetricsRecorder, export_metrics, solver_counters
+
+# Dictionary linking algorithm names to their corresponding functions
+ALGORITHM_FUNCTIONS = {
+    'Branch and Bound': branch_and_bound,
+    'Greedy': greedy_algorithm,
+    'Genetic Algorithm': genetic_algorithm,
+    'Linear Programming': linear_programming,
+    'Lagrangian Relaxation': lagrangian_relaxation,
+    'Dynamic Programming': dynamic_programming,
+    'LP Rounding': lp_rounding
+}
+
+# Algorithms whose warm start is simply a repair of the previous cover; it is cheap
+# enough to run on the whole matrix, without presolve or decomposition.
+REPAIR_ALGORITHMS = {'Greedy'}
+
+# Exact algorithms; (blocks of) matrices with at most DP_COLUMN_THRESHOLD columns are
+# solved by dynamic programming instead, which is exact as well and much faster there.
+EXACT_ALGORITHMS = {'Branch and Bound', 'Linear Programming'}
+DP_COLUMN_THRESHOLD = 20
+
+# Number of cells of list input converted to NumPy at a time while validating it.
+LIST_CHUNK_CELLS = 1 << 22
+
+# Subgradient iterations of the Lagrangian lower bound computed for algorithms that
+# prove no bound themselves.
+BOUND_ITERATIONS = 300
 
 class MatrixModel:
     def __init__(self):
         self.matrix = []  # Stores the matrix data.
+        self.cover = None  # Compact bitset form of the matrix shared by all algorithms.
+        self.presolved = None  # Reduced instance shared by all algorithms, built on first use.
         self.coverage_rows = {}  # Stores the rows that cover all columns, indexed by algorithm.
         self.execution_times = {}  # Stores the execution times, indexed by algorithm.
+        self.metrics = {}  # Stores the timing, memory and counter metrics, indexed by algorithm.
+        self.results = {}  # Stores the full SolverResult (status, bound, details), indexed by algorithm.
+        self.block_policy = []  # (max_rows, algorithm) tiers choosing the algorithm per block.
+        self.block_sizes = {}  # Stores the (rows, cols) of the independent blocks, indexed by algorithm.
+        self.portfolio_result = None  # Best result of the last concurrent run, with the winning solver.
+        self.cache = None  # Optional ResultCache of solver results, keyed by matrix content.
+        self.digest = None  # Content hash of the current matrix, computed on first use.
+        self.best_rows = None  # Smallest cover found for the current matrix.
+        self.warm_start_rows = None  # Previous matrix's best cover, carried over to the current one.
+        self.repair_rows = {}  # Previous matrix's cover of each repair algorithm, carried over to the current one.
+        self.matrix_diff = None  # Changes between the previous and the current matrix.
+        self.lower_bound = None  # Best proven lower bound on the minimum cover size of the current matrix.
+        self.dp_column_threshold = DP_COLUMN_THRESHOLD  # Widest matrix the exact algorithms hand to dynamic programming.
 
     def set_matrix(self, matrix):
         """
         Set or update the matrix data.
 
-        :param matrix: List of lists with matrix data.
+        The matrix must be non-empty, contain only 0 and 1, and have no column that
+        no row covers; a ValueError says what is wrong otherwise.
+
+        :param matrix: List of lists with matrix data, a 2D NumPy array (bool or
+                       integer, for example from utils.generators), a SciPy sparse
+                       matrix, or an already built CoverMatrix (for example from
+                       utils.loaders). Arrays and CSR matrices are read in place.
         """
-        if self.validate_matrix(matrix):
-            self.matrix = matrix
+        if isinstance(matrix, CoverMatrix):
+            cover = matrix
+        elif hasattr(matrix, 'tocsr'):
+            cover = self._sparse_cover(matrix)
+        elif isinstance(matrix, np.ndarray):
+            self._check_array(matrix)
+            cover = CoverMatrix.from_dense(matrix)
         else:
-            raise ValueError("Invalid matrix data")
+            # Lists are converted once; the cover is then packed from the array
+            cover = CoverMatrix.from_dense(self._list_to_array(matrix))
+
+        uncoverable = cover.uncoverable_columns()
+        if uncoverable:
+            raise ValueError(f"Columns {uncoverable} cannot be covered by any row")
+        # Only list input is kept as is; other instances live in their compact form
+        self.matrix = matrix if isinstance(matrix, list) else None
+        self._replace_cover(cover)
+
+    def _replace_cover(self, cover):
+        """
+        Switch to a new matrix, carrying the best cover of the previous one over so the
+        next runs can warm-start from it. Setting the same matrix again (the GUI sets it
+        on every run) keeps the presolve, the best cover and the warm start as they are.
+        """
+        previous = self.cover
+        if previous is not None and previous.equals(cover):
+            return
+        self.cover = cover
+        self.presolved = None
+        self.digest = None
+        self.warm_start_rows = None
+        self.repair_rows = {}
+        self.matrix_diff = None
+        self.lower_bound = None
+        if previous is not None and self.best_rows is not None:
+            self.matrix_diff = diff_matrices(previous, cover)
+            self.warm_start_rows = map_rows(previous, cover, self.best_rows)
+            # A repair algorithm's result is its repaired cover, so it only repairs its own
+            self.repair_rows = {algorithm: map_rows(previous, cover, self.coverage_rows[algorithm])
+                                for algorithm in REPAIR_ALGORITHMS if algorithm in self.coverage_rows}
+        self.best_rows = None
+
+    def _warm_start_for(self, algorithm):
+        """
+        Cover an algorithm warm-starts from on the current matrix: its own previous
+        cover for the repair algorithms, whose result it becomes, and the best previous
+        cover for the others.
+
+        :return: List of row indices, or None when there is none.
+        """
+        if algorithm in REPAIR_ALGORITHMS:
+            return self.repair_rows.get(algorithm)
+        return self.warm_start_rows
+
+    def get_matrix_diff(self):
+        """
+        Retrieve the changes between the previous and the current matrix.
+
+        :return: Dictionary from utils.incremental.diff_matrices, or None when there is
+                 no previous cover to warm-start from.
+        """
+        return self.matrix_diff
+
+    def load_instance(self, path, fmt=None):
+        """
+        Load an instance file (OR-Library scp/rail, sparse rows or packed bits).
+
+        :param path: Path of the instance file.
+        :param fmt: Optional format name, see utils.loaders.LOADERS; detected when None.
+        """
+        self.set_matrix(load_instance(path, fmt))
 
     def get_matrix(self):
         """
         Retrieve the stored matrix data.
 
+        Instances set as a CoverMatrix are expanded to a dense list of lists on demand.
+
         :return: List of lists with matrix data.
         """
+        if self.matrix is None and self.cover is not None:
+            return self.cover.to_dense()
         return self.matrix
 
     def set_coverage_rows(self, algorithm, rows):
@@ -44,6 +177,15 @@ class MatrixModel:
         """
         return self.coverage_rows.get(algorithm, [])
 
+    def get_result(self, algorithm):
+        """
+        Retrieve the full result (status, lower bound, gap, details) of an algorithm.
+
+        :param algorithm: A string representing the algorithm used.
+        :return: A SolverResult, or None if the algorithm has not run.
+        """
+        return self.results.get(algorithm)
+
     def set_execution_time(self, algorithm, execution_time):
         """
         Record the execution time of an algorithm.
@@ -62,54 +204,445 @@ class MatrixModel:
         """
         return self.execution_times.get(algorithm)
 
-    def run_algorithm(self, algorithm):
+    def get_presolve(self):
+        """
+        Reduce the current matrix, reusing the reduction across algorithms.
+
+        :return: A PresolveResult for the current matrix.
+        """
+        if self.presolved is None:
+            self.presolved = presolve(self.cover)
+        return self.presolved
+
+    def get_lower_bound(self, time_limit=1.0):
+        """
+        Lower bound on the minimum cover size of the current matrix, from the
+        Lagrangian relaxation of the presolved matrix (bound only, no repair) or from
+        an earlier result when that is stronger.
+
+        :param time_limit: Budget in seconds for the subgradient iterations.
+        :return: The lower bound, an integer.
+        """
+        if self.lower_bound is None:
+            presolved = self.get_presolve()
+            bound = 0
+            if presolved.cover.num_cols:
+                bound = lagrangian_relaxation(presolved.cover, max_iterations=BOUND_ITERATIONS,
+                                              time_limit=time_limit, repair=False).lower_bound
+            # Fixed rows belong to every cover
+            self.lower_bound = bound + len(presolved.fixed_rows)
+        return self.lower_bound
+
+    def get_presolve_stats(self):
+        """
+        Retrieve the statistics of the last presolve of the current matrix.
+
+        :return: Dictionary of reduction statistics, or None if presolve has not run.
+        """
+        return self.presolved.stats if self.presolved is not None else None
+
+    def enable_cache(self, max_entries=128, path=None, max_bytes=None):
+        """
+        Reuse results of earlier runs on identical matrices with identical settings.
+
+        :param max_entries: Number of results kept in memory.
+        :param path: Optional sqlite file that keeps results across restarts and
+                     processes.
+        :param max_bytes: Optional size cap of the sqlite file's contents.
+        """
+        if max_bytes is None:
+            self.cache = ResultCache(max_entries, path)
+        else:
+            self.cache = ResultCache(max_entries, path, max_bytes)
+
+    def get_cache_stats(self):
+        """
+        Retrieve the lookup counters and hit ratio of the result cache.
+
+        :return: Dictionary of cache statistics, or None if the cache is disabled.
+        """
+        return self.cache.stats() if self.cache is not None else None
+
+    def get_digest(self):
+        """
+        Content hash of the current matrix, identifying it in the result cache.
+
+        :return: Hexadecimal digest string.
+        """
+        if self.digest is None:
+            self.digest = matrix_digest(self.cover)
+        return self.digest
+
+    def set_block_policy(self, policy):
+        """
+        Choose which algorithm solves each independent block, by block size.
+
+        A block with at most max_rows rows is solved by the algorithm of the first
+        matching tier; larger blocks use the algorithm passed to run_algorithm. For
+        example [(40, 'Branch and Bound')] solves small blocks exactly.
+
+        :param policy: List of (max_rows, algorithm) tiers, in increasing max_rows.
+        """
+        for _, algorithm in policy:
+            if algorithm not in ALGORITHM_FUNCTIONS:
+                raise ValueError(f"Unknown algorithm in block policy: {algorithm}")
+        self.block_policy = sorted(policy)
+
+    def get_block_sizes(self, algorithm):
+        """
+        Retrieve the (rows, cols) sizes of the blocks solved by the last run of an algorithm.
+
+        :param algorithm: A string representing the algorithm used.
+        :return: List of (rows, cols) tuples.
+        """
+        return self.block_sizes.get(algorithm, [])
+
+    def set_dp_column_threshold(self, max_columns):
+        """
+        Choose up to which number of columns the exact algorithms (Branch and Bound,
+        Linear Programming) are replaced by dynamic programming.
+
+        :param max_columns: Number of columns, at most DP_MAX_COLUMNS, or None to never
+                            replace them.
+        """
+        if max_columns is not None and not 0 <= max_columns <= DP_MAX_COLUMNS:
+            raise ValueError(f"The dynamic programming threshold must be between 0 and {DP_MAX_COLUMNS}")
+        self.dp_column_threshold = max_columns
+
+    def run_algorithm(self, algorithm, use_presolve=True, decompose=True, control=None, warm_start=True,
+                      time_limit=None, improve_time=None, bound_time=None, trace_memory=False, **options):
         """
         Execute the specified algorithm and record its results.
 
+        Unless use_presolve is False, the matrix is first reduced by presolve; the
+        algorithm solves the reduced matrix and its solution is mapped back to the
+        original row indices. Unless decompose is False, the connected components of
+        the (reduced) matrix are then solved independently, in parallel when there are
+        several, with the algorithm of each block chosen by the block policy. When the
+        result cache is enabled, a run with the same matrix and settings as an earlier
+        one returns the earlier result (marked with details['cached']). The exact
+        algorithms solve (blocks of) matrices with few columns by dynamic programming,
+        see set_dp_column_threshold.
+
+        After set_matrix replaced a matrix that had been solved, the best previous cover
+        is repaired for the new matrix and used as a warm start (unless warm_start is
+        False); the other algorithms start from it instead of from scratch. The repair
+        algorithms (Greedy) repair their own previous cover instead, and the repaired
+        cover is the result, so re-solving after a small edit takes milliseconds.
+
         :param algorithm: A string representing the algorithm to be used.
+        :param use_presolve: Whether to reduce the matrix before solving it.
+        :param decompose: Whether to solve independent blocks separately.
+        :param control: Optional SolveControl passed to the algorithm for progress reports
+                        and cancellation; blocks are then solved in this process.
+        :param warm_start: Whether to start from the previous matrix's best cover.
+        :param time_limit: Optional wall-clock budget in seconds for the whole run; the
+                           best cover found by then is recorded with the TIMEOUT status.
+        :param improve_time: Optional budget in seconds for shrinking the algorithm's
+                             cover by local search afterwards (utils.local_search);
+                             details['improved_from'] records the size before.
+        :param bound_time: Optional budget in seconds for computing a Lagrangian lower
+                           bound (get_lower_bound) for results that have none, such as
+                           the greedy and genetic ones, so they get an optimality gap.
+        :param trace_memory: Whether the recorded metrics include the peak memory
+                             (see get_metrics); tracing slows Python-heavy solvers
+                             down several times, so it is off by default.
+        :param options: Extra keyword arguments for the algorithm (for example
+                        node_limit for Branch and Bound).
         """
-        # Dictionary linking algorithm names to their corresponding functions
-        algorithm_functions = {
-            'Branch and Bound': branch_and_bound,
-            'Greedy': greedy_algorithm,
-            'Genetic Algorithm': genetic_algorithm,
-            'Linear Programming': linear_programming
-        }
-
-        if algorithm not in algorithm_functions:
+        if algorithm not in ALGORITHM_FUNCTIONS:
             raise ValueError("Unknown algorithm selected")
+        initial = self._warm_start_for(algorithm) if warm_start else None
+        if time_limit is not None:
+            # One deadline for the whole run, however many blocks it is split into
+            control = (control or SolveControl()).with_time_limit(time_limit)
+
+        algorithm_function = ALGORITHM_FUNCTIONS[algorithm]
+        if options:
+            algorithm_function = functools.partial(algorithm_function, **options)
+
+        def narrow(cover):
+            return (algorithm in EXACT_ALGORITHMS and self.dp_column_threshold is not None
+                    and cover.num_cols <= self.dp_column_threshold)
+
+        def choose_algorithm(block):
+            # The control is added by solve_by_components, so blocks can go to workers
+            if narrow(block):
+                return dynamic_programming
+            for max_rows, block_algorithm in self.block_policy:
+                if block.num_rows <= max_rows:
+                    return ALGORITHM_FUNCTIONS[block_algorithm]
+            return algorithm_function
+
+        def solve(cover, initial=None):
+            # Nothing is left to solve when every column is already covered
+            if not cover.num_cols:
+                self.block_sizes[algorithm] = []
+                return SolverResult([], OPTIMAL, 0)
+            if decompose:
+                result, self.block_sizes[algorithm] = solve_by_components(cover, choose_algorithm,
+                                                                          initial=initial,
+                                                                          control=control)
+                return result
+            self.block_sizes[algorithm] = [(cover.num_rows, cover.num_cols)]
+            function = dynamic_programming if narrow(cover) else algorithm_function
+            if control is not None:
+                function = functools.partial(function, control=control)
+            if initial is not None:
+                return as_solver_result(function(cover, initial=initial))
+            return as_solver_result(function(cover))  # Running the chosen algorithm
 
-        algorithm_function = algorithm_functions[algorithm]
+        key = None
+        cached = None
+        with MetricsRecorder(trace_memory) as recorder:
+            if self.cache is not None:
+                # The warm-start cover and the bound both change the result (rows, status, bound)
+                settings = {'presolve': use_presolve, 'decompose': decompose, 'options': options,
+                            'block_policy': self.block_policy if decompose else [], 'improve_time': improve_time,
+                            'dp_column_threshold': self.dp_column_threshold if algorithm in EXACT_ALGORITHMS else None,
+                            'initial': sorted(initial) if initial is not None else None, 'bound_time': bound_time}
+                key = result_key(self.get_digest(), algorithm, settings)
+                cached = self.cache.get(key)
 
-        start_time = time.time()
-        result_rows = algorithm_function(self.matrix)  # Running the chosen algorithm
-        end_time = time.time()
+            if cached is not None:
+                # Copies, so changes to the returned result never reach the cache
+                result, self.block_sizes[algorithm] = copy.deepcopy(cached)
+                result.details['cached'] = True
+            elif initial is not None and algorithm in REPAIR_ALGORITHMS:
+                self.block_sizes[algorithm] = [(self.cover.num_rows, self.cover.num_cols)]
+                with recorder.phase('solve'):
+                    function = algorithm_function
+                    if control is not None:
+                        function = functools.partial(function, control=control)
+                    result = as_solver_result(function(self.cover, initial=initial))
+                result.details['warm_start'] = True
+            elif use_presolve:
+                # Presolve is shared between algorithms, so only the first run pays for it
+                with recorder.phase('presolve'):
+                    presolved = self.get_presolve()
+                with recorder.phase('solve'):
+                    result = self._restore(presolved, solve(presolved.cover, self._reduce_rows(presolved, initial)))
+            else:
+                with recorder.phase('solve'):
+                    result = solve(self.cover, initial)
 
-        self.set_coverage_rows(algorithm, result_rows)
-        self.set_execution_time(algorithm, end_time - start_time)
+            if cached is None and improve_time and result.status != OPTIMAL:
+                # Post-optimization on the whole matrix; an optimal cover cannot shrink
+                with recorder.phase('improve'):
+                    improved_rows = improve_cover(self.cover, result.rows, time_limit=improve_time, control=control)
+                if len(improved_rows) < len(result.rows):
+                    result.details['improved_from'] = len(result.rows)
+                    result.rows = improved_rows
+            if bound_time:
+                with recorder.phase('bound'):
+                    self._attach_bound(result, bound_time)
+
+        # A cancelled or timed out run holds whatever was found before stopping, so it is not reused
+        if (cached is None and key is not None and result.status != TIMEOUT
+                and not (control is not None and control.cancelled)):
+            self.cache.put(key, copy.deepcopy((result, self.block_sizes.get(algorithm, []))))
+
+        self._record(algorithm, result, recorder.wall_time, recorder.as_dict())
+
+    def run_portfolio(self, algorithms, use_presolve=True, control=None, warm_start=True, time_limit=None):
+        """
+        Execute several algorithms at the same time and record their results.
+
+        Every algorithm runs in its own process on the (presolved) matrix; they share
+        the best cover size found so far and are stopped once a cover is proven optimal.
+        Each algorithm's own result is recorded as by run_algorithm, with the time it
+        finished as its execution time; algorithms stopped before returning a cover are
+        left out.
+
+        :param algorithms: List of algorithm names.
+        :param use_presolve: Whether to reduce the matrix before solving it.
+        :param control: Optional SolveControl for progress reports and cancellation.
+        :param warm_start: Whether every algorithm starts from the previous matrix's
+                           best cover, as in run_algorithm.
+        :param time_limit: Optional wall-clock budget in seconds for the whole run.
+        :return: The best SolverResult; details['winner'] names the algorithm that
+                 produced it and details['winner_time'] when it finished.
+        """
+        for algorithm in algorithms:
+            if algorithm not in ALGORITHM_FUNCTIONS:
+                raise ValueError("Unknown algorithm selected")
+
+        presolved = self.get_presolve() if use_presolve else None
+        cover = presolved.cover if use_presolve else self.cover
+        if not cover.num_cols:
+            # Nothing is left to solve; every algorithm returns the empty cover at once
+            best = SolverResult([], OPTIMAL, 0, winner=algorithms[0], winner_time=0.0, finish_times={})
+            results = {algorithm: SolverResult([], OPTIMAL, 0) for algorithm in algorithms}
+        else:
+            functions = {algorithm: ALGORITHM_FUNCTIONS[algorithm] for algorithm in algorithms}
+            for algorithm in algorithms:
+                initial = self._warm_start_for(algorithm) if warm_start else None
+                if initial is not None:
+                    if use_presolve:
+                        initial = self._reduce_rows(presolved, initial)
+                    functions[algorithm] = functools.partial(functions[algorithm], initial=initial)
+            best, results = solve_portfolio(cover, functions, control, time_limit)
+
+        if use_presolve:
+            best = self._restore(presolved, best)
+        for algorithm, result in results.items():
+            if use_presolve:
+                result = self._restore(presolved, result)
+            self.block_sizes[algorithm] = [(cover.num_rows, cover.num_cols)]
+            self._record(algorithm, result, best.details['finish_times'].get(algorithm, 0.0))
+
+        self.portfolio_result = best
+        return best
+
+    def get_portfolio_result(self):
+        """
+        Retrieve the best result of the last concurrent run.
+
+        :return: A SolverResult, or None if run_portfolio has not been called.
+        """
+        return self.portfolio_result
+
+    def _attach_bound(self, result, bound_time):
+        """
+        Give a result without a lower bound the model's Lagrangian bound; a cover
+        meeting the bound is optimal.
+        """
+        if not bound_time or result.lower_bound is not None:
+            return
+        result.lower_bound = min(self.get_lower_bound(bound_time), result.objective)
+        if result.lower_bound >= result.objective:
+            result.status = OPTIMAL
+
+    def get_metrics(self, algorithm=None):
+        """
+        Retrieve the performance metrics of the last run of an algorithm: wall_time,
+        cpu_time, child_cpu_time (subprocesses such as CBC) and peak_memory, the
+        presolve, solve, improve and bound phase times, the cover size, status, bound
+        and gap, and the solver's own counters (see utils.metrics.solver_counters).
+
+        :param algorithm: A string representing the algorithm used, or None for all.
+        :return: Dictionary of metrics, or of algorithm names to metrics when algorithm
+                 is None; an empty dictionary if the algorithm has not run.
+        """
+        if algorithm is None:
+            return dict(self.metrics)
+        return self.metrics.get(algorithm, {})
+
+    def export_metrics(self, path):
+        """
+        Write the metrics of every algorithm that ran to a JSON file.
+
+        :param path: Path of the JSON file.
+        """
+        export_metrics(self.metrics, path)
+
+    def _record(self, algorithm, result, execution_time, metrics=None):
+        """
+        Store the result of an algorithm and its metrics, and keep track of the best
+        cover and the best lower bound so far.
+        """
+        self.results[algorithm] = result
+        self.set_coverage_rows(algorithm, result.rows)
+        self.set_execution_time(algorithm, execution_time)
+        entry = dict(metrics) if metrics else {'wall_time': execution_time}
+        entry.update(rows=result.objective, status=result.status, lower_bound=result.lower_bound, gap=result.gap,
+                     cached=bool(result.details.get('cached')), counters=solver_counters(result.details))
+        self.metrics[algorithm] = entry
+        if self.best_rows is None or len(result.rows) < len(self.best_rows):
+            self.best_rows = list(result.rows)
+        if result.lower_bound is not None and (self.lower_bound is None or result.lower_bound > self.lower_bound):
+            self.lower_bound = result.lower_bound
+
+    def _reduce_rows(self, presolved, rows):
+        """
+        Map original row indices to the rows of the presolved matrix; rows removed by
+        presolve are dropped. Returns None when rows is None.
+        """
+        if rows is None:
+            return None
+        rows = set(rows)
+        return [index for index, row in enumerate(presolved.row_map) if row in rows]
+
+    def _restore(self, presolved, result):
+        """
+        Map a result on the presolved matrix back to the original row indices.
+        """
+        result.rows = presolved.restore(result.rows)
+        # Fixed rows belong to every cover, so they raise the bound as well
+        if result.lower_bound is not None:
+            result.lower_bound += len(presolved.fixed_rows)
+        return result
 
     def validate_matrix(self, matrix):
         """
-        Validates the provided matrix.
+        Validates the provided matrix: non-empty, rectangular, only 0 and 1.
 
-        :param matrix: List of lists representing the matrix.
+        :param matrix: List of lists or 2D NumPy array representing the matrix.
         :return: Boolean indicating whether the matrix is valid.
         """
-        # Check if matrix is not empty and if each row is a list
-        if not matrix or not all(isinstance(row, list) for row in matrix):
+        try:
+            if isinstance(matrix, np.ndarray):
+                self._check_array(matrix)
+            else:
+                self._list_to_array(matrix)
+        except ValueError:
             return False
+        return True
+
+    def _check_array(self, array):
+        """
+        Check a dense NumPy array with whole-array operations; raises ValueError.
+        """
+        if array.ndim != 2 or not array.size:
+            raise ValueError("Matrix must be a non-empty 2D array")
+        if array.dtype.kind == 'b':
+            return
+        if array.dtype.kind not in 'iu':
+            raise ValueError("Matrix must only contain integers.")
+        # Each bound is a single pass over the data
+        if array.max() > 1 or (array.dtype.kind == 'i' and array.min() < 0):
+            raise ValueError("Matrix must only contain 0 and 1.")
 
-        row_length = len(matrix[0])
-        for row in matrix:
-            # All rows must be of the same length
-            if len(row) != row_length:
-                return False
+    def _list_to_array(self, matrix):
+        """
+        Convert a list of lists into a uint8 array, checking it LIST_CHUNK_CELLS cells
+        at a time; raises ValueError.
+        """
+        if not matrix or not isinstance(matrix, list) or not all(isinstance(row, list) for row in matrix):
+            raise ValueError("Matrix must be a non-empty list of rows")
+        num_cols = len(matrix[0])
+        if not num_cols or any(len(row) != num_cols for row in matrix):
+            raise ValueError("All matrix rows must have the same, non-zero length")
 
-            # Each element must be an integer (for this context)
-            if not all(isinstance(item, int) for item in row):
-                return False
+        array = np.empty((len(matrix), num_cols), dtype=np.uint8)
+        step = max(1, LIST_CHUNK_CELLS // num_cols)
+        for start in range(0, len(matrix), step):
+            block = np.asarray(matrix[start:start + step])
+            self._check_array(block)
+            array[start:start + step] = block
+        return array
 
-        return True
+    def _sparse_cover(self, matrix):
+        """
+        Build the CoverMatrix of a SciPy sparse matrix, reading CSR input in place;
+        raises ValueError.
+        """
+        csr = matrix.tocsr()  # No copy when the matrix is already CSR
+        if not csr.shape[0] or not csr.shape[1]:
+            raise ValueError("Matrix must be a non-empty 2D array")
+        if not csr.has_canonical_format:
+            csr = csr.copy()
+            csr.sum_duplicates()
+        data = csr.data
+        if data.dtype.kind not in 'biu':
+            raise ValueError("Matrix must only contain integers.")
+        if data.size and data.dtype.kind != 'b' and (data.max() > 1 or data.min() < 0):
+            raise ValueError("Matrix must only contain 0 and 1.")
+        if not data.all():
+            # Stored zeros are not ones of the matrix
+            csr = csr.copy()
+            csr.eliminate_zeros()
+        return CoverMatrix.from_csr(csr.indptr, csr.indices, csr.shape[1])
 
     # ... Any additional methods or logic required for the model should be implemented here.
 
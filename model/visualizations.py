@@ -1,22 +1,121 @@
+import math
 import matplotlib.pyplot as plt
 import numpy as np
+from utils.cover_matrix import as_cover_matrix
 
-def visualize_matrix(matrix, coverage_rows=None):
+# Largest number of pixels drawn along each axis; larger windows of the matrix are
+# max-pooled down to it, so drawing does not slow down with the matrix size.
+MAX_RASTER_SIZE = 1000
+
+# Colors of the cells: empty and one, then empty and one in a coverage row.
+RASTER_PALETTE = np.array([[(1.0, 1.0, 1.0), (0.0, 0.0, 0.0)],
+                           [(0.75, 0.85, 1.0), (0.0, 0.2, 0.8)]])
+
+
+def matrix_raster(cover, rows=None, cols=None, coverage_rows=None, max_size=MAX_RASTER_SIZE):
     """
-    Visualize the matrix with coverage rows highlighted.
+    Max-pooled RGB image of a window of the matrix.
+
+    The window is split into blocks of row_step x col_step cells, the smallest that
+    keep the image within max_size pixels per side; a pixel is a one when any cell of
+    its block is. Pixels of blocks containing a coverage row are tinted. Only the ones
+    inside the window's columns are read, from the column incidence of the matrix.
+
+    :param cover: A CoverMatrix.
+    :param rows: Optional (start, stop) of the rows shown; all rows by default.
+    :param cols: Optional (start, stop) of the columns shown; all columns by default.
+    :param coverage_rows: Optional row indices to highlight.
+    :param max_size: Largest number of pixels per side.
+    :return: Tuple of (RGB array of shape (height, width, 3), row_step, col_step).
     """
-    # Create a figure and a subplot
-    fig, ax = plt.subplots()
+    row_start, row_stop = rows or (0, cover.num_rows)
+    col_start, col_stop = cols or (0, cover.num_cols)
+    row_step = max(1, math.ceil((row_stop - row_start) / max_size))
+    col_step = max(1, math.ceil((col_stop - col_start) / max_size))
+    height = math.ceil((row_stop - row_start) / row_step)
+    width = math.ceil((col_stop - col_start) / col_step)
+
+    ones = np.zeros((height, width), dtype=np.intp)
+    nz_rows = cover.col_idx[cover.col_ptr[col_start]:cover.col_ptr[col_stop]]
+    nz_cols = np.repeat(np.arange(col_start, col_stop), np.diff(cover.col_ptr[col_start:col_stop + 1]))
+    inside = (nz_rows >= row_start) & (nz_rows < row_stop)
+    ones[(nz_rows[inside] - row_start) // row_step, (nz_cols[inside] - col_start) // col_step] = 1
+
+    selected = np.zeros(height, dtype=np.intp)
+    if coverage_rows is not None and len(coverage_rows):
+        coverage_rows = np.asarray(coverage_rows, dtype=np.int64)
+        coverage_rows = coverage_rows[(coverage_rows >= row_start) & (coverage_rows < row_stop)]
+        selected[(coverage_rows - row_start) // row_step] = 1
 
-    # Using matshow to create a heatmap representation of the matrix
-    cax = ax.matshow(matrix, cmap='gray_r')  # _r in 'gray_r' indicates reversed grayscale (optional)
+    # A single palette lookup colors every pixel, highlighted rows included
+    return RASTER_PALETTE[selected[:, None], ones], row_step, col_step
 
-    # Highlight the coverage rows if provided
-    if coverage_rows is not None:
-        for row in coverage_rows:
-            ax.add_patch(plt.Rectangle((0, row), len(matrix[0]), 1, fill=False, edgecolor='blue', lw=2))
 
-    fig.colorbar(cax)  # Adding a colorbar for reference
+class MatrixRasterPlot:
+    """
+    A matrix drawn on matplotlib axes from a max-pooled raster (see matrix_raster).
+
+    The axes use row and column coordinates. Whenever they are zoomed or panned, only
+    the visible window is rendered again, at full resolution once it is small enough.
+    """
+
+    def __init__(self, ax, cover, coverage_rows=None, max_size=MAX_RASTER_SIZE):
+        """
+        :param ax: The matplotlib axes to draw on.
+        :param cover: A CoverMatrix with at least one row and one column.
+        :param coverage_rows: Optional row indices to highlight.
+        :param max_size: Largest number of pixels per side.
+        """
+        self.ax = ax
+        self.cover = cover
+        self.coverage_rows = coverage_rows
+        self.max_size = max_size
+        self.window = ((0, cover.num_rows), (0, cover.num_cols))
+
+        raster, row_step, col_step = matrix_raster(cover, coverage_rows=coverage_rows, max_size=max_size)
+        self.image = ax.imshow(raster, extent=self._extent(self.window, raster, row_step, col_step),
+                               interpolation='nearest', aspect='auto')
+        ax.set_xlim(0, cover.num_cols)
+        ax.set_ylim(cover.num_rows, 0)
+        ax.set_autoscale_on(False)  # New extents must not move the view
+        ax.set_xlabel('Columns')
+        ax.set_ylabel('Rows')
+        ax.callbacks.connect('xlim_changed', self.refresh)
+        ax.callbacks.connect('ylim_changed', self.refresh)
+
+    @staticmethod
+    def _extent(window, raster, row_step, col_step):
+        # Every pixel spans a whole block, the last ones included
+        (row_start, _), (col_start, _) = window
+        return (col_start, col_start + raster.shape[1] * col_step,
+                row_start + raster.shape[0] * row_step, row_start)
+
+    def refresh(self, ax=None):
+        """
+        Render the window visible in the axes, unless it is the one already drawn.
+        """
+        x_low, x_high = sorted(self.ax.get_xlim())
+        y_low, y_high = sorted(self.ax.get_ylim())
+        rows = (max(0, math.floor(y_low)), min(self.cover.num_rows, math.ceil(y_high)))
+        cols = (max(0, math.floor(x_low)), min(self.cover.num_cols, math.ceil(x_high)))
+        if rows[0] >= rows[1] or cols[0] >= cols[1] or (rows, cols) == self.window:
+            return
+        self.window = (rows, cols)
+        raster, row_step, col_step = matrix_raster(self.cover, rows, cols, self.coverage_rows, self.max_size)
+        self.image.set_data(raster)
+        self.image.set_extent(self._extent(self.window, raster, row_step, col_step))
+        self.ax.figure.canvas.draw_idle()
+
+
+def visualize_matrix(matrix, coverage_rows=None):
+    """
+    Visualize the matrix with coverage rows highlighted, in a matplotlib window.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param coverage_rows: Optional row indices to highlight.
+    """
+    fig, ax = plt.subplots()
+    MatrixRasterPlot(ax, as_cover_matrix(matrix), coverage_rows)
     plt.show()
 
 
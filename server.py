@@ -0,0 +1,593 @@
+"""
+Local HTTP/JSON solve service: other programs on the host submit instances and poll
+or stream the progress of their solves.
+
+Jobs are queued and run by MatrixModel.run_algorithm in their own worker processes,
+at most --workers at a time, so the event loop only parses requests and relays
+messages; parsing and hashing large instances happens in a thread. A job identical to
+one still queued or running (same matrix content, algorithm and settings) is not
+solved twice: the submission returns the existing job. Only the standard library is
+used, and neither tkinter nor matplotlib is imported:
+
+    python server.py --port 8000 --workers 4
+
+Endpoints (JSON in and out):
+
+    GET    /algorithms        names accepted in "algorithm"
+    GET    /status            number of queued, running and finished jobs
+    POST   /jobs              submit a job; 202 with the job (see below)
+    GET    /jobs/ID           the job: state, latest progress and, once done, result
+    GET    /jobs/ID/events    the job as one JSON line per progress update, until done
+    DELETE /jobs/ID           cancel; a running solver returns its best cover so far, or
+                              is killed if it has not within STOP_GRACE_PERIOD seconds
+
+A JSON submission holds the instance as "matrix" (list of 0/1 rows), "sparse"
+({"num_cols": n, "rows": [[columns of row 0], ...]}) or "instance" (the text of an
+instance file, with an optional "format", see utils.loaders), plus the optional
+"algorithm" (default Greedy), "time_limit" in seconds, "presolve" (default true) and
+"options" (extra solver arguments, e.g. {"seed": 1}). Any other content type uploads
+an instance file as the request body, with the settings in the query string:
+
+    curl --data-binary @scp41.txt "localhost:8000/jobs?algorithm=Greedy&time_limit=10"
+"""
+import argparse
+import asyncio
+import inspect
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import numpy as np
+from batch import KILL_GRACE_PERIOD
+from model.model import ALGORITHM_FUNCTIONS, MatrixModel
+from utils.cache import LRUCache, matrix_digest, result_key
+from utils.control import SolveControl
+from utils.cover_matrix import CoverMatrix
+from utils.loaders import load_instance
+from utils.portfolio import STOP_GRACE_PERIOD
+from utils.processes import kill_process_group, start_process_group
+
+# Seconds between two progress messages of a running job.
+PROGRESS_INTERVAL = 0.2
+
+# Largest accepted request body, in bytes.
+MAX_BODY_BYTES = 256 * 1024 * 1024
+
+# Default limit on the number of jobs waiting for a worker; further submissions get 503.
+MAX_QUEUED_JOBS = 10000
+
+# Number of finished jobs kept for polling; older ones are forgotten.
+JOB_HISTORY = 4096
+
+# Solver arguments that run_algorithm sets itself and a submission may not override.
+RESERVED_OPTIONS = {'matrix', 'control', 'initial', 'time_limit'}
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'  # The solver returned a cover (see result['status'])
+FAILED = 'failed'  # The job raised an error or its worker died
+CANCELLED = 'cancelled'  # Cancelled; the result holds the best cover, if it had started
+
+
+class HTTPError(Exception):
+    """
+    An error answered with the given HTTP status and a JSON {"error": message} body.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value):
+    # NumPy scalars and arrays found in progress reports and solver details
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def _encode(payload):
+    return json.dumps(payload, default=_json_default).encode()
+
+
+def _sparse_cover(sparse):
+    """
+    Build a CoverMatrix from a {"num_cols": n, "rows": [[columns], ...]} submission.
+    """
+    if not isinstance(sparse, dict) or 'num_cols' not in sparse or 'rows' not in sparse:
+        raise ValueError('"sparse" must be an object with "num_cols" and "rows"')
+    num_cols = sparse['num_cols']
+    rows = sparse['rows']
+    if not isinstance(num_cols, int) or isinstance(num_cols, bool) or num_cols < 1:
+        raise ValueError('"num_cols" must be a positive integer')
+    if not isinstance(rows, list) or not all(isinstance(columns, list) for columns in rows):
+        raise ValueError('"rows" must be a list of lists of column indices')
+    if not all(isinstance(col, int) and not isinstance(col, bool) for columns in rows for col in columns):
+        raise ValueError("Column indices must be integers")
+    sizes = [len(columns) for columns in rows]
+    cols = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.int64, count=sum(sizes))
+    if len(cols) and (cols.min() < 0 or cols.max() >= num_cols):
+        raise ValueError(f"Column indices must be between 0 and {num_cols - 1}")
+    row_indices = np.repeat(np.arange(len(rows)), sizes)
+    return CoverMatrix.from_coordinates(row_indices, cols, len(rows), num_cols)
+
+
+def _uploaded_cover(data, fmt=None):
+    """
+    Load the contents of an instance file with utils.loaders.
+    """
+    handle = tempfile.NamedTemporaryFile(suffix='.txt', delete=False)
+    try:
+        with handle:
+            handle.write(data)
+        return load_instance(handle.name, fmt)
+    finally:
+        os.remove(handle.name)
+
+
+def _setting(request, name, types, default=None):
+    """
+    A setting of a submission, checked against the expected types; raises a 400 HTTPError.
+    """
+    value = request.get(name)
+    if value is None:
+        return default
+    if not isinstance(value, types) or (isinstance(value, bool) and types is not bool):
+        raise HTTPError(400, f'Invalid "{name}": {value!r}')
+    return value
+
+
+def parse_submission(body, content_type, query):
+    """
+    Turn a POST /jobs request into a validated instance and its solve settings.
+
+    Runs in a thread: parsing, validating and hashing large instances takes a while.
+
+    :param body: The request body, as bytes.
+    :param content_type: The Content-Type header ('' when absent).
+    :param query: Dictionary of the query string parameters.
+    :return: Tuple of (CoverMatrix, dictionary of settings, deduplication key).
+    """
+    if content_type.split(';')[0].strip() == 'application/json':
+        try:
+            request = json.loads(body)
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        if not isinstance(request, dict):
+            raise HTTPError(400, "The request must be a JSON object")
+        if 'matrix' in request:
+            instance = request['matrix']
+        elif 'sparse' in request:
+            instance = _sparse_cover(request['sparse'])
+        elif 'instance' in request:
+            if not isinstance(request['instance'], str):
+                raise HTTPError(400, '"instance" must be the text of an instance file')
+            instance = _uploaded_cover(request['instance'].encode(), _setting(request, 'format', str))
+        else:
+            raise HTTPError(400, 'The request needs a "matrix", "sparse" or "instance"')
+    else:
+        request = dict(query)
+        if 'presolve' in request:
+            request['presolve'] = request['presolve'].lower() not in ('0', 'false', 'no')
+        if 'time_limit' in request:
+            try:
+                request['time_limit'] = float(request['time_limit'])
+            except ValueError:
+                raise HTTPError(400, '"time_limit" must be a number')
+        instance = _uploaded_cover(body, request.get('format'))
+
+    algorithm = _setting(request, 'algorithm', str, 'Greedy')
+    if algorithm not in ALGORITHM_FUNCTIONS:
+        raise HTTPError(400, f"Unknown algorithm: {algorithm}")
+    time_limit = _setting(request, 'time_limit', (int, float))
+    if time_limit is not None:
+        if not time_limit >= 0:
+            raise HTTPError(400, '"time_limit" must not be negative')
+        time_limit = float(time_limit)
+    presolve = _setting(request, 'presolve', bool, True)
+    options = _setting(request, 'options', dict, {})
+    # Presolve or decomposition may leave nothing to solve, so check before solving
+    accepted = inspect.signature(ALGORITHM_FUNCTIONS[algorithm]).parameters
+    unknown = sorted(name for name in options if name not in accepted or name in RESERVED_OPTIONS)
+    if unknown:
+        raise HTTPError(400, f"Unknown options for {algorithm}: {', '.join(unknown)}")
+
+    # The model's checks: 0/1 cells, a non-empty matrix, no uncoverable column
+    model = MatrixModel()
+    model.set_matrix(instance)
+    settings = {'algorithm': algorithm, 'time_limit': time_limit, 'presolve': presolve, 'options': options}
+    key = result_key(matrix_digest(model.cover), algorithm, settings)
+    return model.cover, settings, key
+
+
+def run_job(cover, settings, cache_path, stop_event, connection):
+    """
+    Solve one job and send ('progress', snapshot) messages every PROGRESS_INTERVAL
+    seconds, then ('result', record).
+
+    Runs in a worker process; the dispatch goes through MatrixModel.run_algorithm, the
+    same path the GUI and batch.py use.
+    """
+    start_process_group()
+    start_time = time.perf_counter()
+    control = SolveControl(stop_event)
+    solved = threading.Event()
+
+    def send_progress():
+        while not solved.wait(PROGRESS_INTERVAL):
+            connection.send(('progress', control.snapshot()))
+
+    reporter = threading.Thread(target=send_progress, daemon=True)
+    reporter.start()
+    algorithm = settings['algorithm']
+    try:
+        model = MatrixModel()
+        if cache_path:
+            model.enable_cache(path=cache_path)
+        model.set_matrix(cover)
+        model.run_algorithm(algorithm, use_presolve=settings['presolve'], control=control,
+                            time_limit=settings['time_limit'], **settings['options'])
+        result = model.get_result(algorithm)
+        record = {
+            'status': result.status,
+            'cover_size': result.objective,
+            'rows': result.rows,
+            'lower_bound': result.lower_bound,
+            'gap': result.gap,
+            'cached': result.details.get('cached', False),
+            'metrics': model.get_metrics(algorithm),
+        }
+    except Exception as e:
+        record = {'status': 'error', 'error': str(e)}
+    solved.set()
+    reporter.join()
+    record['runtime'] = time.perf_counter() - start_time
+    connection.send(('result', record))
+    connection.close()
+
+
+def _process_context():
+    """
+    Multiprocessing context of the workers.
+
+    Forking the server directly would copy its threads' locks in whatever state they
+    are; a fork server started before any thread, with the model already imported,
+    starts workers just as fast.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['model.model'])
+        return context
+    return multiprocessing.get_context()
+
+
+class Job:
+    """
+    A submitted instance, its settings and what is known about its solve.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, cover, settings, key):
+        self.id = str(next(self._ids))
+        self.cover = cover  # Dropped once handed to the worker
+        self.settings = settings
+        self.key = key
+        self.state = QUEUED
+        self.progress = {}
+        self.result = None
+        self.submissions = 1  # Identical submissions answered with this job
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.stop_event = None
+        self.messages = None  # Queue of the worker's messages while running
+        self.cancel_requested = False
+        self.version = 0  # Incremented on every change, for the event streams
+        self.changed = asyncio.Condition()
+
+    @property
+    def done(self):
+        return self.state in (FINISHED, FAILED, CANCELLED)
+
+    async def update(self, **changes):
+        """
+        Change attributes of the job and wake up the event streams.
+        """
+        for name, value in changes.items():
+            setattr(self, name, value)
+        async with self.changed:
+            self.version += 1
+            self.changed.notify_all()
+
+    def as_dict(self):
+        return {
+            'id': self.id,
+            'state': self.state,
+            **self.settings,
+            'submissions': self.submissions,
+            'submitted': self.submitted,
+            'started': self.started,
+            'finished': self.finished,
+            'progress': self.progress,
+            'result': self.result,
+        }
+
+
+class SolveServer:
+    """
+    The job queue, the bounded set of worker processes and the HTTP front end.
+    """
+
+    def __init__(self, workers=None, cache_path=None, max_queued=MAX_QUEUED_JOBS):
+        """
+        :param workers: Maximum number of jobs solved at the same time; defaults to the
+                        number of CPUs.
+        :param cache_path: Optional sqlite result cache file shared by all workers.
+        :param max_queued: Maximum number of jobs waiting for a worker.
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.cache_path = cache_path
+        self.max_queued = max_queued
+        self.context = _process_context()
+        self.active = {}  # Job id -> queued or running Job
+        self.in_flight = {}  # Deduplication key -> queued or running Job
+        self.history = LRUCache(JOB_HISTORY)  # Job id -> finished Job
+        self.deduplicated = 0
+        self._slots = None
+        self._tasks = set()
+
+    def get_job(self, job_id):
+        job = self.active.get(job_id) or self.history.get(job_id)
+        if job is None:
+            raise HTTPError(404, f"No job {job_id}")
+        return job
+
+    def status(self):
+        return {
+            'workers': self.workers,
+            'queued': sum(1 for job in self.active.values() if job.state == QUEUED),
+            'running': sum(1 for job in self.active.values() if job.state == RUNNING),
+            'finished': len(self.history),
+            'deduplicated': self.deduplicated,
+        }
+
+    async def submit(self, body, content_type, query):
+        """
+        Queue a job, or return the identical job already queued or running.
+
+        :return: Tuple of (Job, whether it was an existing job).
+        """
+        cover, settings, key = await asyncio.to_thread(parse_submission, body, content_type, query)
+        job = self.in_flight.get(key)
+        if job is not None:
+            job.submissions += 1
+            self.deduplicated += 1
+            return job, True
+        if self.status()['queued'] >= self.max_queued:
+            raise HTTPError(503, "Too many queued jobs")
+        job = Job(cover, settings, key)
+        self.active[job.id] = job
+        self.in_flight[key] = job
+        task = asyncio.create_task(self._execute(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job, False
+
+    async def cancel(self, job):
+        if job.done:
+            return
+        job.cancel_requested = True
+        if job.stop_event is not None:
+            job.stop_event.set()  # The worker returns its best cover
+            if job.messages is not None:
+                # Wake the job up, so it kills a worker that does not stop in time
+                job.messages.put_nowait(('cancel', None))
+        else:
+            await self._finish(job, CANCELLED, None)
+
+    async def _finish(self, job, state, result):
+        if job.done:
+            return
+        if self.in_flight.get(job.key) is job:
+            del self.in_flight[job.key]
+        self.active.pop(job.id, None)
+        self.history.put(job.id, job)
+        job.cover = None
+        await job.update(state=state, result=result, finished=time.time())
+
+    async def _execute(self, job):
+        async with self._slots:
+            if job.done:
+                return  # Cancelled while queued
+            loop = asyncio.get_running_loop()
+            receiver, sender = self.context.Pipe(duplex=False)
+            job.stop_event = self.context.Event()
+            process = self.context.Process(target=run_job,
+                                           args=(job.cover, job.settings, self.cache_path, job.stop_event, sender))
+            # Starting pickles the instance for the worker
+            await asyncio.to_thread(process.start)
+            sender.close()
+            job.cover = None
+            await job.update(state=RUNNING, started=time.time())
+
+            # Relay the worker's messages without blocking the loop: read when readable
+            messages = job.messages = asyncio.Queue()
+            if job.cancel_requested:
+                messages.put_nowait(('cancel', None))  # Cancelled while the worker started
+
+            def on_readable():
+                try:
+                    while receiver.poll():
+                        messages.put_nowait(receiver.recv())
+                except (EOFError, OSError):
+                    loop.remove_reader(receiver.fileno())
+                    messages.put_nowait(None)
+
+            loop.add_reader(receiver.fileno(), on_readable)
+            time_limit = job.settings['time_limit']
+            kill_time = None if time_limit is None else loop.time() + time_limit + KILL_GRACE_PERIOD
+            record = None
+            try:
+                while True:
+                    timeout = None if kill_time is None else max(0.0, kill_time - loop.time())
+                    try:
+                        message = await asyncio.wait_for(messages.get(), timeout)
+                    except asyncio.TimeoutError:
+                        # Past its time limit, or cancelled, and the grace period: some
+                        # solvers (CBC) cannot be interrupted, so the worker is killed
+                        await asyncio.to_thread(kill_process_group, process)
+                        record = {'status': 'cancelled' if job.cancel_requested else 'timeout',
+                                  'cover_size': None, 'rows': None, 'runtime': time.time() - job.started}
+                        break
+                    if message is None:
+                        record = {'status': 'error', 'error': "worker exited without a result"}
+                        break
+                    kind, value = message
+                    if kind == 'result':
+                        record = value
+                        break
+                    if kind == 'cancel':
+                        stop_time = loop.time() + STOP_GRACE_PERIOD
+                        kill_time = stop_time if kill_time is None else min(kill_time, stop_time)
+                        continue
+                    await job.update(progress=value)
+            finally:
+                job.messages = None
+                loop.remove_reader(receiver.fileno())
+                receiver.close()
+            await asyncio.to_thread(process.join)
+
+        if job.cancel_requested:
+            state = CANCELLED
+        elif record['status'] == 'error':
+            state = FAILED
+        else:
+            state = FINISHED
+        await self._finish(job, state, record)
+
+    async def stream(self, job, writer):
+        """
+        Write the job as one JSON line now and after every change, until it is done.
+        """
+        seen = -1
+        while True:
+            async with job.changed:
+                await job.changed.wait_for(lambda: job.version != seen)
+                seen = job.version
+            writer.write(_encode(job.as_dict()) + b'\n')
+            await writer.drain()
+            if job.done:
+                return
+
+    async def handle(self, reader, writer):
+        """
+        Answer one HTTP/1.1 request; the connection is closed afterwards.
+        """
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            try:
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            except ValueError:
+                raise HTTPError(400, "Malformed request line")
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length') or 0)
+            if length > MAX_BODY_BYTES:
+                raise HTTPError(413, f"The body exceeds {MAX_BODY_BYTES} bytes")
+            body = await reader.readexactly(length) if length else b''
+            url = urllib.parse.urlsplit(target)
+            query = dict(urllib.parse.parse_qsl(url.query))
+            await self.route(method, url.path.rstrip('/'), query, headers, body, writer)
+        except HTTPError as e:
+            self.respond(writer, e.status, {'error': str(e)})
+        except (ValueError, TypeError, KeyError) as e:
+            # Invalid instances and settings, as raised by the model and the loaders
+            self.respond(writer, 400, {'error': str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def route(self, method, path, query, headers, body, writer):
+        parts = path.strip('/').split('/')
+        if method == 'GET' and path == '/algorithms':
+            self.respond(writer, 200, list(ALGORITHM_FUNCTIONS))
+        elif method == 'GET' and path == '/status':
+            self.respond(writer, 200, self.status())
+        elif method == 'POST' and path == '/jobs':
+            job, existing = await self.submit(body, headers.get('content-type', ''), query)
+            self.respond(writer, 200 if job.done else 202, {**job.as_dict(), 'deduplicated': existing})
+        elif parts[0] == 'jobs' and len(parts) == 2 and method == 'GET':
+            self.respond(writer, 200, self.get_job(parts[1]).as_dict())
+        elif parts[0] == 'jobs' and len(parts) == 2 and method == 'DELETE':
+            job = self.get_job(parts[1])
+            await self.cancel(job)
+            self.respond(writer, 202, job.as_dict())
+        elif parts[0] == 'jobs' and len(parts) == 3 and parts[2] == 'events' and method == 'GET':
+            job = self.get_job(parts[1])
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                         b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+            await self.stream(job, writer)
+        else:
+            raise HTTPError(404, f"No route for {method} {path}")
+
+    @staticmethod
+    def respond(writer, status, payload):
+        body = _encode(payload)
+        reason = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+                  503: 'Service Unavailable'}.get(status, '')
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+
+    async def serve(self, host, port):
+        """
+        Accept connections until cancelled.
+        """
+        self._slots = asyncio.Semaphore(self.workers)
+        server = await asyncio.start_server(self.handle, host, port, limit=1 << 20)
+        addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"serving on {addresses} with {self.workers} workers", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve minimum row coverage solves over HTTP/JSON.")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on.")
+    parser.add_argument('--port', type=int, default=8000, help="Port to listen on.")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="Number of jobs solved in parallel.")
+    parser.add_argument('--max-queued', type=int, default=MAX_QUEUED_JOBS,
+                        help="Number of jobs that may wait for a worker.")
+    parser.add_argument('--cache', default=None, metavar='FILE',
+                        help="sqlite file caching results across jobs and restarts.")
+    args = parser.parse_args(argv)
+
+    server = SolveServer(args.workers, args.cache, args.max_queued)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
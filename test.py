@@ -0,0 +1,164 @@
+import itertools
+import numpy as np
+import pytest
+from model.model import MatrixModel
+from utils.algorithms import (OPTIMAL, TIMEOUT, branch_and_bound, dynamic_programming, greedy_algorithm,
+                              lagrangian_relaxation, linear_programming, lp_rounding)
+from utils.cache import LRUCache
+from utils.cover_matrix import CoverMatrix
+from utils.loaders import load_instance, save_packed
+from utils.presolve import presolve
+
+
+def random_matrix(seed, num_rows=10, num_cols=8, density=0.3):
+    """
+    Random 0/1 matrix in which every column is covered by at least one row.
+    """
+    rng = np.random.default_rng(seed)
+    matrix = (rng.random((num_rows, num_cols)) < density).astype(int)
+    for col in range(num_cols):
+        matrix[rng.integers(num_rows), col] = 1
+    return matrix
+
+
+def brute_force_minimum(matrix):
+    """
+    Size of the smallest cover, by trying every subset of rows from the smallest up.
+    """
+    cover = CoverMatrix.from_dense(matrix)
+    for size in range(cover.num_rows + 1):
+        if any(cover.covers(list(rows)) for rows in itertools.combinations(range(cover.num_rows), size)):
+            return size
+
+
+@pytest.mark.parametrize('algorithm', [branch_and_bound, dynamic_programming, linear_programming])
+@pytest.mark.parametrize('seed', range(8))
+def test_exact_algorithms_match_brute_force(algorithm, seed):
+    matrix = random_matrix(seed)
+    result = algorithm(matrix.tolist())
+    assert CoverMatrix.from_dense(matrix).covers(result.rows)
+    assert result.status == OPTIMAL
+    assert len(result.rows) == brute_force_minimum(matrix)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_presolve_restore_keeps_optimum(seed):
+    matrix = random_matrix(seed, num_rows=12, num_cols=10, density=0.25)
+    cover = CoverMatrix.from_dense(matrix)
+    presolved = presolve(cover)
+    if presolved.cover.num_cols:
+        rows = presolved.restore(branch_and_bound(presolved.cover).rows)
+    else:
+        rows = presolved.restore([])
+    assert cover.covers(rows)
+    assert len(rows) == brute_force_minimum(matrix)
+
+
+def write_orlib(matrix, path):
+    with open(path, 'w') as handle:
+        handle.write(f"{matrix.shape[1]} {matrix.shape[0]}\n")
+        handle.write(' '.join('1' for _ in range(matrix.shape[0])) + '\n')
+        for col in range(matrix.shape[1]):
+            rows = np.flatnonzero(matrix[:, col]) + 1
+            handle.write(f"{len(rows)} {' '.join(map(str, rows))}\n")
+
+
+def write_rail(matrix, path):
+    with open(path, 'w') as handle:
+        handle.write(f"{matrix.shape[1]} {matrix.shape[0]}\n")
+        for row in matrix:
+            cols = np.flatnonzero(row) + 1
+            handle.write(f"1 {len(cols)} {' '.join(map(str, cols))}\n")
+
+
+def write_sparse(matrix, path):
+    with open(path, 'w') as handle:
+        handle.write(f"{matrix.shape[0]} {matrix.shape[1]}\n")
+        for row in matrix:
+            handle.write(' '.join(map(str, np.flatnonzero(row))) + '\n')
+
+
+@pytest.mark.parametrize('fmt, name, writer', [
+    ('orlib', 'scp.txt', write_orlib),
+    ('rail', 'rail.txt', write_rail),
+    ('sparse', 'instance.rows', write_sparse),
+    ('packed', 'instance.bin', lambda matrix, path: save_packed(CoverMatrix.from_dense(matrix), path)),
+])
+def test_loaders_round_trip(tmp_path, fmt, name, writer):
+    matrix = random_matrix(3, num_rows=15, num_cols=20)
+    path = str(tmp_path / name)
+    writer(matrix, path)
+    for loaded in (load_instance(path, fmt), load_instance(path)):
+        assert loaded.equals(CoverMatrix.from_dense(matrix))
+        assert np.array_equal(loaded.to_numpy(), matrix)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_model_cache_hits_and_misses():
+    matrix = random_matrix(5, num_rows=20, num_cols=12).tolist()
+    model = MatrixModel()
+    model.enable_cache()
+    model.set_matrix(matrix)
+    model.run_algorithm('Branch and Bound')
+    assert not model.get_result('Branch and Bound').details.get('cached')
+
+    # Setting the same matrix again, as the GUI does on every run, still hits
+    model.set_matrix([list(row) for row in matrix])
+    model.run_algorithm('Branch and Bound')
+    assert model.get_result('Branch and Bound').details.get('cached')
+
+    # Different settings and a different matrix miss
+    model.run_algorithm('Branch and Bound', use_presolve=False)
+    assert not model.get_result('Branch and Bound').details.get('cached')
+    changed = [list(row) for row in matrix]
+    changed[0] = [1] * len(changed[0])
+    model.set_matrix(changed)
+    model.run_algorithm('Branch and Bound')
+    assert not model.get_result('Branch and Bound').details.get('cached')
+    assert model.get_cache_stats()['hits'] == 1
+
+
+@pytest.mark.parametrize('algorithm', [branch_and_bound, greedy_algorithm, lagrangian_relaxation,
+                                       linear_programming, lp_rounding])
+@pytest.mark.parametrize('time_limit', [0.0, 0.5])
+def test_time_limited_results_are_valid(algorithm, time_limit):
+    matrix = random_matrix(11, num_rows=60, num_cols=40, density=0.08)
+    optimum = branch_and_bound(matrix.tolist()).objective
+    result = algorithm(matrix.tolist(), time_limit=time_limit)
+    assert CoverMatrix.from_dense(matrix).covers(result.rows)
+    if result.status == OPTIMAL:
+        assert result.objective == optimum
+    if result.lower_bound is not None:
+        assert result.lower_bound <= optimum <= result.objective
+    if time_limit == 0.0 and algorithm is not greedy_algorithm:
+        # An expired deadline still starts from the complete greedy cover
+        assert result.objective <= greedy_algorithm(matrix.tolist()).objective
+
+
+def test_model_time_limit_on_blocks():
+    rng = np.random.default_rng(2)
+    matrix = np.zeros((120, 40), dtype=int)
+    for block in range(4):
+        part = (rng.random((30, 10)) < 0.2).astype(int)
+        part[rng.integers(30, size=10), np.arange(10)] = 1
+        matrix[block * 30:(block + 1) * 30, block * 10:(block + 1) * 10] = part
+    model = MatrixModel()
+    model.set_matrix(matrix.tolist())
+    model.run_algorithm('Greedy', use_presolve=False)
+    greedy = model.get_result('Greedy').objective
+    model.run_algorithm('Branch and Bound', use_presolve=False, time_limit=0.0)
+    result = model.get_result('Branch and Bound')
+    assert result.details['blocks'] == 4
+    assert CoverMatrix.from_dense(matrix).covers(result.rows)
+    assert result.status in (OPTIMAL, TIMEOUT)
+    assert result.objective <= greedy
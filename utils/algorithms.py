@@ -1,209 +1,1349 @@
 # utils/algorithms.py
-import random
+import functools
+import heapq
+import math
+import multiprocessing
+import os
+import queue
+import tempfile
+import time
+from multiprocessing import shared_memory
 import pulp
 import numpy as np
+from utils.cache import LRUCache
+from utils.control import SolveControl
+from utils.cover_matrix import as_cover_matrix, iter_bits
+from utils.processes import kill_process_group, start_process_group
 
 
-def covers_all_columns(matrix, rows, num_cols):
+# Solver statuses
+OPTIMAL = 'optimal'  # The cover is proven minimum
+FEASIBLE = 'feasible'  # The cover is valid but not proven minimum
+TIMEOUT = 'timeout'  # A time or work limit stopped the search; the cover is the best found
+
+
+class SolverResult:
+    """
+    Outcome of a solver run: the cover plus what the solver knows about its quality.
+    """
+
+    def __init__(self, rows, status=FEASIBLE, lower_bound=None, **details):
+        """
+        :param rows: List of row indices of the cover.
+        :param status: One of OPTIMAL, FEASIBLE or TIMEOUT.
+        :param lower_bound: Optional proven lower bound on the minimum cover size.
+        :param details: Solver-specific extra information (counters, timings...).
+        """
+        self.rows = rows
+        self.status = status
+        self.lower_bound = lower_bound
+        self.details = details
+
+    @property
+    def objective(self):
+        """
+        The number of rows in the cover.
+        """
+        return len(self.rows)
+
+    @property
+    def gap(self):
+        """
+        Relative gap between the cover size and the lower bound, or None without a bound.
+        """
+        if self.lower_bound is None:
+            return None
+        if not self.rows:
+            return 0.0
+        return max(0.0, (self.objective - self.lower_bound) / self.objective)
+
+
+def as_solver_result(result):
+    """
+    Wrap the plain row list some algorithms return into a SolverResult.
+
+    :param result: A SolverResult or a list of row indices.
+    :return: A SolverResult.
+    """
+    if isinstance(result, SolverResult):
+        return result
+    return SolverResult(list(result))
+
+
+def covers_all_columns(matrix, rows, num_cols=None):
     """
     Check if the selected rows cover all columns.
 
-    :param matrix: The original matrix.
+    :param matrix: The original matrix, as a CoverMatrix or a dense 2D list.
     :param rows: Rows selected as a potential solution.
-    :param num_cols: The total number of columns in the matrix.
+    :param num_cols: Unused; kept for backwards compatibility.
     :return: True if all columns are covered, False otherwise.
     """
-    covered = [False] * num_cols
+    return as_cover_matrix(matrix).covers(rows)
+
+
+def remove_redundant_rows(matrix, rows):
+    """
+    Drop rows from a cover whose columns are all covered by the other selected rows.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param rows: Row indices of a cover.
+    :return: A list of row indices with no redundant rows, in the original order.
+    """
+    cover = as_cover_matrix(matrix)
+    selected = list(rows)
+    # Try to remove the rows that cover the fewest columns first.
+    for row in sorted(selected, key=lambda r: cover.row_bits[r].bit_count()):
+        rest = [r for r in selected if r != row]
+        if cover.covers(rest):
+            selected = rest
+    return selected
+
+
+def _bits_to_mask(bits, length):
+    """
+    Convert an integer bitset into a boolean NumPy mask of the given length.
+    """
+    raw = np.frombuffer(bits.to_bytes((length + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(raw, count=length, bitorder='little').astype(bool)
+
+
+def _lagrangian_bound(dense, multipliers, uncovered, available, target, iterations):
+    """
+    Lagrangian lower bound on the number of rows still needed at a search node.
 
-    for row in rows:
-        for col in range(num_cols):
-            if matrix[row][col] == 1:  # or some condition to check coverage
-                covered[col] = True
+    Relaxes the cover constraints of the uncovered columns with non-negative column
+    multipliers u; for any u the value sum(u) + sum over available rows of
+    min(0, 1 - u covered by the row) is a valid bound. A few subgradient steps, started
+    from the parent's multipliers, tighten it.
 
-    return all(covered)
+    :param dense: Dense float matrix of shape (num_rows, num_cols).
+    :param multipliers: Starting column multipliers (not modified).
+    :param uncovered: Boolean mask of the uncovered columns.
+    :param available: Boolean mask of the rows that may still be selected.
+    :param target: The bound value that would prune the node.
+    :param iterations: The number of subgradient steps.
+    :return: Tuple of (bound, multipliers, reduced row costs) for the best bound found.
+    """
+    u = np.where(uncovered, multipliers, 0.0)
+    best = (-np.inf, u, None)
+    step_scale = 1.0
+    for _ in range(iterations + 1):
+        reduced_costs = 1.0 - dense @ u
+        picked = available & (reduced_costs < 0)
+        value = u.sum() + reduced_costs[picked].sum()
+        if value > best[0]:
+            best = (value, u, reduced_costs)
+        if value >= target - 1e-6:
+            break
 
+        # Subgradient step towards covering each uncovered column exactly once.
+        subgradient = np.where(uncovered, 1.0 - dense[picked].sum(axis=0), 0.0)
+        norm = subgradient @ subgradient
+        if norm == 0:
+            break
+        u = np.maximum(0.0, u + step_scale * (target - value) / norm * subgradient)
+        step_scale *= 0.9
+    return best
 
-def branch_and_bound(matrix):
+
+def _undominated(row_bits, candidates, uncovered):
     """
-    Solve the minimum row coverage problem using the Branch and Bound method.
+    Drop candidate rows whose uncovered columns are a subset of another candidate's.
 
-    :param matrix: A 2D list of integers representing the matrix.
-    :return: A list of row indices indicating the rows that form the minimum coverage.
+    :return: The remaining candidates; among identical rows only the first is kept.
     """
-    if not matrix:
-        return []
+    coverage = [(row_bits[row] & uncovered, row) for row in candidates]
+    kept = []
+    for index, (bits, row) in enumerate(coverage):
+        dominated = False
+        for other_index, (other_bits, _) in enumerate(coverage):
+            if other_index != index and bits & ~other_bits == 0 and (bits != other_bits or other_index < index):
+                dominated = True
+                break
+        if not dominated:
+            kept.append(row)
+    return kept
 
-    num_rows = len(matrix)
-    num_cols = len(matrix[0])
 
-    # Initial solutions (each row by itself)
-    solutions = [[i] for i in range(num_rows)]
+def branch_and_bound(matrix, control=None, initial=None, time_limit=None, node_limit=None):
+    """
+    Solve the minimum row coverage problem using a depth-first Branch and Bound method.
 
-    # Placeholder for the final result
-    final_rows = []
+    The search branches on the rows covering the uncovered column with the fewest
+    candidate rows, skipping candidates dominated by another candidate; after a row has
+    been explored it is excluded from its siblings, so every subset is visited at most
+    once. Nodes are pruned with a Lagrangian lower bound whose multipliers are passed
+    down the tree, rows whose reduced cost pushes the bound past the incumbent are
+    fixed out, and the incumbent is seeded from the greedy solution or, when smaller,
+    from the repaired initial cover.
 
-    while solutions:
-        # Get a candidate solution
-        candidate = solutions.pop(0)
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param control: Optional SolveControl for progress reports and cancellation.
+    :param initial: Optional row indices of a previous (possibly partial) cover to
+                    warm-start from.
+    :param time_limit: Optional wall-clock budget in seconds.
+    :param node_limit: Optional maximum number of search nodes.
+    :return: A SolverResult; its status is OPTIMAL unless the search was stopped early,
+             in which case it holds the best cover found and the root lower bound, with
+             the TIMEOUT status when the time or node limit stopped it.
+    """
+    control = (control or SolveControl()).with_time_limit(time_limit)
+    cover = as_cover_matrix(matrix)
+    if not cover.num_rows or not cover.num_cols:
+        return SolverResult([], OPTIMAL, 0)
 
-        # Check if this combination covers all columns
-        if covers_all_columns(matrix, candidate, num_cols):
-            if not final_rows or len(candidate) < len(final_rows):
-                final_rows = candidate
-            continue  # We don't branch on full coverage sets
+    uncoverable = cover.uncoverable_columns()
+    if uncoverable:
+        raise ValueError(f"Columns {uncoverable} cannot be covered by any row")
 
-        # If we haven't covered all columns and the candidate has fewer rows than the best solution so far
-        if not final_rows or len(candidate) < len(final_rows) - 1:
-            # Branch: create new candidate solutions by adding each of the other rows
-            for i in range(num_rows):
-                if i not in candidate:
-                    new_candidate = candidate + [i]
-                    solutions.append(new_candidate)
+    column_bits = cover.column_bits()
+    row_bits = cover.row_bits
+    full_mask = cover.full_mask
+    dense = cover.to_numpy(np.float64)
 
-    return final_rows
+    # Seed the incumbent with the greedy solution, or the warm-start cover if smaller. The
+    # greedy pass ignores the control: cut short by the deadline its cover is far worse.
+    best_rows = remove_redundant_rows(cover, greedy_algorithm(cover).rows)
+    if initial is not None:
+        best_rows = min(repair_cover(cover, initial), best_rows, key=len)
 
+    # Optimize the root multipliers once; every node starts from its parent's.
+    root_multipliers = np.full(cover.num_cols, 1.0 / max(1, dense.sum(axis=1).max()))
+    root_bound, root_multipliers, _ = _lagrangian_bound(dense, root_multipliers, np.ones(cover.num_cols, dtype=bool),
+                                                        np.ones(cover.num_rows, dtype=bool), len(best_rows), 200)
+    root_bound = math.ceil(root_bound - 1e-6)
+    control.report(incumbent=len(best_rows), lower_bound=root_bound, nodes=0)
 
-def greedy_algorithm(matrix):
-    # Assuming 1s in the matrix indicate the presence of a required element
-    num_rows = len(matrix)
-    num_cols = len(matrix[0])
+    nodes = 0
+    prunes = 0  # Nodes cut off by the bound
+    stopped = False
+    chosen = []
+    control.offer_incumbent(len(best_rows))
+    # Size of the best cover found by solvers running alongside (see utils.portfolio);
+    # the search prunes against it as well as against its own incumbent.
+    shared = control.best_known()
+    # Each frame holds the coverage, available rows and multipliers at that depth, plus
+    # the candidate rows still to branch on.
+    stack = [(0, (1 << cover.num_rows) - 1, root_multipliers, None)]
+    while stack:
+        covered, available, multipliers, candidates = stack[-1]
 
-    covered = set()
-    selected_rows = []
+        if candidates is None:
+            if control.should_stop() or (node_limit is not None and nodes >= node_limit):
+                stopped = True
+                break
+            nodes += 1
+            if nodes % 256 == 0:
+                control.report(incumbent=len(best_rows), nodes=nodes)
+                shared = control.best_known()
 
-    while len(covered) < num_cols:
-        # Find the row that covers the most uncovered elements
-        most_effective_row = None
-        coverage = set()
-        #For each row, it calculates how many uncovered columns it can cover.
-        for i in range(num_rows):
-            current_coverage = {j for j, cell in enumerate(matrix[i]) if cell == 1 and j not in covered}
-            if len(current_coverage) > len(coverage):
-                coverage = current_coverage
-                most_effective_row = i
+            # First visit of this node: check for a solution, bound, then pick a column.
+            uncovered = full_mask & ~covered
+            candidates = []
+            if not uncovered:
+                if len(chosen) < len(best_rows):
+                    best_rows = list(chosen)
+                    control.report(incumbent=len(best_rows))
+                    control.offer_incumbent(len(best_rows))
+            else:
+                upper = len(best_rows) if shared is None else min(len(best_rows), shared)
+                target = upper - len(chosen)
+                available_mask = _bits_to_mask(available, cover.num_rows)
+                bound, multipliers, reduced_costs = _lagrangian_bound(
+                    dense, multipliers, _bits_to_mask(uncovered, cover.num_cols), available_mask, target, 10)
 
-        # Update the sets of covered elements and selected rows
-        covered |= coverage
-        if most_effective_row is not None:  # Check in case of an empty row
-            selected_rows.append(most_effective_row)
+                if math.ceil(bound - 1e-6) < target:
+                    # Reduced-cost fixing: selecting these rows would reach the incumbent.
+                    for row in np.flatnonzero(available_mask & (reduced_costs > 0)
+                                              & (np.ceil(bound + reduced_costs - 1e-6) >= target)):
+                        available &= ~(1 << int(row))
 
-    return selected_rows
+                    # Branch on the most constrained uncovered column.
+                    col = min(iter_bits(uncovered), key=lambda c: (column_bits[c] & available).bit_count())
+                    candidates = _undominated(row_bits, iter_bits(column_bits[col] & available), uncovered)
+                    candidates.sort(key=lambda r: (row_bits[r] & uncovered).bit_count())
+                else:
+                    prunes += 1
+            stack[-1] = (covered, available, multipliers, candidates)
 
+        if not candidates:
+            # Node exhausted: backtrack and undo the row that led here.
+            stack.pop()
+            if chosen:
+                chosen.pop()
+            continue
 
-#make rondom list of true or false lengh if list is rows 
-def initialize_population(population_size, num_rows):
-    population = []
-    for _ in range(population_size):
-        individual = [random.choice([True, False]) for _ in range(num_rows)]
-        population.append(individual)
-    return population
+        # Take the candidate with the largest gain; later siblings exclude it.
+        row = candidates.pop()
+        available &= ~(1 << row)
+        stack[-1] = (covered, available, multipliers, candidates)
+        chosen.append(row)
+        stack.append((covered | row_bits[row], available, multipliers, None))
+
+    control.report(incumbent=len(best_rows), nodes=nodes)
+    if stopped:
+        # A cancelled search is merely feasible; a time or node limit is a timeout
+        status = FEASIBLE if control.cancelled else TIMEOUT
+        return SolverResult(sorted(best_rows), status, min(root_bound, len(best_rows)), nodes=nodes, prunes=prunes)
+    if shared is not None and shared < len(best_rows):
+        # The search proved that no cover beats the shared incumbent, found by another solver
+        return SolverResult(sorted(best_rows), FEASIBLE, shared, nodes=nodes, prunes=prunes)
+    return SolverResult(sorted(best_rows), OPTIMAL, len(best_rows), nodes=nodes, prunes=prunes)
+
+
+def greedy_algorithm(matrix, control=None, initial=None, time_limit=None):
+    """
+    Solve the minimum row coverage problem with a lazy greedy heuristic.
+
+    Row gains (the number of still uncovered columns a row covers) live in a max-heap.
+    When a column becomes covered, the gains of the rows covering it are decremented
+    through the column incidence; heap entries are only re-checked when popped, and a
+    stale entry is pushed back with its current gain. Ties go to the lowest row index.
+
+    Given an initial cover, its rows are selected first and the greedy only covers the
+    columns they leave uncovered, after which rows made redundant are dropped; after a
+    small edit of the matrix this repairs the previous cover in a few milliseconds.
+
+    If the time limit passes (or the control is cancelled) before the cover is
+    complete, each remaining column is covered by the first row covering it, so a
+    cover is always returned.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param control: Optional SolveControl for the result report and cancellation.
+    :param initial: Optional row indices of a previous (possibly partial) cover.
+    :param time_limit: Optional wall-clock budget in seconds.
+    :return: A SolverResult whose rows are in the order they were selected.
+    """
+    control = (control or SolveControl()).with_time_limit(time_limit)
+    cover = as_cover_matrix(matrix)
+
+    # Detect columns that no row can cover before starting.
+    uncoverable = cover.uncoverable_columns()
+    if uncoverable:
+        raise ValueError(f"Columns {uncoverable} cannot be covered by any row")
+
+    selected_rows = list(dict.fromkeys(initial)) if initial is not None else []
+    uncovered = cover.full_mask & ~cover.covered_mask(selected_rows)
+
+    gains = np.array([(bits & uncovered).bit_count() for bits in cover.row_bits], dtype=np.int64)
+    heap = [(-int(gain), row) for row, gain in enumerate(gains) if gain]
+    heapq.heapify(heap)
+
+    stopped = False
+    steps = 0
+    heap_pops = 0
+    while uncovered:
+        steps += 1
+        if steps % 64 == 0 and control.should_stop():
+            # Out of time: finish with the first row covering each remaining column
+            for col in iter_bits(uncovered):
+                if uncovered >> col & 1:
+                    row = int(cover.rows_covering(col)[0])
+                    selected_rows.append(row)
+                    uncovered &= ~cover.row_bits[row]
+            stopped = True
+            break
+
+        neg_gain, row = heapq.heappop(heap)
+        heap_pops += 1
+        gain = gains[row]
+        if -neg_gain != gain:
+            # Stale entry: re-insert with the current gain if the row is still useful.
+            if gain:
+                heapq.heappush(heap, (-int(gain), row))
+            continue
+
+        selected_rows.append(row)
+        newly_covered = cover.row_bits[row] & uncovered
+        uncovered &= ~newly_covered
+
+        # Every row covering a newly covered column loses one unit of gain.
+        touched = [cover.rows_covering(col) for col in iter_bits(newly_covered)]
+        np.subtract.at(gains, np.concatenate(touched), 1)
 
-def select_parents(scored_population, num_parents=2):
-    # Simple roulette wheel selection
-    total_fitness = sum(score for _, score in scored_population)  # sum of all scores
-    selection_probs = [score / total_fitness for _, score in scored_population]
+    if initial is not None or stopped:
+        selected_rows = remove_redundant_rows(cover, selected_rows)
+    control.report(incumbent=len(selected_rows))
+    status = TIMEOUT if stopped and not control.cancelled else FEASIBLE
+    return SolverResult(selected_rows, status, heap_pops=heap_pops)
 
-    parents = random.choices(scored_population, weights=selection_probs, k=num_parents)
-    return [individual for individual, _ in parents]
 
+#make rondom population of true or false, one row of the array per individual
+def initialize_population(rng, population_size, num_rows, density=0.5):
+    return rng.random((population_size, num_rows)) < density
 
-def crossover(parents):
-    # For simplicity, let's assume there are always two parents
-    parent_a, parent_b = parents
-    print(parent_a , parent_b)
-    child = []
+def select_parents(rng, scores, num_parents, tournament_size=2):
+    # Tournament selection: each parent is the fittest of a few random individuals
+    contestants = rng.integers(0, len(scores), size=(num_parents, tournament_size))
+    winners = np.argmax(scores[contestants], axis=1)
+    return contestants[np.arange(num_parents), winners]
 
-    for gene_a, gene_b in zip(parent_a, parent_b):
-        child.append(random.choice([gene_a, gene_b]))
 
-    return [child]  # Returns a list of one child; in reality, you might have more than one child
+def crossover(rng, parents_a, parents_b):
+    # Uniform crossover: every gene comes from either parent with equal probability
+    num_children, num_rows = parents_a.shape
+    random_bytes = rng.integers(0, 256, size=(num_children, (num_rows + 7) // 8), dtype=np.uint8)
+    take_a = np.unpackbits(random_bytes, axis=1, count=num_rows).view(bool)
+    return parents_b ^ ((parents_a ^ parents_b) & take_a)
 
 
-# flip the value of some silutions rondmly
-def mutate(population, mutation_rate):
-    # Randomly flip the 'gene' with a chance of 'mutation_rate'
-    for individual in population:
-        if random.random() < mutation_rate:
-            mutate_at = random.randint(0, len(individual) - 1)
-            individual[mutate_at] = not individual[mutate_at]  # Flip the value
+# flip the value of some genes rondmly, each with a chance of 'mutation_rate'
+def mutate(rng, population, mutation_rate):
+    num_flips = rng.binomial(population.size, mutation_rate)
+    flat = population.reshape(-1)
+    positions = rng.integers(0, population.size, size=num_flips)
+    flat[positions] = ~flat[positions]
     return population
 
 
+# Largest number of genes gathered at once when scoring a population (individuals
+# times ones of the matrix); larger populations are scored in slices.
+FITNESS_CHUNK_CELLS = 1 << 24
 
 
-# Fitness function
-def fitness(individual, matrix):
-    covered = set()
-    for row_selected, row in zip(individual, matrix):
-        if row_selected:
-            covered.update(col_index for col_index, cell in enumerate(row) if cell)
-    score = len(covered) - sum(individual)
-    return score if len(covered) == len(matrix[0]) else -1
+# Fitness function, scoring the whole population at once from the column incidence
+def fitness(population, incidence):
+    # Feasible individuals score num_cols - selected rows (as before); infeasible ones are
+    # pushed below every feasible score, ranked by how many columns they still cover.
+    col_ptr, col_idx, num_rows = incidence
+    num_cols = len(col_ptr) - 1
+    # A column is covered when any gene of its covering rows is set
+    starts = col_ptr[:-1][np.diff(col_ptr) > 0]
+    covered = np.zeros(len(population), dtype=np.int64)
+    if len(col_idx):
+        chunk = max(1, FITNESS_CHUNK_CELLS // len(col_idx))
+        for start in range(0, len(population), chunk):
+            genes = population[start:start + chunk, col_idx]
+            covered[start:start + chunk] = np.count_nonzero(np.logical_or.reduceat(genes, starts, axis=1), axis=1)
+    selected = np.count_nonzero(population, axis=1)
+    score = covered - selected
+    return np.where(covered == num_cols, score, score - num_rows - 1)
 
-def genetic_algorithm(matrix):
-    POPULATION_SIZE = 100
-    GENERATIONS = 1000
-    MUTATION_RATE = 0.01  # Adjust mutation rate if necessary
 
-    population = initialize_population(POPULATION_SIZE, len(matrix))
+def cached_fitness(population, incidence, cache):
+    """
+    Fitness of a population, looking every individual up by its packed genes first;
+    only the individuals missing from the cache are scored, in one batch.
+
+    :param population: Boolean array of shape (population_size, num_rows).
+    :param incidence: Tuple (col_ptr, col_idx, num_rows) of the matrix's column incidence.
+    :param cache: An LRUCache of packed individuals to their fitness.
+    :return: Array of fitness scores, as from fitness().
+    """
+    keys = [genes.tobytes() for genes in np.packbits(population, axis=1)]
+    scores = np.empty(len(population), dtype=np.int64)
+    missing = []
+    for index, key in enumerate(keys):
+        score = cache.get(key)
+        if score is None:
+            missing.append(index)
+        else:
+            scores[index] = score
+    if len(missing) == len(population):
+        # Nothing was found: score the population as is, without gathering a copy
+        computed = fitness(population, incidence)
+        scores[:] = computed
+    elif missing:
+        computed = fitness(population[missing], incidence)
+        scores[missing] = computed
+    else:
+        return scores
+    for index, score in zip(missing, computed.tolist()):
+        cache.put(keys[index], score)
+    return scores
+
+
+def repair_cover(matrix, rows):
+    """
+    Turn a set of rows into a non-redundant cover.
+
+    Greedily adds the row covering the most uncovered columns until every column is
+    covered, then drops redundant rows.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param rows: Row indices of a (possibly partial) cover.
+    :return: A list of row indices covering every coverable column.
+    """
+    cover = as_cover_matrix(matrix)
+    selected = list(rows)
+    uncovered = cover.full_mask & ~cover.covered_mask(selected)
+    while uncovered:
+        # Only rows covering an uncovered column can help
+        candidates = np.unique(np.concatenate([cover.rows_covering(col) for col in iter_bits(uncovered)]))
+        if not len(candidates):
+            break  # The remaining columns cannot be covered by any row
+        row = max(candidates.tolist(), key=lambda r: (cover.row_bits[r] & uncovered).bit_count())
+        selected.append(row)
+        uncovered &= ~cover.row_bits[row]
+    return remove_redundant_rows(cover, selected)
+
+
+def _evolve(rng, incidence, population_size, generations, mutation_rate, migrate=None, migration_interval=None,
+            control=None, seeds=None, fitness_cache=None):
+    """
+    Run the generational loop of the genetic algorithm on one population.
+
+    :param rng: NumPy random generator of this population.
+    :param incidence: Tuple (col_ptr, col_idx, num_rows) of the matrix's column incidence.
+    :param population_size: The number of individuals per generation.
+    :param generations: The maximum number of generations.
+    :param mutation_rate: The probability of flipping each gene of an offspring.
+    :param migrate: Optional callback taking the best individuals of the population and
+                    returning a (possibly empty) boolean array of immigrants.
+    :param migration_interval: Number of generations between two calls to migrate.
+    :param control: Optional SolveControl for progress reports, cancellation and the
+                    deadline, checked every generation.
+    :param seeds: Optional boolean array of individuals placed in the initial population.
+    :param fitness_cache: Optional LRUCache through which every individual is scored
+                          (see cached_fitness); individuals carried over or recreated
+                          unchanged then cost a lookup instead of a matrix product.
+    :return: Tuple of (best individual, its fitness, number of generations evolved).
+    """
+    control = control or SolveControl()
+    if fitness_cache is not None:
+        score = functools.partial(cached_fitness, incidence=incidence, cache=fitness_cache)
+    else:
+        score = functools.partial(fitness, incidence=incidence)
+    population = initialize_population(rng, population_size, incidence[2])
+    if seeds is not None:
+        population[:len(seeds)] = seeds[:population_size]
     best_solution = None
-    best_fitness = float('-inf')
+    best_fitness = -np.inf
+
+    generation = 0
+    while generation < generations:
+        if control.should_stop():
+            break
+        if generation % 10 == 0 and best_solution is not None:
+            control.report(generation=generation, incumbent=int(np.count_nonzero(best_solution)))
+
+        scores = score(population)
+
+        if migrate is not None and generation and generation % migration_interval == 0:
+            # Send the best individuals away and let immigrants replace the worst ones
+            ranking = np.argsort(scores)
+            immigrants = migrate(population[ranking[::-1][:population_size // 10 or 1]])
+            if len(immigrants):
+                worst = ranking[:len(immigrants)]
+                population[worst] = immigrants
+                scores[worst] = score(immigrants)
 
-    for _ in range(GENERATIONS):
-        scored_population = [(individual, fitness(individual, matrix)) for individual in population]
-        
         # Update the best solution if a new best is found
-        for individual, score in scored_population:
-            if score > best_fitness:
-                best_solution = individual
-                best_fitness = score
+        best_index = int(np.argmax(scores))
+        if scores[best_index] > best_fitness:
+            best_solution = population[best_index].copy()
+            best_fitness = scores[best_index]
+
+        parents_a = population[select_parents(rng, scores, population_size)]
+        parents_b = population[select_parents(rng, scores, population_size)]
+        population = mutate(rng, crossover(rng, parents_a, parents_b), mutation_rate)
 
-        # If a perfect solution is found, stop early
-        if best_fitness == len(matrix[0]) - sum(best_solution):
-            break
-        
-        parents = select_parents(scored_population)
-        children = crossover(parents)
-        population = mutate(children + population, MUTATION_RATE)  # Keep old population and new children
-        
         # Keep the best solution in the population
-        population = [best_solution] + sorted(population, key=lambda ind: fitness(ind, matrix), reverse=True)[:POPULATION_SIZE-1]
+        population[0] = best_solution
+        generation += 1
+
+    if best_solution is None:
+        # No generation ran before the deadline; fall back to the initial population
+        scores = score(population)
+        best_index = int(np.argmax(scores))
+        best_solution, best_fitness = population[best_index], scores[best_index]
+    return best_solution, best_fitness, generation
+
+
+def _island_worker(index, shm_name, shape, seed_sequence, settings, inboxes, results, stop_event):
+    """
+    Evolve one island of the island-model genetic algorithm in a worker process.
+
+    The column incidence of the matrix, whose (num_rows, num_cols, nnz) is shape, is
+    read from the shared memory block shm_name. Every
+    migration_interval generations the best individuals are sent (bit-packed) to the
+    next island of the ring, or to a random island, and received immigrants replace
+    the worst individuals. Setting stop_event stops every island at its next check.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        num_rows, num_cols, nnz = shape
+        arrays = np.ndarray((num_cols + 1 + nnz,), dtype=np.int64, buffer=shm.buf)
+        incidence = (arrays[:num_cols + 1], arrays[num_cols + 1:], num_rows)
+        rng = np.random.default_rng(seed_sequence)
+        num_islands = len(inboxes)
+        for inbox in inboxes:
+            # Migrants still queued for a finished island must not keep this process alive
+            inbox.cancel_join_thread()
+
+        def migrate(emigrants):
+            if settings['topology'] == 'ring':
+                target = (index + 1) % num_islands
+            else:
+                target = (index + 1 + int(rng.integers(num_islands - 1))) % num_islands
+            inboxes[target].put(np.packbits(emigrants, axis=1))
+
+            arrivals = []
+            while True:
+                try:
+                    arrivals.append(inboxes[index].get_nowait())
+                except queue.Empty:
+                    break
+            if not arrivals:
+                return np.zeros((0, num_rows), dtype=bool)
+            return np.unpackbits(np.concatenate(arrivals), axis=1, count=num_rows).astype(bool)
+
+        fitness_cache = LRUCache(settings['fitness_cache_size']) if settings['fitness_cache_size'] else None
+        best_solution, best_fitness, generations = _evolve(rng, incidence, settings['population_size'],
+                                                           settings['generations'], settings['mutation_rate'],
+                                                           migrate, settings['migration_interval'],
+                                                           SolveControl(stop_event), settings['seeds'], fitness_cache)
+        hits, misses = (fitness_cache.hits, fitness_cache.misses) if fitness_cache is not None else (0, 0)
+        results.put((float(best_fitness), np.flatnonzero(best_solution).tolist(), generations, hits, misses))
+        del incidence, arrays
+    finally:
+        shm.close()
+
+
+def _island_model(cover, islands, seed, settings, control):
+    """
+    Run one island per worker process.
+
+    The column incidence of the matrix is placed in a shared memory block that every
+    worker maps instead of receiving its own pickled copy, and each island gets its
+    own child seed. While
+    waiting, the control is polled so a cancellation or deadline reaches every island.
+
+    :return: Tuple of (indices of the best individual, total generations evolved,
+             total fitness cache hits, total fitness cache misses).
+    """
+    shape = (cover.num_rows, cover.num_cols, cover.nnz)
+    shm = shared_memory.SharedMemory(create=True, size=8 * (cover.num_cols + 1 + cover.nnz))
+    try:
+        shared = np.ndarray((cover.num_cols + 1 + cover.nnz,), dtype=np.int64, buffer=shm.buf)
+        shared[:cover.num_cols + 1] = cover.col_ptr
+        shared[cover.num_cols + 1:] = cover.col_idx
+
+        context = multiprocessing.get_context()
+        inboxes = [context.Queue() for _ in range(islands)]
+        results = context.Queue()
+        stop_event = context.Event()
+        seeds = np.random.SeedSequence(seed).spawn(islands)
+        workers = [context.Process(target=_island_worker,
+                                   args=(index, shm.name, shape, seeds[index], settings, inboxes, results,
+                                         stop_event))
+                   for index in range(islands)]
+        for worker in workers:
+            worker.start()
+
+        island_results = []
+        while len(island_results) < islands:
+            try:
+                island_results.append(results.get(timeout=0.1))
+            except queue.Empty:
+                if control.should_stop():
+                    stop_event.set()
+                elif not any(worker.is_alive() for worker in workers) and results.empty():
+                    raise RuntimeError("Genetic algorithm island worker exited without a result")
+        best_fitness, best_rows = max(island_results)[:2]
+        for worker in workers:
+            worker.join()
+        del shared
+        totals = [sum(values) for values in zip(*(island[2:] for island in island_results))]
+        return (best_rows, *totals)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def genetic_algorithm(matrix, population_size=100, generations=1000, mutation_rate=0.01, seed=None,
+                      islands=1, migration_interval=50, topology='ring', time_limit=None, control=None,
+                      initial=None, evaluation_limit=None, fitness_cache_size=0):
+    """
+    Solve the minimum row coverage problem with a batched genetic algorithm.
+
+    The population is a boolean array (one individual per row, one gene per matrix
+    row) scored per generation by gathering its genes over the column incidence, so
+    the matrix is never expanded to a dense copy. Each generation replaces
+    the population with tournament-selected, uniformly crossed over and mutated
+    offspring, keeping the best individual found so far. With fitness_cache_size > 0,
+    fitness scores are memoized by the packed genes of the individual in a bounded LRU
+    cache, so offspring identical to an earlier individual are not scored again. That
+    only pays off at low mutation rates (around 0.001, once the population has
+    converged): at the default rate almost only the carried-over elite hits, and the
+    lookups cost more than they save.
+
+    With islands > 1 the island model is used: each island evolves its own population
+    in a separate process and the best individuals migrate between islands every
+    migration_interval generations.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param population_size: The number of individuals per generation (per island).
+    :param generations: The maximum number of generations to evolve.
+    :param mutation_rate: The probability of flipping each gene of an offspring.
+    :param seed: Optional seed for the random number generator.
+    :param islands: The number of islands (worker processes); 1 evolves in-process.
+    :param migration_interval: The number of generations between migrations.
+    :param topology: 'ring' sends migrants to the next island, 'random' to a random one.
+    :param time_limit: Optional wall-clock budget in seconds.
+    :param control: Optional SolveControl for progress reports and cancellation.
+    :param initial: Optional row indices of a previous (possibly partial) cover; once
+                    repaired it joins the initial population (of every island).
+    :param evaluation_limit: Optional maximum number of fitness evaluations (individuals
+                             scored, whether from the cache or not), shared between
+                             the islands.
+    :param fitness_cache_size: Number of fitness scores remembered per island; 0 or
+                               None (the default) scores every individual every
+                               generation.
+    :return: A SolverResult with the best cover found; its status is TIMEOUT when the
+             time or evaluation limit cut the evolution short. Its details count the
+             generations, the fitness evaluations (in the unit of evaluation_limit) and
+             the fitness cache hits and misses; only the misses were computed.
+    """
+    if topology not in ('ring', 'random'):
+        raise ValueError(f"Unknown migration topology: {topology}")
+    control = (control or SolveControl()).with_time_limit(time_limit)
+
+    cover = as_cover_matrix(matrix)
+    if not cover.num_rows or not cover.num_cols:
+        return SolverResult([], OPTIMAL, 0)
+
+    limited = False
+    if evaluation_limit is not None:
+        # Every generation scores one population per island
+        allowed = evaluation_limit // (population_size * max(1, islands))
+        limited = allowed < generations
+        generations = min(generations, allowed)
+
+    seeds = None
+    if initial is not None:
+        seeds = np.zeros((1, cover.num_rows), dtype=bool)
+        seeds[0, repair_cover(cover, initial)] = True
 
-    if best_solution is not None:
-        best_solution_indices = [i for i, selected in enumerate(best_solution) if selected]
+    if islands > 1:
+        settings = {
+            'population_size': population_size,
+            'generations': generations,
+            'mutation_rate': mutation_rate,
+            'migration_interval': migration_interval,
+            'topology': topology,
+            'seeds': seeds,
+            'fitness_cache_size': fitness_cache_size,
+        }
+        best_solution_indices, evolved, hits, misses = _island_model(cover, islands, seed, settings, control)
     else:
-        best_solution_indices = None
+        rng = np.random.default_rng(seed)
+        fitness_cache = LRUCache(fitness_cache_size) if fitness_cache_size else None
+        incidence = (cover.col_ptr, cover.col_idx, cover.num_rows)
+        best_solution, _, evolved = _evolve(rng, incidence, population_size, generations, mutation_rate,
+                                            control=control, seeds=seeds, fitness_cache=fitness_cache)
+        best_solution_indices = np.flatnonzero(best_solution).tolist()
+        hits, misses = (fitness_cache.hits, fitness_cache.misses) if fitness_cache is not None else (0, 0)
 
-    return best_solution_indices
+    # Fill any gap left in the best individual and drop its redundant rows
+    rows = repair_cover(cover, best_solution_indices)
+    if control.cancelled:
+        status = FEASIBLE
+    elif control.timed_out or limited:
+        status = TIMEOUT
+    else:
+        status = FEASIBLE
+    evaluations = evolved * population_size  # One population per generation (per island)
+    return SolverResult(rows, status, generations=evolved, evaluations=evaluations,
+                        fitness_cache_hits=hits, fitness_cache_misses=misses)
 
 
+def _read_cbc_bound(log_path):
+    """
+    Read the best bound CBC reports in the summary at the end of its log.
 
+    :param log_path: Path of the CBC log file.
+    :return: The lower bound as a float, or None if the log has none.
+    """
+    try:
+        with open(log_path) as log_file:
+            for line in log_file:
+                if line.startswith('Lower bound:'):
+                    return float(line.split(':', 1)[1])
+    except (OSError, ValueError):
+        pass
+    return None
 
 
-def linear_programming(matrix):
-    num_rows = len(matrix)
-    num_cols = len(matrix[0])
+def _cover_problem(cover, category):
+    """
+    Build the covering program of a CoverMatrix, with constraints assembled straight
+    from its column incidence.
 
+    :param cover: A CoverMatrix.
+    :param category: 'Binary' for the exact program, 'Continuous' for the relaxation
+                     (row variables in [0, 1]).
+    :return: Tuple of (pulp.LpProblem, list of row variables).
+    """
     # Create a Linear Program
     lp_problem = pulp.LpProblem("Minimize_Row_Coverage", pulp.LpMinimize)
 
     # Create decision variables
-    row_vars = [pulp.LpVariable(f"row_{i}", cat='Binary') for i in range(num_rows)]
+    row_vars = [pulp.LpVariable(f"row_{i}", lowBound=0, upBound=1, cat=category) for i in range(cover.num_rows)]
 
     # Objective function: Minimize the number of rows used
-    lp_problem += pulp.lpSum(row_vars)
+    lp_problem.setObjective(pulp.LpAffineExpression([(row_var, 1) for row_var in row_vars]))
 
     # Constraints: Each column j must be covered by at least one row
-    for j in range(num_cols):
-        lp_problem += pulp.lpSum(row_vars[i] for i in range(num_rows) if matrix[i][j] == 1) >= 1
+    col_ptr = cover.col_ptr.tolist()
+    col_idx = cover.col_idx.tolist()
+    for j in range(cover.num_cols):
+        covering = pulp.LpAffineExpression([(row_vars[i], 1) for i in col_idx[col_ptr[j]:col_ptr[j + 1]]])
+        lp_problem.addConstraint(pulp.LpConstraint(covering, pulp.LpConstraintGE, f"col_{j}", 1))
+    return lp_problem, row_vars
+
+
+# How often a CBC run is checked for cancellation, in seconds.
+CBC_POLL_INTERVAL = 0.1
+
+
+def _cbc_worker(lp_problem, solver, connection):
+    """
+    Solve a program with CBC and send the solution back; runs in its own process.
+    """
+    start_process_group()
+    try:
+        lp_problem.solve(solver)
+        values = {variable.name: variable.varValue for variable in lp_problem.variables()}
+        duals = {name: constraint.pi for name, constraint in lp_problem.constraints.items()}
+        connection.send((lp_problem.status, lp_problem.sol_status, values, duals, None))
+    except Exception as e:
+        connection.send((None, None, None, None, str(e)))
+    connection.close()
+
+
+def _solve_program(lp_problem, solver, control=None):
+    """
+    Solve a program with CBC, which runs as one external call that never polls a
+    control. With a control, CBC is run from a worker process that is killed as soon as
+    the control is cancelled; the solution is copied back into lp_problem.
+
+    :param lp_problem: A pulp.LpProblem.
+    :param solver: The pulp CBC solver to use.
+    :param control: Optional SolveControl whose cancellation stops CBC.
+    :return: True if CBC finished (or stopped at its own limits), False if cancelled.
+    """
+    if control is None:
+        lp_problem.solve(solver)
+        return True
+
+    context = multiprocessing.get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_cbc_worker, args=(lp_problem, solver, sender))
+    process.start()
+    sender.close()
+    try:
+        while not receiver.poll(CBC_POLL_INTERVAL):
+            if control.cancelled:
+                kill_process_group(process)
+                return False
+            if not process.is_alive() and not receiver.poll():
+                raise RuntimeError("CBC worker exited without a result")
+        status, sol_status, values, duals, error = receiver.recv()
+    finally:
+        receiver.close()
+    process.join()
+    if error is not None:
+        raise pulp.PulpSolverError(error)
+    lp_problem.assignVarsVals(values)
+    lp_problem.assignConsPi(duals)
+    lp_problem.assignStatus(status, sol_status)
+    return True
+
+
+def linear_programming(matrix, time_limit=None, gap=None, threads=None, warm_start=True, msg=False, control=None,
+                       initial=None, node_limit=None):
+    """
+    Solve the minimum row coverage problem exactly as a binary program with CBC.
+
+    Constraints are assembled straight from the column incidence of the CoverMatrix.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param time_limit: Optional time limit for CBC, in seconds.
+    :param gap: Optional relative optimality gap at which CBC may stop.
+    :param threads: Optional number of CBC threads.
+    :param warm_start: Whether to give CBC the greedy cover (or the repaired initial
+                       cover, when smaller) as its first incumbent.
+    :param msg: Whether to let CBC print its log.
+    :param control: Optional SolveControl; CBC runs as one external call, so it only
+                    reports the greedy incumbent and the final result. CBC then runs
+                    from a worker process, killed on cancellation; the warm-start
+                    cover is returned.
+    :param initial: Optional row indices of a previous (possibly partial) cover.
+    :param node_limit: Optional maximum number of CBC branch-and-bound nodes.
+    :return: A SolverResult with the cover, status, lower bound and gap.
+    """
+    cancellable = control is not None
+    control = (control or SolveControl()).with_time_limit(time_limit)
+    cover = as_cover_matrix(matrix)
+
+    build_start = time.perf_counter()
+    lp_problem, row_vars = _cover_problem(cover, 'Binary')
+
+    # Seed CBC with the (complete) greedy cover, or the warm-start cover if smaller
+    incumbent = remove_redundant_rows(cover, greedy_algorithm(cover).rows)
+    if initial is not None:
+        incumbent = min(repair_cover(cover, initial), incumbent, key=len)
+    control.report(incumbent=len(incumbent))
+    if warm_start:
+        chosen = set(incumbent)
+        for i, row_var in enumerate(row_vars):
+            row_var.setInitialValue(1 if i in chosen else 0)
+    build_time = time.perf_counter() - build_start
+
+    if control.should_stop():
+        # No time left for CBC: return the warm-start cover
+        status = FEASIBLE if control.cancelled else TIMEOUT
+        return SolverResult(incumbent, status, solver_status='Not Solved', build_time=build_time, solve_time=0.0)
 
     # Solve the problem
-    lp_problem.solve()
+    log_file = tempfile.NamedTemporaryFile(suffix='.log', delete=False)
+    log_file.close()
+    try:
+        solver = pulp.PULP_CBC_CMD(msg=msg, timeLimit=control.remaining(), gapRel=gap, threads=threads,
+                                   warmStart=warm_start, logPath=log_file.name, maxNodes=node_limit)
+        solve_start = time.perf_counter()
+        solved = _solve_program(lp_problem, solver, control if cancellable else None)
+        solve_time = time.perf_counter() - solve_start
+        best_bound = _read_cbc_bound(log_file.name) if solved else None
+    finally:
+        os.remove(log_file.name)
+
+    if not solved:
+        # Cancelled while CBC was running; CBC's own covers are lost with its process
+        return SolverResult(incumbent, FEASIBLE, solver_status='Cancelled', build_time=build_time,
+                            solve_time=solve_time)
+
+    # Extract the rows selected in the best solution found
+    selected_rows = [i for i, row_var in enumerate(row_vars)
+                     if row_var.value() is not None and row_var.value() > 0.5]
+
+    if lp_problem.sol_status == pulp.LpSolutionOptimal:
+        # With a gap tolerance CBC may call a solution optimal before closing the gap
+        proven = best_bound is None or math.ceil(best_bound - 1e-6) >= len(selected_rows)
+        status = OPTIMAL if proven else FEASIBLE
+    elif (lp_problem.sol_status == pulp.LpSolutionIntegerFeasible or control.deadline is not None
+          or node_limit is not None):
+        status = TIMEOUT
+    else:
+        status = FEASIBLE
+
+    if not cover.covers(selected_rows) or len(selected_rows) > len(incumbent):
+        # CBC stopped without a better cover than the warm-start one
+        selected_rows = incumbent
+        if status == OPTIMAL:
+            status = FEASIBLE
+
+    if status == OPTIMAL:
+        lower_bound = len(selected_rows)
+    elif best_bound is not None:
+        lower_bound = math.ceil(best_bound - 1e-6)
+    else:
+        lower_bound = None
+
+    control.report(incumbent=len(selected_rows), lower_bound=lower_bound)
+    return SolverResult(selected_rows, status, lower_bound,
+                        solver_status=pulp.LpStatus[lp_problem.status], build_time=build_time,
+                        solve_time=solve_time)
+
+
+class _SparseLayout:
+    """
+    Coordinates of the ones of a CoverMatrix, for sparse products with row and column
+    vectors, plus the columns of every row (compressed sparse rows).
+    """
+
+    def __init__(self, cover):
+        self.cover = cover
+        self.nz_rows = cover.col_idx.astype(np.int64)
+        self.nz_cols = np.repeat(np.arange(cover.num_cols), cover.column_counts())
+        self.row_ptr = cover.row_ptr
+        self.row_idx = cover.row_idx
+        self.row_sizes = np.diff(self.row_ptr)
+
+    def coverage(self, picked):
+        """
+        Number of picked rows covering each column.
+
+        :param picked: Boolean array of selected rows.
+        """
+        return np.bincount(self.nz_cols, weights=picked[self.nz_rows], minlength=self.cover.num_cols)
+
+    def repair(self, picked, coverage=None):
+        """
+        Complete a selection of rows into a cover greedily, keeping the number of
+        uncovered columns of every row up to date, then drop redundant rows using the
+        per-column coverage counts, smallest rows first.
+
+        :param picked: Boolean array of selected rows.
+        :param coverage: Optional coverage(picked), when already computed.
+        :return: List of row indices of the cover.
+        """
+        cover, row_idx, row_ptr = self.cover, self.row_idx, self.row_ptr
+        counts = self.coverage(picked) if coverage is None else coverage.copy()
+        rows = np.flatnonzero(picked).tolist()
+        gains = np.bincount(self.nz_rows, weights=counts[self.nz_cols] == 0, minlength=cover.num_rows)
+        while gains.max() > 0:
+            row = int(np.argmax(gains))
+            rows.append(row)
+            columns = row_idx[row_ptr[row]:row_ptr[row + 1]]
+            newly_covered = columns[counts[columns] == 0]
+            counts[columns] += 1
+            for col in newly_covered.tolist():
+                gains[cover.col_idx[cover.col_ptr[col]:cover.col_ptr[col + 1]]] -= 1
+        kept = []
+        for row in sorted(rows, key=lambda r: self.row_sizes[r]):
+            columns = row_idx[row_ptr[row]:row_ptr[row + 1]]
+            if counts[columns].min() >= 2:
+                counts[columns] -= 1
+            else:
+                kept.append(row)
+        return kept
+
+
+def lagrangian_relaxation(matrix, max_iterations=1000, time_limit=None, control=None, initial=None, repair=True):
+    """
+    Solve the minimum row coverage problem with a Lagrangian heuristic (Beasley).
+
+    The cover constraints are relaxed with non-negative column multipliers u: every
+    row gets the reduced cost 1 - sum of u over its columns, and selecting the rows of
+    negative reduced cost gives the lower bound sum(u) + sum of those reduced costs.
+    Subgradient steps move u towards covering every column exactly once; the step is
+    halved after 30 iterations without a better bound. Every iteration the selected
+    rows are completed into a cover by the greedy and stripped of redundant rows,
+    which may improve the incumbent, and rows whose reduced cost lifts the bound to the
+    incumbent size are fixed out, since no smaller cover can contain them.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param max_iterations: The maximum number of subgradient iterations.
+    :param time_limit: Optional wall-clock budget in seconds.
+    :param control: Optional SolveControl for progress reports and cancellation.
+    :param initial: Optional row indices of a previous (possibly partial) cover.
+    :param repair: Whether to build a cover every iteration; without it only the
+                   lower bound is improved and the cover is the greedy one.
+    :return: A SolverResult with the best cover and the Lagrangian lower bound; the
+             status is OPTIMAL when the two meet.
+    """
+    control = (control or SolveControl()).with_time_limit(time_limit)
+    cover = as_cover_matrix(matrix)
+    if not cover.num_rows or not cover.num_cols:
+        return SolverResult([], OPTIMAL, 0)
+
+    uncoverable = cover.uncoverable_columns()
+    if uncoverable:
+        raise ValueError(f"Columns {uncoverable} cannot be covered by any row")
+
+    num_rows, num_cols = cover.num_rows, cover.num_cols
+    layout = _SparseLayout(cover)
+    nz_rows, nz_cols, row_sizes = layout.nz_rows, layout.nz_cols, layout.row_sizes
+
+    # The seed is a complete greedy pass, whatever time is left
+    best_rows = remove_redundant_rows(cover, greedy_algorithm(cover).rows)
+    if initial is not None:
+        best_rows = min(repair_cover(cover, initial), best_rows, key=len)
+    control.report(incumbent=len(best_rows))
+    control.offer_incumbent(len(best_rows))
+
+    # Start each column at the smallest share of a row covering it
+    u = np.minimum.reduceat(1.0 / row_sizes[nz_rows], cover.col_ptr[:-1])
+    available = np.ones(num_rows, dtype=bool)
+    best_bound = 0.0
+    step_scale = 2.0
+    stale = 0
+    stopped = False
+    iteration = 0
+
+    while iteration < max_iterations and step_scale >= 0.005:
+        if control.should_stop():
+            stopped = True
+            break
+        iteration += 1
+
+        reduced_costs = 1.0 - np.bincount(nz_rows, weights=u[nz_cols], minlength=num_rows)
+        picked = available & (reduced_costs < 0)
+        value = u.sum() + reduced_costs[picked].sum()
+        if value > best_bound + 1e-9:
+            best_bound = value
+            stale = 0
+        else:
+            stale += 1
+            if stale >= 30:
+                step_scale /= 2
+                stale = 0
+
+        coverage = layout.coverage(picked)
+        if repair:
+            kept = layout.repair(picked, coverage)
+            if len(kept) < len(best_rows):
+                best_rows = kept
+                control.offer_incumbent(len(best_rows))
+        if iteration % 10 == 0:
+            control.report(incumbent=len(best_rows), lower_bound=math.ceil(best_bound - 1e-6), iteration=iteration)
+        upper = len(best_rows)
+        if math.ceil(best_bound - 1e-6) >= upper:
+            break
+
+        # Reduced-cost fixing: these rows would lift the bound to the incumbent size
+        available &= ~((reduced_costs > 0) & (value + reduced_costs > upper - 1 + 1e-6))
+        if np.any(np.bincount(nz_cols, weights=available[nz_rows], minlength=num_cols) == 0):
+            # A column lost every row that could be in a smaller cover: none exists
+            best_bound = upper
+            break
+
+        # Subgradient step towards covering every column exactly once
+        subgradient = 1.0 - coverage
+        subgradient[(u <= 0) & (subgradient < 0)] = 0.0
+        norm = subgradient @ subgradient
+        if norm == 0:
+            break  # The Lagrangian rows already form a cover as large as the bound
+        u = np.maximum(0.0, u + step_scale * (1.05 * upper - value) / norm * subgradient)
+
+    lower_bound = min(len(best_rows), math.ceil(best_bound - 1e-6))
+    if lower_bound >= len(best_rows):
+        status = OPTIMAL
+    elif stopped and not control.cancelled:
+        status = TIMEOUT
+    else:
+        status = FEASIBLE
+    control.report(incumbent=len(best_rows), lower_bound=lower_bound)
+    return SolverResult(sorted(best_rows), status, lower_bound, iterations=iteration,
+                        fixed_rows=int(num_rows - np.count_nonzero(available)))
+
+
+# Number of sample-by-nonzero cells lp_rounding counts coverage for at once.
+ROUNDING_CHUNK_CELLS = 1 << 24
+
+
+def lp_rounding(matrix, samples=64, rounds=8, seed=None, time_limit=None, control=None, initial=None,
+                msg=False):
+    """
+    Solve the minimum row coverage problem with randomized rounding of its LP relaxation.
+
+    CBC solves the relaxation with row variables in [0, 1]. Each round then draws
+    samples selections at once, picking every row with probability scale * x for its
+    fractional value x and scales spread geometrically from 0.05 to 1: the repair
+    completes sparse selections much better than it prunes dense ones. Every selection
+    is completed greedily and stripped of redundant rows, and the smallest cover is
+    kept. The column duals, scaled down until no row exceeds a total of 1, are a
+    feasible dual solution, so their sum rounded up is a lower bound on any cover, even
+    when CBC stops early.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param samples: Number of selections drawn per round.
+    :param rounds: Maximum number of rounds.
+    :param seed: Optional seed for the random number generator.
+    :param time_limit: Optional wall-clock budget in seconds, shared by CBC and the rounding.
+    :param control: Optional SolveControl for progress reports and cancellation; CBC
+                    then runs from a worker process, killed on cancellation.
+    :param initial: Optional row indices of a previous (possibly partial) cover.
+    :param msg: Whether to let CBC print its log.
+    :return: A SolverResult with the best cover and the LP lower bound; the status is
+             OPTIMAL when the two meet.
+    """
+    cancellable = control is not None
+    control = (control or SolveControl()).with_time_limit(time_limit)
+    cover = as_cover_matrix(matrix)
+    if not cover.num_rows or not cover.num_cols:
+        return SolverResult([], OPTIMAL, 0)
+
+    uncoverable = cover.uncoverable_columns()
+    if uncoverable:
+        raise ValueError(f"Columns {uncoverable} cannot be covered by any row")
+
+    layout = _SparseLayout(cover)
+    best_rows = remove_redundant_rows(cover, greedy_algorithm(cover).rows)
+    if initial is not None:
+        best_rows = min(repair_cover(cover, initial), best_rows, key=len)
+    control.report(incumbent=len(best_rows))
+    control.offer_incumbent(len(best_rows))
+
+    build_start = time.perf_counter()
+    lp_problem, row_vars = _cover_problem(cover, 'Continuous')
+    build_time = time.perf_counter() - build_start
+
+    if control.should_stop():
+        status = FEASIBLE if control.cancelled else TIMEOUT
+        return SolverResult(best_rows, status, solver_status='Not Solved', build_time=build_time,
+                            solve_time=0.0, lp_value=None, samples=0)
+
+    solver = pulp.PULP_CBC_CMD(msg=msg, timeLimit=control.remaining())
+    solve_start = time.perf_counter()
+    solved = _solve_program(lp_problem, solver, control if cancellable else None)
+    solve_time = time.perf_counter() - solve_start
+    if not solved:
+        return SolverResult(best_rows, FEASIBLE, solver_status='Cancelled', build_time=build_time,
+                            solve_time=solve_time, lp_value=None, samples=0)
+
+    x = np.array([row_var.value() or 0.0 for row_var in row_vars])
+    # CBC may report a relaxation it stopped at its time limit as optimal
+    solved = lp_problem.status == pulp.LpStatusOptimal and not control.timed_out
+    lp_value = float(x.sum()) if solved else None
+    duals = np.array([constraint.pi or 0.0 for constraint in lp_problem.constraints.values()])
+    duals = np.maximum(duals, 0.0)
+    if duals.any():
+        # Weak duality: any duals whose row totals stay within 1 bound every cover
+        load = np.bincount(layout.nz_rows, weights=duals[layout.nz_cols], minlength=cover.num_rows).max()
+        lower_bound = min(len(best_rows), math.ceil(duals.sum() / max(1.0, load) - 1e-6))
+    else:
+        lower_bound = None
+    control.report(incumbent=len(best_rows), lower_bound=lower_bound)
+
+    rng = np.random.default_rng(seed)
+    scales = np.geomspace(0.05, 1.0, samples)[:, None]
+    support = np.flatnonzero(x > 1e-9)
+    probabilities = np.minimum(1.0, scales * x[support])
+    chunk = max(1, ROUNDING_CHUNK_CELLS // max(1, len(layout.nz_rows)))
+    drawn = 0
+    stopped = False
+    for round_index in range(rounds):
+        if lower_bound is not None and lower_bound >= len(best_rows):
+            break
+        if control.should_stop():
+            stopped = True
+            break
+        picked = np.zeros((samples, cover.num_rows), dtype=bool)
+        picked[:, support] = rng.random(probabilities.shape) < probabilities
+        for start in range(0, samples, chunk):
+            # Coverage counts of a block of selections, one column segment at a time
+            block = picked[start:start + chunk]
+            counts = np.add.reduceat(block[:, layout.nz_rows], cover.col_ptr[:-1], axis=1, dtype=np.int64)
+            for selection, coverage in zip(block, counts):
+                kept = layout.repair(selection, coverage)
+                drawn += 1
+                if len(kept) < len(best_rows):
+                    best_rows = kept
+                    control.offer_incumbent(len(best_rows))
+                if control.should_stop():
+                    stopped = True
+                    break
+            if stopped:
+                break
+        control.report(incumbent=len(best_rows), lower_bound=lower_bound, iteration=round_index + 1)
+        if stopped:
+            break
+
+    if lower_bound is not None and lower_bound >= len(best_rows):
+        status = OPTIMAL
+    elif (stopped or lp_value is None) and not control.cancelled:
+        # Out of time, during the rounding or before CBC could finish the relaxation
+        status = TIMEOUT
+    else:
+        status = FEASIBLE
+    control.report(incumbent=len(best_rows), lower_bound=lower_bound)
+    return SolverResult(sorted(best_rows), status, lower_bound, solver_status=pulp.LpStatus[lp_problem.status],
+                        build_time=build_time, solve_time=solve_time, lp_value=lp_value, samples=drawn)
+
+
+# Widest matrix dynamic_programming accepts: its tables have 2^num_cols entries.
+DP_MAX_COLUMNS = 24
+
+# Number of (state, row) pairs dynamic_programming expands at once.
+DP_CHUNK_SIZE = 1 << 20
+
+
+def _undominated_masks(masks, num_cols):
+    """
+    Distinct row masks that are not a strict subset of another row mask.
+
+    :param masks: NumPy array of row bitmasks.
+    :param num_cols: The number of columns.
+    :return: Tuple of (NumPy array of the kept masks, index of a row with each mask).
+    """
+    unique, first = np.unique(masks, return_index=True)
+    # contained[s]: s is a subset of some mask; closed over supersets one column at a time
+    contained = np.zeros(1 << num_cols, dtype=bool)
+    contained[unique] = True
+    for col in range(num_cols):
+        halves = contained.reshape(-1, 2, 1 << col)
+        halves[:, 0, :] |= halves[:, 1, :]
+    dominated = np.zeros(len(unique), dtype=bool)
+    for col in range(num_cols):
+        missing = (unique >> col) & 1 == 0
+        dominated[missing] |= contained[unique[missing] | (1 << col)]
+    return unique[~dominated], first[~dominated]
+
+
+def dynamic_programming(matrix, control=None, initial=None, time_limit=None):
+    """
+    Solve the minimum row coverage problem exactly by a breadth-first search over the
+    sets of covered columns, for matrices with at most DP_MAX_COLUMNS columns.
+
+    Every row is reduced to its column bitmask, and duplicate masks and masks contained
+    in another one are dropped: a smallest cover never needs them. Level k of the search
+    holds the column sets first reached with k rows. A set is only extended by the masks
+    covering its lowest uncovered column, since every completion must cover it, so the
+    first level reaching all columns gives an optimal cover, in O(2^cols * masks) time
+    and O(2^cols) memory, however many rows the matrix has.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param control: Optional SolveControl for progress reports and cancellation.
+    :param initial: Optional row indices of a previous (possibly partial) cover, used
+                    only as the fallback cover when the search is stopped.
+    :param time_limit: Optional wall-clock budget in seconds.
+    :return: A SolverResult, OPTIMAL; when stopped early, the greedy cover with the
+             number of levels searched as its lower bound.
+    """
+    control = (control or SolveControl()).with_time_limit(time_limit)
+    cover = as_cover_matrix(matrix)
+    num_cols = cover.num_cols
+    if num_cols > DP_MAX_COLUMNS:
+        raise ValueError(f"Dynamic programming handles at most {DP_MAX_COLUMNS} columns, not {num_cols}")
+    if not num_cols:
+        return SolverResult([], OPTIMAL, 0)
 
-    # Extract the rows selected in the optimal solution
-    selected_rows = [i for i, row_var in enumerate(row_vars) if row_var.value() == 1]
-    return selected_rows
+    uncoverable = cover.uncoverable_columns()
+    if uncoverable:
+        raise ValueError(f"Columns {uncoverable} cannot be covered by any row")
 
+    masks, mask_rows = _undominated_masks(np.array(cover.row_bits, dtype=np.int64), num_cols)
+    # Indices of the masks covering each column
+    column_masks = [np.flatnonzero((masks >> col) & 1) for col in range(num_cols)]
 
+    # parent[s]: the set s was first reached from, -1 while unreached; via[s]: the mask added
+    parent = np.full(1 << num_cols, -1, dtype=np.int32)
+    via = np.zeros(1 << num_cols, dtype=np.min_scalar_type(len(masks)))
+    parent[0] = 0
+    full = cover.full_mask
+    frontier = np.zeros(1, dtype=np.int64)
+    level = 0
+    states = 1
 
+    while parent[full] < 0:
+        level += 1
+        # Lowest uncovered column of every set (exact in floating point below 2^53)
+        lowest = np.log2(~frontier & (frontier + 1)).astype(np.int64)
+        reached_parts = []
+        for col in np.unique(lowest).tolist():
+            sources = frontier[lowest == col]
+            candidates = column_masks[col]
+            chunk = max(1, DP_CHUNK_SIZE // len(candidates))
+            for start in range(0, len(sources), chunk):
+                if control.should_stop():
+                    rows = greedy_algorithm(cover, initial=initial).rows
+                    status = FEASIBLE if control.cancelled else TIMEOUT
+                    # No smaller level reached every column
+                    return SolverResult(rows, status, min(level, len(rows)), states=states)
+                block = sources[start:start + chunk]
+                reached = (block[:, None] | masks[candidates][None, :]).ravel()
+                fresh = np.flatnonzero(parent[reached] < 0)
+                reached, first = np.unique(reached[fresh], return_index=True)
+                pairs = fresh[first]
+                parent[reached] = block[pairs // len(candidates)]
+                via[reached] = candidates[pairs % len(candidates)]
+                reached_parts.append(reached)
+                if parent[full] >= 0:
+                    break  # Every column is covered: the level is optimal
+            if parent[full] >= 0:
+                break
+        frontier = np.concatenate(reached_parts)
+        states += len(frontier)
+        control.report(lower_bound=level, states=states)
 
+    rows = []
+    state = full
+    while state:
+        rows.append(int(mask_rows[via[state]]))
+        state = int(parent[state])
+    control.offer_incumbent(len(rows))
+    return SolverResult(sorted(rows), OPTIMAL, len(rows), states=states, masks=len(masks))
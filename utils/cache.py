@@ -0,0 +1,228 @@
+# utils/cache.py
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+
+# Default limit on the size of the on-disk cache file contents, in bytes.
+DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def matrix_digest(matrix):
+    """
+    Content hash of a CoverMatrix: its shape and the packed bits of every row.
+
+    Two matrices get the same digest exactly when they have the same cells, however
+    they were built (dense input, loaded file, presolve...).
+
+    :param matrix: A CoverMatrix.
+    :return: Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256(f"{matrix.num_rows}x{matrix.num_cols}".encode())
+    num_bytes = (matrix.num_cols + 7) // 8
+    for bits in matrix.row_bits:
+        digest.update(bits.to_bytes(num_bytes, 'little'))
+    return digest.hexdigest()
+
+
+def result_key(digest, algorithm, params=None):
+    """
+    Cache key of a solver run.
+
+    :param digest: The matrix_digest of the instance.
+    :param algorithm: The algorithm name.
+    :param params: Optional dictionary of parameters that change the result.
+    :return: Hexadecimal SHA-256 digest.
+    """
+    canonical = json.dumps([digest, algorithm, params or {}], sort_keys=True, default=repr)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class LRUCache:
+    """
+    In-memory mapping that evicts the least recently used entry once it is full.
+    """
+
+    def __init__(self, max_entries=128):
+        """
+        :param max_entries: Maximum number of entries kept.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Look up a key, marking it as the most recently used.
+
+        :return: The stored value, or default when the key is absent.
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used entries beyond max_entries.
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    @property
+    def hit_ratio(self):
+        """
+        Fraction of lookups that found their key, or 0.0 before any lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DiskCache:
+    """
+    Persistent key-value store in an sqlite file, bounded by the size of its values.
+
+    Values are pickled. When the stored values exceed max_bytes, the least recently
+    used entries are deleted. Several processes may share the file.
+    """
+
+    def __init__(self, path, max_bytes=DISK_CACHE_MAX_BYTES):
+        """
+        :param path: Path of the sqlite file; created when missing.
+        :param max_bytes: Maximum total size of the stored values.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS entries ("
+                               "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                               "size INTEGER NOT NULL, last_used REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+
+    def _connect(self):
+        # Wait for other processes' writes instead of failing on a locked database
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key, default=None):
+        """
+        Look up a key, marking it as the most recently used.
+
+        :return: The stored value, or default when the key is absent.
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return default
+            connection.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        """
+        Store a value, then evict the least recently used entries beyond max_bytes.
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return  # Would evict everything else and still not fit
+        with self._connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                               (key, data, len(data), time.time()))
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                for old_key, size in connection.execute(
+                        "SELECT key, size FROM entries ORDER BY last_used").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    connection.execute("DELETE FROM entries WHERE key = ?", (old_key,))
+                    total -= size
+
+    def __len__(self):
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM entries")
+
+
+class ResultCache:
+    """
+    Two-tier cache of solver results: an LRUCache in memory in front of an optional
+    DiskCache that survives restarts.
+    """
+
+    def __init__(self, max_entries=128, path=None, max_bytes=DISK_CACHE_MAX_BYTES):
+        """
+        :param max_entries: Number of results kept in memory.
+        :param path: Optional sqlite file for the on-disk tier.
+        :param max_bytes: Size cap of the on-disk tier.
+        """
+        self.memory = LRUCache(max_entries)
+        self.disk = DiskCache(path, max_bytes) if path else None
+        self.disk_hits = 0
+
+    def get(self, key):
+        """
+        Look up a result in memory, then on disk; disk hits are kept in memory too.
+
+        :return: The cached value, or None on a miss.
+        """
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.put(key, value)
+        return value
+
+    def put(self, key, value):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    @property
+    def hits(self):
+        return self.memory.hits + self.disk_hits
+
+    @property
+    def lookups(self):
+        return self.memory.hits + self.memory.misses
+
+    @property
+    def hit_ratio(self):
+        """
+        Fraction of lookups answered by either tier, or 0.0 before any lookup.
+        """
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def stats(self):
+        """
+        Counters of the cache, for reporting.
+
+        :return: Dictionary with lookups, hits, memory_hits, disk_hits and hit_ratio.
+        """
+        return {
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'memory_hits': self.memory.hits,
+            'disk_hits': self.disk_hits,
+            'hit_ratio': self.hit_ratio,
+        }
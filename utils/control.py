@@ -0,0 +1,131 @@
+# utils/control.py
+import copy
+import threading
+import time
+
+
+class SolveControl:
+    """
+    Channel between a running solver and the code that started it.
+
+    The solver publishes its progress with report() and polls should_stop(); the caller
+    reads snapshot() from another thread and may cancel() the run. Solvers stop at the
+    next check and return the best cover they have found so far.
+
+    Solvers running side by side (see utils.portfolio) can also share the size of the
+    best cover any of them has found through offer_incumbent() and best_known().
+
+    A control may also carry a deadline, after which should_stop() returns True and
+    the solver returns its best cover with the TIMEOUT status.
+    """
+
+    def __init__(self, stop_event=None, incumbent=None, time_limit=None):
+        """
+        :param stop_event: Optional event used for cancellation; pass a
+                           multiprocessing Event to cancel solvers in other processes.
+        :param incumbent: Optional multiprocessing Value('i') holding the smallest cover
+                          size found by any solver sharing it.
+        :param time_limit: Optional number of seconds, from now, the solver may run.
+        """
+        self._stop_event = stop_event if stop_event is not None else threading.Event()
+        self._incumbent = incumbent
+        self._lock = threading.Lock()
+        self._progress = {}
+        self.start_time = time.perf_counter()
+        self.deadline = self.start_time + time_limit if time_limit is not None else None
+
+    def with_time_limit(self, time_limit):
+        """
+        Control that also stops time_limit seconds from now (or at this control's own
+        deadline, if earlier). Progress, cancellation and the shared incumbent are
+        shared with this control.
+
+        :param time_limit: Number of seconds, or None for no additional limit.
+        :return: A SolveControl; this one when time_limit is None.
+        """
+        if time_limit is None:
+            return self
+        limited = copy.copy(self)
+        deadline = time.perf_counter() + time_limit
+        limited.deadline = deadline if self.deadline is None else min(self.deadline, deadline)
+        return limited
+
+    def remaining(self):
+        """
+        Seconds left before the deadline.
+
+        :return: A non-negative number of seconds, or None without a deadline.
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.perf_counter())
+
+    @property
+    def timed_out(self):
+        """
+        Whether the deadline has passed.
+        """
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def cancel(self):
+        """
+        Ask the solver to stop as soon as possible.
+        """
+        self._stop_event.set()
+
+    @property
+    def cancelled(self):
+        """
+        Whether cancel() has been called.
+        """
+        return self._stop_event.is_set()
+
+    def should_stop(self):
+        """
+        Checked by solvers between units of work (nodes, generations...).
+
+        :return: True if the solver should return its best cover now, because it was
+                 cancelled or its deadline has passed.
+        """
+        return self._stop_event.is_set() or self.timed_out
+
+    def offer_incumbent(self, size):
+        """
+        Publish the size of a cover this solver has found to the solvers sharing the
+        incumbent; only an improvement replaces the shared value.
+
+        :param size: Number of rows of a valid cover.
+        """
+        if self._incumbent is None:
+            return
+        with self._incumbent.get_lock():
+            if size < self._incumbent.value:
+                self._incumbent.value = size
+
+    def best_known(self):
+        """
+        Size of the best cover found by any solver sharing the incumbent.
+
+        :return: The shared cover size, or None when the incumbent is not shared.
+        """
+        if self._incumbent is None:
+            return None
+        return self._incumbent.value
+
+    def report(self, **progress):
+        """
+        Publish progress values such as incumbent, nodes or generation.
+        """
+        with self._lock:
+            self._progress.update(progress)
+
+    def snapshot(self):
+        """
+        Copy of the latest progress values, plus the elapsed time in seconds.
+
+        :return: Dictionary of progress values.
+        """
+        with self._lock:
+            progress = dict(self._progress)
+        progress['elapsed'] = time.perf_counter() - self.start_time
+        return progress
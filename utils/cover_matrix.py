@@ -0,0 +1,372 @@
+# utils/cover_matrix.py
+import numpy as np
+
+# Number of rows converted to NumPy at a time while building a CoverMatrix, so large
+# instances never need a full dense copy in memory.
+CHUNK_ROWS = 4096
+
+
+def iter_bits(mask):
+    """
+    Yield the indices of the set bits of an integer bitset, lowest first.
+
+    :param mask: A non-negative integer used as a bitset.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _pack_block(block):
+    """
+    Pack a 2D 0/1 NumPy block into one integer bitset per row.
+
+    :param block: 2D array whose non-zero cells mark covered columns.
+    :return: List of integers, bit j of entry i set when block[i][j] is non-zero.
+    """
+    packed = np.packbits(block != 0, axis=1, bitorder='little')
+    return [int.from_bytes(row.tobytes(), 'little') for row in packed]
+
+
+def _unpack_block(row_bits, num_cols):
+    """
+    Expand integer bitsets back into a 2D boolean NumPy block.
+
+    :param row_bits: List of integer bitsets.
+    :param num_cols: The number of columns of the block.
+    :return: Boolean array of shape (len(row_bits), num_cols).
+    """
+    num_bytes = (num_cols + 7) // 8
+    raw = b''.join(bits.to_bytes(num_bytes, 'little') for bits in row_bits)
+    packed = np.frombuffer(raw, dtype=np.uint8).reshape(len(row_bits), num_bytes)
+    return np.unpackbits(packed, axis=1, count=num_cols, bitorder='little').astype(bool)
+
+
+class CoverMatrix:
+    """
+    Compact representation of a 0/1 coverage matrix shared by all solvers.
+
+    Each row is stored as a packed bitset (a Python int whose bit j is set when the row
+    covers column j), so checking coverage is a handful of word-wide ORs. The column to
+    rows incidence is kept in compressed sparse column form: the rows covering column j
+    are col_idx[col_ptr[j]:col_ptr[j + 1]]. Its transpose (row_ptr, row_idx) is built
+    on first use.
+    """
+
+    def __init__(self, row_bits, num_cols, col_ptr=None, col_idx=None):
+        """
+        :param row_bits: List of integer bitsets, one per row.
+        :param num_cols: The total number of columns in the matrix.
+        :param col_ptr: Optional precomputed column pointer array.
+        :param col_idx: Optional precomputed row index array matching col_ptr.
+        """
+        self.row_bits = list(row_bits)
+        self.num_rows = len(self.row_bits)
+        self.num_cols = num_cols
+        self.full_mask = (1 << num_cols) - 1
+
+        if col_ptr is None or col_idx is None:
+            col_ptr, col_idx = self._build_incidence()
+        self.col_ptr = col_ptr
+        self.col_idx = col_idx
+        self._row_ptr = None
+        self._row_idx = None
+
+    @classmethod
+    def from_dense(cls, matrix):
+        """
+        Build a CoverMatrix from a dense matrix (list of lists or 2D array).
+
+        :param matrix: Dense matrix where a 1 means the row covers the column; NumPy
+                       arrays of any integer or bool dtype are read in place.
+        :return: A new CoverMatrix.
+        """
+        num_rows = len(matrix)
+        num_cols = len(matrix[0]) if num_rows else 0
+
+        row_bits = []
+        row_parts, col_parts = [], []
+        for start in range(0, num_rows, CHUNK_ROWS):
+            if isinstance(matrix, np.ndarray):
+                block = matrix[start:start + CHUNK_ROWS]  # A view, not a copy
+            else:
+                block = np.asarray(matrix[start:start + CHUNK_ROWS], dtype=np.uint8)
+            row_bits.extend(_pack_block(block))
+            rows, cols = np.nonzero(block)
+            row_parts.append(rows.astype(np.int32) + start)
+            col_parts.append(cols.astype(np.int32))
+
+        col_ptr, col_idx = cls._incidence_from_pairs(row_parts, col_parts, num_cols)
+        return cls(row_bits, num_cols, col_ptr, col_idx)
+
+    @classmethod
+    def from_coordinates(cls, rows, cols, num_rows, num_cols):
+        """
+        Build a CoverMatrix from the coordinates of its ones.
+
+        :param rows: NumPy array with the row index of every one.
+        :param cols: NumPy array with the column index of every one (same length).
+        :param num_rows: The total number of rows.
+        :param num_cols: The total number of columns.
+        :return: A new CoverMatrix.
+        """
+        # Sort by row then column and drop repeated coordinates.
+        keys = np.sort(np.asarray(rows, dtype=np.int64) * num_cols + np.asarray(cols, dtype=np.int64))
+        if len(keys):
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        rows = (keys // max(num_cols, 1)).astype(np.int32)
+        cols = (keys % max(num_cols, 1)).astype(np.int32)
+
+        # Pack the rows a chunk at a time from the coordinates falling in the chunk.
+        row_bits = []
+        for start in range(0, num_rows, CHUNK_ROWS):
+            stop = min(start + CHUNK_ROWS, num_rows)
+            low, high = np.searchsorted(rows, [start, stop])
+            block = np.zeros((stop - start, num_cols), dtype=bool)
+            block[rows[low:high] - start, cols[low:high]] = True
+            row_bits.extend(_pack_block(block))
+
+        col_ptr, col_idx = cls._incidence_from_pairs([rows], [cols], num_cols)
+        return cls(row_bits, num_cols, col_ptr, col_idx)
+
+    @classmethod
+    def from_csr(cls, indptr, indices, num_cols):
+        """
+        Build a CoverMatrix from compressed sparse rows (for example the indptr and
+        indices of a SciPy CSR matrix), without a dense copy of the matrix.
+
+        :param indptr: NumPy array; the columns of row i are indices[indptr[i]:indptr[i + 1]].
+        :param indices: NumPy array of column indices, without repeats within a row.
+        :param num_cols: The total number of columns.
+        :return: A new CoverMatrix.
+        """
+        num_rows = len(indptr) - 1
+        row_sizes = np.diff(indptr)
+        row_bits = []
+        for start in range(0, num_rows, CHUNK_ROWS):
+            stop = min(start + CHUNK_ROWS, num_rows)
+            block = np.zeros((stop - start, num_cols), dtype=bool)
+            block[np.repeat(np.arange(stop - start), row_sizes[start:stop]),
+                  indices[indptr[start]:indptr[stop]]] = True
+            row_bits.extend(_pack_block(block))
+
+        rows = np.repeat(np.arange(num_rows, dtype=np.int32), row_sizes)
+        col_ptr, col_idx = cls._incidence_from_pairs([rows], [np.asarray(indices, dtype=np.int32)], num_cols)
+        return cls(row_bits, num_cols, col_ptr, col_idx)
+
+    @classmethod
+    def from_packed(cls, packed, num_cols):
+        """
+        Build a CoverMatrix from rows packed 8 columns per byte (little bit order).
+
+        :param packed: 2D uint8 array (possibly memory-mapped) of shape
+                       (num_rows, ceil(num_cols / 8)).
+        :param num_cols: The total number of columns.
+        :return: A new CoverMatrix.
+        """
+        full_mask = (1 << num_cols) - 1  # Ignore padding bits of the last byte
+        row_bits = [int.from_bytes(row.tobytes(), 'little') & full_mask for row in packed]
+        return cls(row_bits, num_cols)
+
+    @staticmethod
+    def _incidence_from_pairs(row_parts, col_parts, num_cols):
+        """
+        Turn (row, column) coordinate chunks into compressed sparse column arrays.
+        """
+        rows = np.concatenate(row_parts) if row_parts else np.zeros(0, dtype=np.int32)
+        cols = np.concatenate(col_parts) if col_parts else np.zeros(0, dtype=np.int32)
+
+        order = np.argsort(cols, kind='stable')  # keeps rows sorted within each column
+        col_idx = rows[order].astype(np.int32)
+        col_ptr = np.zeros(num_cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=num_cols), out=col_ptr[1:])
+        return col_ptr, col_idx
+
+    def _build_incidence(self):
+        """
+        Derive the column incidence arrays from the row bitsets.
+        """
+        row_parts, col_parts = [], []
+        for start in range(0, self.num_rows, CHUNK_ROWS):
+            block = _unpack_block(self.row_bits[start:start + CHUNK_ROWS], self.num_cols)
+            rows, cols = np.nonzero(block)
+            row_parts.append(rows.astype(np.int32) + start)
+            col_parts.append(cols.astype(np.int32))
+        return self._incidence_from_pairs(row_parts, col_parts, self.num_cols)
+
+    def _build_row_incidence(self):
+        """
+        Transpose the column incidence into compressed sparse rows.
+        """
+        nz_cols = np.repeat(np.arange(self.num_cols, dtype=np.int64), self.column_counts())
+        # A stable sort keeps every row's columns ascending
+        self._row_idx = nz_cols[np.argsort(self.col_idx, kind='stable')]
+        self._row_ptr = np.zeros(self.num_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.col_idx, minlength=self.num_rows), out=self._row_ptr[1:])
+
+    @property
+    def row_ptr(self):
+        """
+        Row pointer array of the row to columns incidence: the columns of row i are
+        row_idx[row_ptr[i]:row_ptr[i + 1]]. Built from the column incidence on first use.
+        """
+        if self._row_ptr is None:
+            self._build_row_incidence()
+        return self._row_ptr
+
+    @property
+    def row_idx(self):
+        """
+        Column index array matching row_ptr; each row's columns are sorted ascending.
+        """
+        if self._row_idx is None:
+            self._build_row_incidence()
+        return self._row_idx
+
+    @property
+    def nnz(self):
+        """
+        The number of ones in the matrix.
+        """
+        return len(self.col_idx)
+
+    def equals(self, other):
+        """
+        Whether another CoverMatrix holds the same matrix.
+
+        :param other: A CoverMatrix.
+        :return: True if the shapes and the ones are the same.
+        """
+        return (self.num_rows == other.num_rows and self.num_cols == other.num_cols
+                and np.array_equal(self.col_ptr, other.col_ptr) and np.array_equal(self.col_idx, other.col_idx))
+
+    def rows_covering(self, col):
+        """
+        Rows that have a 1 in the given column.
+
+        :param col: Column index.
+        :return: NumPy array of row indices, sorted ascending.
+        """
+        return self.col_idx[self.col_ptr[col]:self.col_ptr[col + 1]]
+
+    def column_counts(self):
+        """
+        Number of rows covering each column.
+
+        :return: NumPy array of length num_cols.
+        """
+        return np.diff(self.col_ptr)
+
+    def column_bits(self):
+        """
+        Bitset of covering rows for every column (bit i set when row i covers it).
+
+        :return: List of integer bitsets, one per column.
+        """
+        column_bits = []
+        rows = np.zeros(self.num_rows, dtype=bool)
+        for col in range(self.num_cols):
+            members = self.rows_covering(col)
+            rows[members] = True
+            column_bits.append(int.from_bytes(np.packbits(rows, bitorder='little').tobytes(), 'little'))
+            rows[members] = False
+        return column_bits
+
+    def row_columns(self, row):
+        """
+        Columns covered by the given row.
+
+        :param row: Row index.
+        :return: List of column indices, sorted ascending.
+        """
+        return list(iter_bits(self.row_bits[row]))
+
+    def covered_mask(self, rows):
+        """
+        Bitset of the columns covered by a set of rows.
+
+        :param rows: Iterable of row indices.
+        :return: Integer bitset of covered columns.
+        """
+        mask = 0
+        row_bits = self.row_bits
+        for row in rows:
+            mask |= row_bits[row]
+        return mask
+
+    def covers(self, rows):
+        """
+        Check whether the given rows cover every column.
+
+        :param rows: Iterable of row indices.
+        :return: True if all columns are covered, False otherwise.
+        """
+        return self.covered_mask(rows) == self.full_mask
+
+    def uncovered_columns(self, rows):
+        """
+        Columns left uncovered by the given rows.
+
+        :param rows: Iterable of row indices.
+        :return: List of column indices.
+        """
+        return list(iter_bits(self.full_mask & ~self.covered_mask(rows)))
+
+    def uncoverable_columns(self):
+        """
+        Columns that no row covers, which makes the instance infeasible.
+
+        :return: List of column indices.
+        """
+        return np.flatnonzero(self.column_counts() == 0).tolist()
+
+    def submatrix(self, rows, cols):
+        """
+        Extract the submatrix formed by the given rows and columns.
+
+        The ones are gathered from the column incidence, so no row is unpacked.
+
+        :param rows: Sorted list of row indices to keep.
+        :param cols: Sorted list of column indices to keep.
+        :return: A new CoverMatrix whose row i / column j are rows[i] / cols[j].
+        """
+        cols = np.asarray(cols, dtype=np.int64)
+        new_row = np.full(self.num_rows, -1, dtype=np.int64)  # -1 for dropped rows
+        new_row[np.asarray(rows, dtype=np.int64)] = np.arange(len(rows))
+
+        lengths = self.col_ptr[cols + 1] - self.col_ptr[cols]
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        sub_rows = new_row[self.col_idx[np.repeat(self.col_ptr[cols], lengths) + offsets]]
+        sub_cols = np.repeat(np.arange(len(cols)), lengths)
+        kept = sub_rows >= 0
+        return CoverMatrix.from_coordinates(sub_rows[kept], sub_cols[kept], len(rows), len(cols))
+
+    def to_numpy(self, dtype=np.uint8):
+        """
+        Materialize the matrix as a dense NumPy array.
+
+        :param dtype: The dtype of the returned array.
+        :return: 2D array of shape (num_rows, num_cols).
+        """
+        return _unpack_block(self.row_bits, self.num_cols).astype(dtype)
+
+    def to_dense(self):
+        """
+        Materialize the matrix as a list of lists of ints.
+
+        :return: List of lists with matrix data.
+        """
+        return self.to_numpy().tolist()
+
+
+def as_cover_matrix(matrix):
+    """
+    Return the matrix as a CoverMatrix, converting dense input when needed.
+
+    :param matrix: A CoverMatrix or a dense 2D list/array of 0/1 values.
+    :return: A CoverMatrix.
+    """
+    if isinstance(matrix, CoverMatrix):
+        return matrix
+    return CoverMatrix.from_dense(matrix)
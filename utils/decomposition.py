@@ -0,0 +1,238 @@
+# utils/decomposition.py
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import functools
+import multiprocessing
+import os
+import time
+import numpy as np
+from utils.algorithms import (OPTIMAL, FEASIBLE, TIMEOUT, SolverResult, as_solver_result, greedy_algorithm,
+                              remove_redundant_rows)
+from utils.control import SolveControl
+from utils.cover_matrix import as_cover_matrix
+
+# Below this many ones in total, blocks are solved one after another in this process;
+# starting worker processes would cost more than it saves.
+PARALLEL_MIN_NNZ = 20000
+# Seconds between checks for a cancelled run while worker processes solve blocks
+CANCEL_POLL_INTERVAL = 0.1
+
+# Stop event of the run a worker process belongs to, set by _init_worker
+_worker_stop_event = None
+
+
+def connected_components(matrix):
+    """
+    Split the row-column bipartite graph of a matrix into connected components.
+
+    Two columns belong to the same component when some row covers both; a row belongs
+    to the component of its columns. Rows that cover nothing belong to no component.
+
+    Every column is labelled with the smallest column of its component by propagating
+    minimum labels through the rows, with pointer jumping, on the incidence arrays.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :return: List of (rows, cols) pairs of sorted index lists, largest block first.
+    """
+    cover = as_cover_matrix(matrix)
+    num_rows, num_cols = cover.num_rows, cover.num_cols
+    nz_rows = cover.col_idx
+    # The ones by row (compressed sparse rows), for per-row minimums
+    row_ptr, row_idx = cover.row_ptr, cover.row_idx
+    used_rows = np.flatnonzero(np.diff(row_ptr))
+    row_starts = row_ptr[used_rows]
+    used_cols = np.flatnonzero(cover.column_counts())
+    col_starts = cover.col_ptr[used_cols]
+
+    label = np.arange(num_cols)
+    row_label = np.zeros(num_rows, dtype=np.int64)
+    while True:
+        if len(used_rows):
+            row_label[used_rows] = np.minimum.reduceat(label[row_idx], row_starts)
+            new_label = label.copy()
+            new_label[used_cols] = np.minimum(label[used_cols], np.minimum.reduceat(row_label[nz_rows], col_starts))
+        else:
+            new_label = label
+        # Labels only decrease and point to a column of the same component: follow them
+        while True:
+            jumped = new_label[new_label]
+            if np.array_equal(jumped, new_label):
+                break
+            new_label = jumped
+        if np.array_equal(new_label, label):
+            break
+        label = new_label
+
+    roots, col_block = np.unique(label, return_inverse=True)
+    col_lists = [[] for _ in roots]
+    for col, block in enumerate(col_block.tolist()):
+        col_lists[block].append(col)
+    row_lists = [[] for _ in roots]
+    if len(used_rows):
+        for row, block in zip(used_rows.tolist(), col_block[row_label[used_rows]].tolist()):
+            row_lists[block].append(row)
+    blocks = list(zip(row_lists, col_lists))
+    return sorted(blocks, key=lambda block: (-len(block[0]), block[1]))
+
+
+def _init_worker(stop_event):
+    """
+    Keep the run's stop event in a worker process; events can only reach a worker
+    when it starts, not with each task.
+    """
+    global _worker_stop_event
+    _worker_stop_event = stop_event
+
+
+def _solve_block(algorithm_function, block, initial=None, deadline=None, budget=None):
+    """
+    Solve one block; module level so it can run in a worker process.
+
+    In a worker, the algorithm gets a control of its own that stops on the run's stop
+    event, budget seconds after the block starts or at deadline (a wall-clock time),
+    whichever comes first. A block that times out with a cover larger than the greedy
+    one gets the greedy cover instead.
+    """
+    if _worker_stop_event is not None:
+        limits = [limit for limit in (budget, None if deadline is None else deadline - time.time())
+                  if limit is not None]
+        control = SolveControl(_worker_stop_event, time_limit=max(0.0, min(limits)) if limits else None)
+        algorithm_function = functools.partial(algorithm_function, control=control)
+    if initial is None:
+        result = as_solver_result(algorithm_function(block))
+    else:
+        result = as_solver_result(algorithm_function(block, initial=initial))
+    if result.status == TIMEOUT:
+        greedy_rows = remove_redundant_rows(block, greedy_algorithm(block).rows)
+        if len(greedy_rows) < len(result.rows):
+            result.rows = greedy_rows
+    return result
+
+
+def merge_results(components, block_results):
+    """
+    Combine the results of independent blocks into one result for the whole matrix.
+
+    The merged cover is optimal only if every block's is, and its lower bound is the
+    sum of the block bounds when every block has one. Numeric details (solver
+    counters) reported by every block are summed.
+
+    :param components: List of (rows, cols) index lists, as from connected_components.
+    :param block_results: One SolverResult per block, in the same order.
+    :return: A SolverResult over the matrix's row indices.
+    """
+    result_rows = []
+    for (rows, _), result in zip(components, block_results):
+        result_rows.extend(rows[row] for row in result.rows)
+
+    statuses = {result.status for result in block_results}
+    if TIMEOUT in statuses:
+        status = TIMEOUT
+    elif statuses <= {OPTIMAL}:
+        status = OPTIMAL
+    else:
+        status = FEASIBLE
+
+    bounds = [result.lower_bound for result in block_results]
+    lower_bound = sum(bounds) if None not in bounds else None
+    # Solver details only describe the whole matrix when there was a single block;
+    # otherwise the numeric ones that every block reports (counters) are added up
+    if len(block_results) == 1:
+        details = dict(block_results[0].details)
+    else:
+        details = {key: sum(result.details[key] for result in block_results)
+                   for key, value in block_results[0].details.items()
+                   if isinstance(value, (int, float)) and not isinstance(value, bool)
+                   and all(key in result.details for result in block_results)}
+    details['blocks'] = len(block_results)
+    return SolverResult(sorted(result_rows), status, lower_bound, **details)
+
+
+def _solve_in_workers(functions, blocks, initials, max_workers, control):
+    """
+    Solve blocks in worker processes. The workers share a stop event, set when the
+    control is cancelled, and the control's deadline; progress is reported as the
+    number of blocks solved.
+
+    Blocks wait for a free worker, so each gets its own budget, counted from when it
+    starts: the remaining time split in proportion to the blocks' ones, with as many
+    blocks running at a time as there are workers.
+    """
+    context = multiprocessing.get_context()
+    stop_event = context.Event()
+    remaining = None if control is None else control.remaining()
+    deadline = None if remaining is None else time.time() + remaining
+    workers = min(len(blocks), max_workers or os.cpu_count() or 1)
+    total_nnz = sum(block.nnz for block in blocks)
+    budgets = [None if remaining is None else remaining * min(1.0, workers * block.nnz / total_nnz)
+               for block in blocks]
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                             initializer=_init_worker, initargs=(stop_event,)) as executor:
+        futures = [executor.submit(_solve_block, function, block, block_initial, deadline, budget)
+                   for function, block, block_initial, budget in zip(functions, blocks, initials, budgets)]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            if control is not None:
+                if control.cancelled:
+                    stop_event.set()
+                control.report(blocks_solved=len(futures) - len(pending))
+        return [future.result() for future in futures]
+
+
+def solve_by_components(matrix, choose_algorithm, max_workers=None, parallel=True, initial=None,
+                        control=None):
+    """
+    Solve every connected component of a matrix independently and merge the covers.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param choose_algorithm: Callable taking a block (a CoverMatrix) and returning the
+                             algorithm function that should solve it; the function
+                             must accept a control keyword when control is given.
+    :param max_workers: Maximum number of worker processes; defaults to the CPU count.
+    :param parallel: Whether blocks may be solved in worker processes; pass False when
+                     the algorithms hold state that cannot leave this process.
+    :param initial: Optional row indices of a cover of the matrix to warm-start from;
+                    each block's algorithm receives the rows falling in that block.
+    :param control: Optional SolveControl for the whole run. Its cancellation and
+                    deadline reach blocks solved in worker processes; a control sharing
+                    an incumbent keeps every block in this process. Each block gets a
+                    share of the remaining time in proportion to its ones, so the first
+                    blocks cannot use up the whole deadline.
+    :return: Tuple of (merged SolverResult, list of (rows, cols) block sizes).
+    """
+    cover = as_cover_matrix(matrix)
+    components = connected_components(cover)
+    if len(components) == 1 and len(components[0][0]) == cover.num_rows:
+        # One block holding the whole matrix: solve it as is, without a copy
+        function = choose_algorithm(cover)
+        if control is not None:
+            function = functools.partial(function, control=control)
+        result = _solve_block(function, cover, None if initial is None else list(initial))
+        return merge_results(components, [result]), [(cover.num_rows, cover.num_cols)]
+
+    blocks = [cover.submatrix(rows, cols) for rows, cols in components]
+    functions = [choose_algorithm(block) for block in blocks]
+    if initial is None:
+        initials = [None] * len(blocks)
+    else:
+        initial = set(initial)
+        initials = [[index for index, row in enumerate(rows) if row in initial] for rows, _ in components]
+
+    # A shared incumbent only lives in this process and the processes it was made for
+    if (parallel and len(blocks) > 1 and cover.nnz >= PARALLEL_MIN_NNZ
+            and (control is None or control.best_known() is None)):
+        block_results = _solve_in_workers(functions, blocks, initials, max_workers, control)
+    else:
+        block_results = []
+        nnz_left = sum(block.nnz for block in blocks)
+        for function, block, block_initial in zip(functions, blocks, initials):
+            if control is not None:
+                # Time left over by earlier blocks goes to the later ones
+                remaining = control.remaining()
+                share = None if remaining is None else remaining * block.nnz / nnz_left
+                function = functools.partial(function, control=control.with_time_limit(share))
+            block_results.append(_solve_block(function, block, block_initial))
+            nnz_left -= block.nnz
+
+    sizes = [(block.num_rows, block.num_cols) for block in blocks]
+    return merge_results(components, block_results), sizes
@@ -0,0 +1,85 @@
+# utils/generators.py
+import numpy as np
+
+
+def random_matrix(num_rows, num_cols, density=0.5, seed=None):
+    """
+    Random 0/1 matrix where every cell is a one with the given probability.
+
+    :param num_rows: The number of rows.
+    :param num_cols: The number of columns.
+    :param density: Probability of a one, between 0 and 1.
+    :param seed: Optional seed for the random number generator.
+    :return: uint8 NumPy array of shape (num_rows, num_cols).
+    """
+    _check_size(num_rows, num_cols, density)
+    rng = np.random.default_rng(seed)
+    return (rng.random((num_rows, num_cols)) < density).astype(np.uint8)
+
+
+def feasible_matrix(num_rows, num_cols, density=0.5, seed=None):
+    """
+    Random 0/1 matrix, as random_matrix, in which every column is covered by at least
+    one row: empty columns get a one in a random row.
+
+    :param num_rows: The number of rows.
+    :param num_cols: The number of columns.
+    :param density: Probability of a one, between 0 and 1.
+    :param seed: Optional seed for the random number generator.
+    :return: uint8 NumPy array of shape (num_rows, num_cols).
+    """
+    _check_size(num_rows, num_cols, density)
+    rng = np.random.default_rng(seed)
+    matrix = (rng.random((num_rows, num_cols)) < density).astype(np.uint8)
+    empty = np.flatnonzero(~matrix.any(axis=0))
+    matrix[rng.integers(num_rows, size=len(empty)), empty] = 1
+    return matrix
+
+
+def planted_matrix(num_rows, num_cols, optimum, density=0.1, seed=None):
+    """
+    Random 0/1 matrix whose minimum cover is known to have exactly `optimum` rows.
+
+    The columns are split at random into `optimum` blocks and one planted row covers
+    each block, so the planted rows form a cover. Every block has a witness column,
+    and the other rows cover random non-witness columns with the given density plus
+    at most one witness. No row covers two witnesses, so any cover needs at least
+    `optimum` rows, while the noise rows keep the planted rows from being forced.
+
+    :param num_rows: The number of rows, at least optimum.
+    :param num_cols: The number of columns, at least optimum.
+    :param optimum: The size of the planted cover.
+    :param density: Probability of a one in the noise rows, between 0 and 1.
+    :param seed: Optional seed for the random number generator.
+    :return: Tuple of (uint8 NumPy array of shape (num_rows, num_cols), sorted list of
+             the planted rows).
+    """
+    _check_size(num_rows, num_cols, density)
+    if not 1 <= optimum <= min(num_rows, num_cols):
+        raise ValueError("The planted optimum must be between 1 and the number of rows and of columns")
+    rng = np.random.default_rng(seed)
+
+    # The first `optimum` shuffled columns are the witnesses, one per block
+    columns = rng.permutation(num_cols)
+    witnesses = columns[:optimum]
+    blocks = np.empty(num_cols, dtype=np.int64)
+    blocks[witnesses] = np.arange(optimum)
+    blocks[columns[optimum:]] = rng.integers(optimum, size=num_cols - optimum)
+
+    matrix = (rng.random((num_rows, num_cols)) < density).astype(np.uint8)
+    matrix[:, witnesses] = 0
+    # A noise row draws each witness with the density, and keeps one of those drawn
+    has_witness = np.flatnonzero(rng.random(num_rows) < 1 - (1 - density) ** optimum)
+    matrix[has_witness, witnesses[rng.integers(optimum, size=len(has_witness))]] = 1
+
+    planted = np.sort(rng.choice(num_rows, size=optimum, replace=False))
+    matrix[planted] = 0
+    matrix[planted[blocks], np.arange(num_cols)] = 1
+    return matrix, planted.tolist()
+
+
+def _check_size(num_rows, num_cols, density):
+    if num_rows <= 0 or num_cols <= 0:
+        raise ValueError("Number of rows and columns must be positive integers.")
+    if not 0 <= density <= 1:
+        raise ValueError("Density must be between 0 and 1.")
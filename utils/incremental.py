@@ -0,0 +1,70 @@
+# utils/incremental.py
+from utils.cover_matrix import as_cover_matrix
+
+
+def diff_matrices(old, new):
+    """
+    Summarize how a matrix changed between two versions.
+
+    :param old: The previous CoverMatrix.
+    :param new: The new CoverMatrix.
+    :return: Dictionary with the added/removed row and column counts, the number of
+             rows whose contents differ at the same index, and the number of changed
+             cells when the shape is unchanged (None otherwise).
+    """
+    old = as_cover_matrix(old)
+    new = as_cover_matrix(new)
+    shared_rows = min(old.num_rows, new.num_rows)
+    changed_rows = sum(1 for row in range(shared_rows) if old.row_bits[row] != new.row_bits[row])
+
+    changed_cells = None
+    if old.num_rows == new.num_rows and old.num_cols == new.num_cols:
+        changed_cells = sum((old.row_bits[row] ^ new.row_bits[row]).bit_count() for row in range(shared_rows))
+
+    return {
+        'added_rows': max(0, new.num_rows - old.num_rows),
+        'removed_rows': max(0, old.num_rows - new.num_rows),
+        'added_cols': max(0, new.num_cols - old.num_cols),
+        'removed_cols': max(0, old.num_cols - new.num_cols),
+        'changed_rows': changed_rows,
+        'changed_cells': changed_cells,
+    }
+
+
+def map_rows(old, new, rows):
+    """
+    Find the rows of a new matrix version that correspond to rows of the old one.
+
+    When both versions have the same columns, a row is matched to a new row with the
+    same contents, so rows inserted or deleted elsewhere do not shift the mapping; rows
+    whose contents were edited fall back to their old index. With a different number
+    of columns, rows keep their index. Old rows with no counterpart are dropped.
+
+    :param old: The previous CoverMatrix.
+    :param new: The new CoverMatrix.
+    :param rows: Row indices of the old matrix (for example its last cover).
+    :return: List of distinct row indices of the new matrix.
+    """
+    old = as_cover_matrix(old)
+    new = as_cover_matrix(new)
+    mapped = []
+    if old.num_cols == new.num_cols:
+        # Positions of every distinct row content in the new matrix
+        positions = {}
+        for row, bits in enumerate(new.row_bits):
+            positions.setdefault(bits, []).append(row)
+        unmatched = []
+        for row in rows:
+            candidates = positions.get(old.row_bits[row])
+            if candidates:
+                # Prefer the copy at the same index, then the first unused one
+                match = row if row in candidates else candidates[0]
+                candidates.remove(match)
+                mapped.append(match)
+            else:
+                unmatched.append(row)
+        used = set(mapped)
+        mapped.extend(row for row in unmatched if row < new.num_rows and row not in used)
+    else:
+        mapped = [row for row in rows if row < new.num_rows]
+    return list(dict.fromkeys(mapped))
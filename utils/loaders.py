@@ -0,0 +1,208 @@
+# utils/loaders.py
+import mmap
+import os
+import numpy as np
+from utils.cover_matrix import CoverMatrix
+
+# Magic bytes at the start of packed-bit instance files, followed by the number of rows
+# and columns as little-endian uint64 and then the rows, 8 columns per byte.
+PACKED_MAGIC = b'SCPBITS1'
+PACKED_HEADER_SIZE = len(PACKED_MAGIC) + 16
+
+# Bytes of text parsed at a time when streaming numeric files.
+TOKEN_CHUNK_SIZE = 1 << 24
+
+
+def _read_tokens(path):
+    """
+    Read every whitespace-separated integer of a text file into a NumPy array.
+
+    The file is memory-mapped and parsed a chunk at a time, so only the resulting
+    integers (not the text) are held in memory.
+
+    :param path: Path of the text file.
+    :return: 1D int64 NumPy array of the integers in file order.
+    """
+    if not os.path.getsize(path):
+        return np.zeros(0, dtype=np.int64)
+
+    parts = []
+    with open(path, 'rb') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < len(data):
+            stop = min(start + TOKEN_CHUNK_SIZE, len(data))
+            if stop < len(data):
+                # Do not cut a number in half: end the chunk after the last whitespace
+                stop = max(data.rfind(b' ', start, stop), data.rfind(b'\n', start, stop)) + 1 or stop
+            chunk = data[start:stop].split()
+            parts.append(np.array(chunk, dtype=np.float64).astype(np.int64))
+            start = stop
+    return np.concatenate(parts)
+
+
+def load_orlib_scp(path):
+    """
+    Load an OR-Library set covering instance (scp4x-scpnrx format).
+
+    The file lists m elements and n sets: "m n", then the n set costs, then for each
+    element the number of sets covering it followed by those sets (1-based). Sets
+    become rows and elements become columns of the CoverMatrix; costs are ignored
+    since every row counts as one.
+
+    :param path: Path of the instance file.
+    :return: A CoverMatrix with n rows and m columns.
+    """
+    tokens = _read_tokens(path)
+    num_elements, num_sets = int(tokens[0]), int(tokens[1])
+    position = 2 + num_sets  # Skip the costs
+
+    # Locate every element's list of sets; only this loop is per element.
+    starts = np.empty(num_elements, dtype=np.int64)
+    counts = np.empty(num_elements, dtype=np.int64)
+    for element in range(num_elements):
+        counts[element] = tokens[position]
+        starts[element] = position + 1
+        position += 1 + counts[element]
+
+    rows = np.concatenate([tokens[start:start + count] for start, count in zip(starts, counts)]) - 1
+    cols = np.repeat(np.arange(num_elements), counts)
+    return CoverMatrix.from_coordinates(rows, cols, num_sets, num_elements)
+
+
+def load_orlib_rail(path):
+    """
+    Load an OR-Library rail crew scheduling instance (rail507, rail2586, rail4284).
+
+    The file lists m elements and n sets: "m n", then for each set its cost, the
+    number of elements it covers and those elements (1-based). Sets become rows and
+    elements become columns of the CoverMatrix; costs are ignored.
+
+    :param path: Path of the instance file.
+    :return: A CoverMatrix with n rows and m columns.
+    """
+    tokens = _read_tokens(path)
+    num_elements, num_sets = int(tokens[0]), int(tokens[1])
+
+    starts = np.empty(num_sets, dtype=np.int64)
+    counts = np.empty(num_sets, dtype=np.int64)
+    position = 2
+    for row in range(num_sets):
+        counts[row] = tokens[position + 1]
+        starts[row] = position + 2
+        position += 2 + counts[row]
+
+    cols = np.concatenate([tokens[start:start + count] for start, count in zip(starts, counts)]) - 1
+    rows = np.repeat(np.arange(num_sets), counts)
+    return CoverMatrix.from_coordinates(rows, cols, num_sets, num_elements)
+
+
+def load_sparse_rows(path):
+    """
+    Load an instance stored as sparse row lists.
+
+    The first line holds "num_rows num_cols"; each following line lists the (0-based)
+    columns covered by one row. The file is read line by line.
+
+    :param path: Path of the instance file.
+    :return: A CoverMatrix.
+    """
+    with open(path) as handle:
+        num_rows, num_cols = map(int, handle.readline().split())
+        row_parts, col_parts = [], []
+        for row, line in enumerate(handle):
+            if row >= num_rows:
+                break
+            cols = np.array(line.split(), dtype=np.int64)
+            col_parts.append(cols)
+            row_parts.append(np.full(len(cols), row, dtype=np.int64))
+
+    rows = np.concatenate(row_parts) if row_parts else np.zeros(0, dtype=np.int64)
+    cols = np.concatenate(col_parts) if col_parts else np.zeros(0, dtype=np.int64)
+    if len(cols) and (cols.min() < 0 or cols.max() >= num_cols):
+        raise ValueError(f"Column index out of range in {path}")
+    return CoverMatrix.from_coordinates(rows, cols, num_rows, num_cols)
+
+
+def load_packed(path):
+    """
+    Load a packed-bit binary instance written by save_packed.
+
+    The row data is memory-mapped, so it is never copied as a whole.
+
+    :param path: Path of the instance file.
+    :return: A CoverMatrix.
+    """
+    with open(path, 'rb') as handle:
+        header = handle.read(PACKED_HEADER_SIZE)
+    if not header.startswith(PACKED_MAGIC):
+        raise ValueError(f"{path} is not a packed-bit instance file")
+    num_rows, num_cols = np.frombuffer(header[len(PACKED_MAGIC):], dtype='<u8').tolist()
+
+    num_bytes = (num_cols + 7) // 8
+    if not num_rows or not num_bytes:
+        return CoverMatrix([0] * num_rows, num_cols)
+    packed = np.memmap(path, dtype=np.uint8, mode='r', offset=PACKED_HEADER_SIZE, shape=(num_rows, num_bytes))
+    try:
+        return CoverMatrix.from_packed(packed, num_cols)
+    finally:
+        del packed
+
+
+def save_packed(matrix, path):
+    """
+    Write a CoverMatrix as a packed-bit binary instance file.
+
+    :param matrix: The CoverMatrix to write.
+    :param path: Path of the file to create.
+    """
+    num_bytes = (matrix.num_cols + 7) // 8
+    with open(path, 'wb') as handle:
+        handle.write(PACKED_MAGIC)
+        handle.write(np.array([matrix.num_rows, matrix.num_cols], dtype='<u8').tobytes())
+        for bits in matrix.row_bits:
+            handle.write(bits.to_bytes(num_bytes, 'little'))
+
+
+# Dictionary linking format names to their loader functions
+LOADERS = {
+    'orlib': load_orlib_scp,
+    'rail': load_orlib_rail,
+    'sparse': load_sparse_rows,
+    'packed': load_packed,
+}
+
+
+def detect_format(path):
+    """
+    Guess the format of an instance file.
+
+    Packed-bit files are recognized by their magic bytes, rail instances by a file
+    name starting with "rail" and sparse row lists by the ".rows" extension; anything
+    else is read as an OR-Library scp file.
+
+    :param path: Path of the instance file.
+    :return: A key of LOADERS.
+    """
+    with open(path, 'rb') as handle:
+        if handle.read(len(PACKED_MAGIC)) == PACKED_MAGIC:
+            return 'packed'
+    name = os.path.basename(path).lower()
+    if name.startswith('rail'):
+        return 'rail'
+    if name.endswith('.rows'):
+        return 'sparse'
+    return 'orlib'
+
+
+def load_instance(path, fmt=None):
+    """
+    Load an instance file straight into a CoverMatrix.
+
+    :param path: Path of the instance file.
+    :param fmt: One of 'orlib', 'rail', 'sparse' or 'packed'; detected when None.
+    :return: A CoverMatrix.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in LOADERS:
+        raise ValueError(f"Unknown instance format: {fmt}")
+    return LOADERS[fmt](path)
@@ -0,0 +1,190 @@
+# utils/local_search.py
+import numpy as np
+from utils.algorithms import repair_cover
+from utils.control import SolveControl
+from utils.cover_matrix import as_cover_matrix
+
+# Consecutive size-preserving swaps after which the local search gives up
+PLATEAU_MOVES = 1000
+
+
+class CoverState:
+    """
+    A cover being modified, with the number of selected rows covering each column.
+
+    Adding or removing a row and checking whether a row is redundant only touch the
+    row's own columns, so no move needs a full coverage check.
+    """
+
+    def __init__(self, cover, rows):
+        """
+        :param cover: The CoverMatrix.
+        :param rows: Row indices of the starting cover.
+        """
+        self.cover = cover
+        # Row to columns incidence (compressed sparse rows)
+        self.row_idx = cover.row_idx
+        self.row_ptr = cover.row_ptr
+
+        self.counts = np.zeros(cover.num_cols, dtype=np.int32)
+        self.selected = set()
+        for row in rows:
+            if row not in self.selected:
+                self.add(row)
+
+    def columns(self, row):
+        """
+        Columns covered by a row, as a NumPy array.
+        """
+        return self.row_idx[self.row_ptr[row]:self.row_ptr[row + 1]]
+
+    def add(self, row):
+        self.selected.add(row)
+        self.counts[self.columns(row)] += 1
+
+    def remove(self, row):
+        self.selected.discard(row)
+        self.counts[self.columns(row)] -= 1
+
+    def is_redundant(self, row):
+        """
+        Whether every column of a selected row is also covered by another selected row.
+        """
+        return bool(np.all(self.counts[self.columns(row)] >= 2))
+
+    def unique_columns(self, row):
+        """
+        Columns covered by this selected row only.
+        """
+        columns = self.columns(row)
+        return columns[self.counts[columns] == 1]
+
+    def selected_neighbours(self, row):
+        """
+        Selected rows sharing at least one column with the given row.
+        """
+        cover = self.cover
+        columns = self.columns(row)
+        if not len(columns):
+            return []
+        rows = np.unique(np.concatenate([cover.col_idx[cover.col_ptr[col]:cover.col_ptr[col + 1]]
+                                         for col in columns]))
+        return [other for other in rows.tolist() if other in self.selected and other != row]
+
+    def drop_redundant(self, rows):
+        """
+        Remove the redundant rows among the given selected rows, those covering the
+        fewest columns first.
+
+        :return: List of the removed rows.
+        """
+        dropped = []
+        for row in sorted(rows, key=lambda r: self.row_ptr[r + 1] - self.row_ptr[r]):
+            if row in self.selected and self.is_redundant(row):
+                self.remove(row)
+                dropped.append(row)
+        return dropped
+
+    def swap_moves(self, tabu, iteration):
+        """
+        All (out, in) swaps that keep the cover valid: the incoming row must cover
+        every column that only the outgoing row covers. Tabu rows are neither removed
+        nor added.
+
+        :param tabu: Dictionary of rows to the last iteration during which they are tabu.
+        :param iteration: The current iteration.
+        :return: List of (row to remove, row to add) pairs.
+        """
+        cover = self.cover
+        moves = []
+        for out_row in self.selected:
+            if tabu.get(out_row, 0) >= iteration:
+                continue
+            unique = self.unique_columns(out_row)
+            if not len(unique):
+                continue
+            needed = 0
+            for col in unique.tolist():
+                needed |= 1 << col
+            for in_row in cover.rows_covering(int(unique[0])).tolist():
+                if in_row in self.selected or tabu.get(in_row, 0) >= iteration:
+                    continue
+                if cover.row_bits[in_row] & needed == needed:
+                    moves.append((out_row, in_row))
+        return moves
+
+
+def improve_cover(matrix, rows, time_limit=1.0, max_iterations=None, tabu_tenure=5, seed=None, control=None,
+                  max_plateau_moves=PLATEAU_MOVES):
+    """
+    Shrink a cover by local search.
+
+    Redundant rows are removed first. Each iteration then looks, in random order, for
+    a swap of a selected row for an unselected one after which another selected row
+    becomes redundant, which saves a row (a 2-for-1 exchange). When no such swap
+    exists, a random size-preserving swap is made and both rows become tabu for
+    tabu_tenure iterations, so the search can leave the local optimum without undoing
+    the move at once. The cover never grows. The search ends after max_plateau_moves
+    plateau moves in a row, so it stops even without a time or iteration limit.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param rows: Row indices of a cover; it is repaired first if it misses columns.
+    :param time_limit: Wall-clock budget in seconds, or None to stop on iterations only.
+    :param max_iterations: Optional maximum number of iterations.
+    :param tabu_tenure: Number of iterations a swapped row may not be swapped back.
+    :param seed: Optional seed for the random number generator.
+    :param control: Optional SolveControl for progress reports and cancellation.
+    :param max_plateau_moves: Number of consecutive plateau moves without a saved row
+                              after which the search stops.
+    :return: Sorted list of row indices of the improved cover.
+    """
+    cover = as_cover_matrix(matrix)
+    control = (control or SolveControl()).with_time_limit(time_limit)
+    rng = np.random.default_rng(seed)
+
+    if not cover.covers(rows):
+        rows = repair_cover(cover, rows)
+    state = CoverState(cover, rows)
+    state.drop_redundant(list(state.selected))
+
+    tabu = {}
+    iteration = 0
+    plateau_moves = 0
+    while max_iterations is None or iteration < max_iterations:
+        if control.should_stop():
+            break
+        iteration += 1
+        moves = state.swap_moves(tabu, iteration)
+        if not moves:
+            break
+
+        improved = False
+        for tried, index in enumerate(rng.permutation(len(moves)).tolist()):
+            out_row, in_row = moves[index]
+            state.remove(out_row)
+            state.add(in_row)
+            if state.drop_redundant(state.selected_neighbours(in_row)):
+                improved = True
+                break
+            # No row became redundant: undo the swap
+            state.remove(in_row)
+            state.add(out_row)
+            if tried % 64 == 63 and control.should_stop():
+                break
+
+        if improved:
+            plateau_moves = 0
+            control.report(incumbent=len(state.selected))
+            continue
+        if control.should_stop() or plateau_moves >= max_plateau_moves:
+            break
+
+        # Plateau move: swap without shrinking and keep both rows in place for a while
+        out_row, in_row = moves[int(rng.integers(len(moves)))]
+        state.remove(out_row)
+        state.add(in_row)
+        tabu[out_row] = tabu[in_row] = iteration + tabu_tenure
+        plateau_moves += 1
+
+    state.drop_redundant(list(state.selected))
+    return sorted(state.selected)
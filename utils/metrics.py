@@ -0,0 +1,111 @@
+# utils/metrics.py
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class MetricsRecorder:
+    """
+    Measures one solver run: wall-clock and CPU time, the peak of the memory allocated
+    while it runs (through tracemalloc) and the time spent in named phases.
+
+    Use it as a context manager around the run, and phase(name) around its parts:
+
+        with MetricsRecorder() as recorder:
+            with recorder.phase('presolve'):
+                ...
+
+    CPU time covers this process and the subprocesses that finished during the run
+    (such as CBC); solvers running in other, still alive, processes are not counted.
+    """
+
+    def __init__(self, trace_memory=True):
+        """
+        :param trace_memory: Whether to measure the peak memory; tracemalloc slows
+                             down code that allocates many small Python objects.
+        """
+        self.trace_memory = trace_memory
+        self.wall_time = None
+        self.cpu_time = None
+        self.child_cpu_time = None
+        self.peak_memory = None
+        self.phases = {}
+        self._started_tracing = False
+
+    def __enter__(self):
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            self._memory_baseline = tracemalloc.get_traced_memory()[0]
+        self._times = os.times()
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wall_time = time.perf_counter() - self._wall_start
+        self.cpu_time = time.process_time() - self._cpu_start
+        times = os.times()
+        self.child_cpu_time = (times.children_user + times.children_system
+                               - self._times.children_user - self._times.children_system)
+        if self.trace_memory:
+            self.peak_memory = max(0, tracemalloc.get_traced_memory()[1] - self._memory_baseline)
+            if self._started_tracing:
+                tracemalloc.stop()
+        return False
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Add the wall-clock time spent in the with block to the phase `name`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def as_dict(self):
+        """
+        The measurements, in seconds and bytes.
+
+        :return: Dictionary with wall_time, cpu_time, child_cpu_time, peak_memory (None
+                 when not traced) and one <phase>_time entry per phase.
+        """
+        metrics = {
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'child_cpu_time': self.child_cpu_time,
+            'peak_memory': self.peak_memory,
+        }
+        for name, seconds in self.phases.items():
+            metrics[f'{name}_time'] = seconds
+        return metrics
+
+
+def solver_counters(details):
+    """
+    The numeric entries of a SolverResult's details: algorithm-specific counters such
+    as nodes and prunes (Branch and Bound), heap pops (Greedy), generations and fitness
+    evaluations (Genetic Algorithm) or build and solve times (Linear Programming).
+
+    :param details: The details dictionary of a SolverResult.
+    :return: Dictionary of counter names to numbers.
+    """
+    return {key: value for key, value in details.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)}
+
+
+def export_metrics(metrics, path):
+    """
+    Write metrics as JSON.
+
+    :param metrics: Dictionary of algorithm names to their metrics dictionaries.
+    :param path: Path of the JSON file.
+    """
+    with open(path, 'w') as f:
+        json.dump(metrics, f, indent=2, sort_keys=True)
@@ -0,0 +1,128 @@
+# utils/portfolio.py
+import multiprocessing
+import time
+from multiprocessing.connection import wait
+from utils.algorithms import OPTIMAL, FEASIBLE, TIMEOUT, SolverResult, as_solver_result
+from utils.control import SolveControl
+from utils.cover_matrix import as_cover_matrix
+from utils.processes import kill_process_group, start_process_group
+
+# Seconds the solvers get to return their best cover after a cancellation or the
+# deadline, before their processes are killed.
+STOP_GRACE_PERIOD = 2.0
+
+# How often the portfolio checks for cancellation while waiting, in seconds.
+POLL_INTERVAL = 0.1
+
+
+def _portfolio_worker(name, algorithm_function, cover, stop_event, incumbent, time_limit, connection):
+    """
+    Run one solver of the portfolio and send its result back; runs in its own process.
+    """
+    start_process_group()
+    control = SolveControl(stop_event, incumbent, time_limit)
+    try:
+        result = as_solver_result(algorithm_function(cover, control=control))
+        control.offer_incumbent(result.objective)
+        connection.send((name, result, None))
+    except Exception as e:
+        connection.send((name, None, str(e)))
+    connection.close()
+
+
+def solve_portfolio(matrix, algorithms, control=None, time_limit=None):
+    """
+    Run several algorithms at the same time, each in its own process, on one matrix.
+
+    The solvers share the size of the best cover found so far: branch and bound prunes
+    against it, so the heuristics' covers speed up the exact search. The run stops as
+    soon as the best cover is proven optimal, either by an exact solver or because a
+    solver's lower bound meets it; the remaining solvers are then stopped. With a time
+    limit, every solver returns its best cover by the deadline.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param algorithms: Dictionary of solver names to functions taking (matrix, control=...).
+    :param control: Optional SolveControl for progress reports and cancellation.
+    :param time_limit: Optional wall-clock budget in seconds for the whole portfolio.
+    :return: Tuple of (SolverResult of the best cover, dictionary of solver names to
+             their own SolverResult). The best result's details record the winning
+             solver and the time, in seconds since the start, at which it finished.
+    """
+    control = (control or SolveControl()).with_time_limit(time_limit)
+    cover = as_cover_matrix(matrix)
+    start_time = time.perf_counter()
+
+    stop_event = multiprocessing.Event()
+    # No solver returns more rows than the matrix has, so this means "no cover yet"
+    incumbent = multiprocessing.Value('i', cover.num_rows + 1)
+    running = {}  # receiving connection -> (process, solver name)
+    for name, algorithm_function in algorithms.items():
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=_portfolio_worker,
+                                          args=(name, algorithm_function, cover, stop_event, incumbent,
+                                                control.remaining(), sender))
+        process.start()
+        sender.close()
+        running[receiver] = (process, name)
+
+    results = {}
+    errors = {}
+    finish_times = {}
+    best_bound = None
+    stop_deadline = None
+
+    while running:
+        for receiver in wait(list(running), POLL_INTERVAL):
+            process, name = running.pop(receiver)
+            try:
+                name, result, error = receiver.recv()
+            except EOFError:
+                result, error = None, f"solver exited with code {process.exitcode}"
+            receiver.close()
+            process.join()
+            finish_times[name] = time.perf_counter() - start_time
+            if result is None:
+                errors[name] = error
+                continue
+            results[name] = result
+            if result.lower_bound is not None and (best_bound is None or result.lower_bound > best_bound):
+                best_bound = result.lower_bound
+
+        best_size = min((result.objective for result in results.values()), default=None)
+        shared = incumbent.value
+        control.report(incumbent=shared if shared <= cover.num_rows else None, lower_bound=best_bound,
+                       finished=sorted(results))
+
+        proven = best_size is not None and best_bound is not None and best_bound >= best_size
+        if stop_deadline is None and control.should_stop():
+            # Cancelled or out of time: give the solvers a moment to return their best covers
+            stop_event.set()
+            stop_deadline = time.perf_counter() + STOP_GRACE_PERIOD
+        if proven or (stop_deadline is not None and time.perf_counter() >= stop_deadline):
+            # Nothing can beat a proven optimum, and solvers that cannot be interrupted
+            # (CBC) would not stop by themselves, so the remaining solvers are killed
+            stop_event.set()
+            for receiver, (process, name) in running.items():
+                kill_process_group(process)
+                receiver.close()
+                errors[name] = "stopped"
+            running.clear()
+
+    if not results:
+        raise ValueError("No solver in the portfolio returned a cover: "
+                         + "; ".join(f"{name}: {error}" for name, error in errors.items()))
+
+    # The smallest cover wins; among equal covers, the one found first
+    winner = min(results, key=lambda name: (results[name].objective, finish_times[name]))
+    best = results[winner]
+    if best_bound is not None and best_bound >= best.objective:
+        status = OPTIMAL
+    elif control.timed_out:
+        status = TIMEOUT
+    else:
+        status = FEASIBLE
+    portfolio_result = SolverResult(list(best.rows), status, best_bound, winner=winner,
+                                    winner_time=finish_times[winner],
+                                    total_time=time.perf_counter() - start_time,
+                                    finish_times=finish_times, errors=errors)
+    return portfolio_result, results
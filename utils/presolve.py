@@ -0,0 +1,232 @@
+# utils/presolve.py
+import time
+import numpy as np
+from utils.cover_matrix import as_cover_matrix
+
+# Largest number of candidate pairs a dominance test builds in one pass; beyond it
+# the test is skipped, since on large sparse instances it costs more than the solve
+# and rarely removes anything.
+DOMINANCE_MAX_PAIRS = 1 << 21
+
+
+class PresolveResult:
+    """
+    A reduced instance together with what is needed to map its solutions back.
+    """
+
+    def __init__(self, cover, fixed_rows, row_map, col_map, stats):
+        """
+        :param cover: The reduced CoverMatrix.
+        :param fixed_rows: Original indices of the rows that belong to every solution.
+        :param row_map: Original index of every row of the reduced matrix.
+        :param col_map: Original index of every column of the reduced matrix.
+        :param stats: Dictionary of reduction statistics.
+        """
+        self.cover = cover
+        self.fixed_rows = fixed_rows
+        self.row_map = row_map
+        self.col_map = col_map
+        self.stats = stats
+
+    def restore(self, rows):
+        """
+        Map a solution of the reduced matrix back to a solution of the original one.
+
+        :param rows: Row indices of the reduced matrix.
+        :return: Sorted list of original row indices, including the fixed rows.
+        """
+        return sorted(self.fixed_rows + [self.row_map[row] for row in rows])
+
+
+def _gather(ptr, idx, items):
+    """
+    Concatenated slices idx[ptr[i]:ptr[i + 1]] of the given items.
+
+    :return: Tuple of (NumPy array of entries, NumPy array of the slice lengths).
+    """
+    lengths = ptr[items + 1] - ptr[items]
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return idx[np.repeat(ptr[items], lengths) + offsets], lengths
+
+
+def _subset_pairs(item_ptr, item_idx, member_ptr, member_idx, item_alive, member_alive, max_pairs=None):
+    """
+    Pairs of live items (rows, or columns) where the live members of the first are a
+    subset of those of the second.
+
+    An item can only be contained in items sharing its member with the fewest live
+    items, so only those pairs are built. A 64-bit signature of every item (bit m % 64
+    set for each member m) rejects almost all of them at once; the rest are checked
+    one member at a time.
+
+    :param item_ptr: Pointer array of the item to members incidence.
+    :param item_idx: Member indices of the item to members incidence.
+    :param member_ptr: Pointer array of the member to items incidence.
+    :param member_idx: Item indices of the member to items incidence.
+    :param item_alive: Boolean array of the items still in the instance.
+    :param member_alive: Boolean array of the members still in the instance.
+    :param max_pairs: Optional limit on the number of candidate pairs.
+    :return: Tuple of NumPy arrays (subset items, superset items, whether the two are
+             equal), or None when there are more than max_pairs candidates.
+    """
+    num_items = len(item_ptr) - 1
+    num_members = len(member_ptr) - 1
+    nz_items = np.repeat(np.arange(num_items), np.diff(item_ptr))
+    live = item_alive[nz_items] & member_alive[item_idx]
+    items, members = nz_items[live], item_idx[live]
+    if not len(items):
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=bool)
+    sizes = np.bincount(items, minlength=num_items)
+    member_counts = np.bincount(members, minlength=num_members)
+    live_ptr = np.zeros(num_items + 1, dtype=np.int64)
+    np.cumsum(sizes, out=live_ptr[1:])
+    owners = np.flatnonzero(sizes)
+
+    # Pivot of every item: its member with the fewest live items
+    selectivity = member_counts[members] * num_members + members
+    pivots = np.minimum.reduceat(selectivity, live_ptr[owners]) % num_members
+    if max_pairs is not None and (member_ptr[pivots + 1] - member_ptr[pivots]).sum() > max_pairs:
+        return None
+
+    # Sorted (item, member) keys for membership tests
+    keys = np.sort(items * num_members + members)
+    bits = np.left_shift(np.uint64(1), (members % 64).astype(np.uint64))
+    signatures = np.zeros(num_items, dtype=np.uint64)
+    signatures[owners] = np.bitwise_or.reduceat(bits, live_ptr[owners])
+
+    # Candidate pairs, filtered with one lookup per superset: dead items get size -1
+    supersets, lengths = _gather(member_ptr, member_idx, pivots)
+    keep = np.where(item_alive, sizes, -1)[supersets] >= np.repeat(sizes[owners], lengths)
+    keep &= np.repeat(signatures[owners], lengths) & ~signatures[supersets] == 0
+    subsets, supersets = np.repeat(owners, lengths)[keep], supersets[keep]
+    keep = subsets != supersets
+    subsets, supersets = subsets[keep], supersets[keep]
+
+    for k in range(int(sizes.max())):
+        checked = sizes[subsets] > k
+        if not checked.any():
+            break
+        wanted = supersets[checked] * num_members + members[live_ptr[subsets[checked]] + k]
+        found = np.searchsorted(keys, wanted)
+        covered = np.ones(len(subsets), dtype=bool)
+        covered[checked] = keys[np.minimum(found, len(keys) - 1)] == wanted
+        subsets, supersets = subsets[covered], supersets[covered]
+    return subsets, supersets, sizes[subsets] == sizes[supersets]
+
+
+def presolve(matrix, max_pairs=DOMINANCE_MAX_PAIRS):
+    """
+    Shrink a coverage instance without changing its optimal cover size.
+
+    The following reductions are repeated until none of them applies:
+
+    - empty rows are removed;
+    - essential rows (the only row covering some column) are fixed into the solution
+      and the columns they cover are removed;
+    - duplicate and dominated rows (rows whose columns are a subset of another row's)
+      are removed, keeping the lowest index among identical rows;
+    - duplicate and dominated columns (columns covered by every row that covers some
+      other column) are removed, since covering the other column covers them too.
+
+    Every reduction works on the column incidence arrays of the CoverMatrix with NumPy
+    counts, so a pass costs a few array operations per nonzero and per candidate pair
+    of the dominance tests.
+
+    :param matrix: A CoverMatrix or a 2D list of integers representing the matrix.
+    :param max_pairs: Optional limit on the candidate pairs of a dominance test; a
+                      test with more is skipped for that pass (counted in
+                      stats['skipped_dominance']).
+    :return: A PresolveResult.
+    """
+    start_time = time.perf_counter()
+    cover = as_cover_matrix(matrix)
+
+    uncoverable = cover.uncoverable_columns()
+    if uncoverable:
+        raise ValueError(f"Columns {uncoverable} cannot be covered by any row")
+
+    num_rows, num_cols = cover.num_rows, cover.num_cols
+    # Column to rows incidence (compressed sparse columns) and its transpose
+    col_ptr, col_idx = cover.col_ptr, cover.col_idx.astype(np.int64)
+    row_ptr, row_idx = cover.row_ptr, cover.row_idx
+    nz_cols = np.repeat(np.arange(num_cols), np.diff(col_ptr))
+    nz_rows = col_idx
+
+    row_alive = np.ones(num_rows, dtype=bool)  # Rows still in the instance
+    col_alive = np.ones(num_cols, dtype=bool)  # Columns still to be covered
+    fixed_rows = []
+    stats = {
+        'original_rows': num_rows,
+        'original_cols': num_cols,
+        'empty_rows': 0,
+        'essential_rows': 0,
+        'dominated_rows': 0,
+        'dominated_cols': 0,
+        'passes': 0,
+        'skipped_dominance': 0,
+    }
+
+    changed = True
+    while changed:
+        changed = False
+        stats['passes'] += 1
+
+        # Empty rows cover nothing that is left.
+        live = col_alive[nz_cols]
+        empty = row_alive & (np.bincount(nz_rows, weights=live, minlength=num_rows) == 0)
+        if empty.any():
+            row_alive &= ~empty
+            stats['empty_rows'] += int(np.count_nonzero(empty))
+            changed = True
+
+        # Essential rows: a column covered by a single row forces that row.
+        live = row_alive[nz_rows] & col_alive[nz_cols]
+        single = col_alive & (np.bincount(nz_cols, weights=live, minlength=num_cols) == 1)
+        if single.any():
+            essential = np.unique(nz_rows[live & single[nz_cols]])
+            fixed_rows.extend(essential.tolist())
+            row_alive[essential] = False
+            col_alive[_gather(row_ptr, row_idx, essential)[0]] = False
+            stats['essential_rows'] += len(essential)
+            changed = True
+
+        # Dominated rows, the higher index of identical ones.
+        pairs = _subset_pairs(row_ptr, row_idx, col_ptr, col_idx, row_alive, col_alive, max_pairs)
+        if pairs is None:
+            stats['skipped_dominance'] += 1
+            pairs = (np.zeros(0, dtype=np.int64),) * 2 + (np.zeros(0, dtype=bool),)
+        subsets, supersets, equal = pairs
+        dominated = np.unique(subsets[~equal | (supersets < subsets)])
+        if len(dominated):
+            row_alive[dominated] = False
+            stats['dominated_rows'] += len(dominated)
+            changed = True
+
+        # Dominated columns: a column covered by a superset of another column's rows is
+        # implied by it; the higher index of identical ones.
+        pairs = _subset_pairs(col_ptr, col_idx, row_ptr, row_idx, col_alive, row_alive, max_pairs)
+        if pairs is None:
+            stats['skipped_dominance'] += 1
+            pairs = (np.zeros(0, dtype=np.int64),) * 2 + (np.zeros(0, dtype=bool),)
+        subsets, supersets, equal = pairs
+        dominated = np.unique(supersets[~equal | (subsets < supersets)])
+        if len(dominated):
+            col_alive[dominated] = False
+            stats['dominated_cols'] += len(dominated)
+            changed = True
+
+    row_map = np.flatnonzero(row_alive).tolist()
+    col_map = np.flatnonzero(col_alive).tolist()
+    if not col_map:
+        row_map = []  # Everything is covered by the fixed rows
+    if len(row_map) == num_rows and len(col_map) == num_cols:
+        reduced = cover  # Nothing to reduce: skip rebuilding the same matrix
+    else:
+        reduced = cover.submatrix(row_map, col_map)
+
+    stats['reduced_rows'] = reduced.num_rows
+    stats['reduced_cols'] = reduced.num_cols
+    stats['fixed_rows'] = len(fixed_rows)
+    stats['time'] = time.perf_counter() - start_time
+    return PresolveResult(reduced, fixed_rows, row_map, col_map, stats)
@@ -0,0 +1,27 @@
+# utils/processes.py
+import os
+import signal
+
+
+def start_process_group():
+    """
+    Make the calling worker process the leader of its own process group, so that
+    kill_process_group also stops the subprocesses it starts (such as CBC). Does
+    nothing on platforms without process groups.
+    """
+    if hasattr(os, 'setsid'):
+        os.setsid()
+
+
+def kill_process_group(process):
+    """
+    Stop a worker process together with any subprocess it started.
+
+    :param process: A started multiprocessing.Process that called start_process_group.
+    """
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError):
+        # No process group (yet, or not on this platform): stop the worker alone
+        process.terminate()
+    process.join()
@@ -1,9 +1,19 @@
 import tkinter as tk
-from tkinter import messagebox
-import random  # Needed for random matrix generation
-from model import visualize_matrix, compare_algorithms_performance  # Importing the functions
+from tkinter import filedialog, messagebox
+from utils.generators import random_matrix, feasible_matrix, planted_matrix
+from model import MatrixRasterPlot, compare_algorithms_performance  # Importing the functions
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.figure import Figure
+
+# Generated matrices with more cells than this skip the text area: the array goes to
+# the model directly and the text area only shows its top-left corner.
+MAX_TEXT_CELLS = 10000
+PREVIEW_ROWS = 20
+PREVIEW_COLS = 40
+
+# Families of random matrices offered by the generator.
+MATRIX_FAMILIES = ["Random", "Feasible", "Planted optimum"]
 
 
 class MatrixView:
@@ -18,12 +28,35 @@ class MatrixView:
         algorithm_frame.pack(fill='x', **padding)
 
         # Multi-select Listbox for algorithm selection
-        self.algorithm_options = ["Branch and Bound", "Greedy", "Genetic Algorithm", "Linear Programming"]
-        self.algorithm_listbox = tk.Listbox(algorithm_frame, selectmode=tk.MULTIPLE, height=4)
+        self.algorithm_options = ["Branch and Bound", "Greedy", "Genetic Algorithm", "Linear Programming",
+                                  "Lagrangian Relaxation", "Dynamic Programming", "LP Rounding"]
+        self.algorithm_listbox = tk.Listbox(algorithm_frame, selectmode=tk.MULTIPLE, height=7)
         for algorithm in self.algorithm_options:
             self.algorithm_listbox.insert(tk.END, algorithm)
         self.algorithm_listbox.pack(fill='x', expand=True)
 
+        # Run the selected algorithms at the same time instead of one after another
+        self.concurrent_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(algorithm_frame, text="Run selected algorithms concurrently",
+                       variable=self.concurrent_var).pack(anchor='w')
+
+        # Shrink the covers found with a short local search
+        self.improve_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(algorithm_frame, text="Improve covers with local search",
+                       variable=self.improve_var).pack(anchor='w')
+
+        # Peak memory is measured with tracemalloc, which slows the solvers down
+        self.trace_memory_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(algorithm_frame, text="Measure peak memory (slower)",
+                       variable=self.trace_memory_var).pack(anchor='w')
+
+        # Optional time budget; each algorithm returns its best cover when it runs out
+        time_limit_frame = tk.Frame(algorithm_frame)
+        time_limit_frame.pack(fill='x')
+        tk.Label(time_limit_frame, text="Time limit (s):").pack(side='left')
+        self.time_limit_input = tk.Entry(time_limit_frame, width=8)
+        self.time_limit_input.pack(side='left')
+
         # Inputs for random matrix generation
         matrix_frame = tk.Frame(self.root)
         matrix_frame.pack(fill='x', **padding)
@@ -36,10 +69,26 @@ class MatrixView:
         self.columns_input = tk.Entry(matrix_frame)  # Input for number of columns
         self.columns_input.grid(row=1, column=1, sticky='ew')
 
+        tk.Label(matrix_frame, text="Density:").grid(row=2, column=0, sticky='w')  # Probability of a one
+        self.density_input = tk.Entry(matrix_frame)
+        self.density_input.insert(0, "0.5")
+        self.density_input.grid(row=2, column=1, sticky='ew')
+
+        tk.Label(matrix_frame, text="Seed:").grid(row=3, column=0, sticky='w')  # Optional, for repeatable matrices
+        self.seed_input = tk.Entry(matrix_frame)
+        self.seed_input.grid(row=3, column=1, sticky='ew')
+
+        tk.Label(matrix_frame, text="Family:").grid(row=4, column=0, sticky='w')
+        self.family_var = tk.StringVar(value=MATRIX_FAMILIES[0])
+        tk.OptionMenu(matrix_frame, self.family_var, *MATRIX_FAMILIES).grid(row=4, column=1, sticky='w')
+
         matrix_frame.grid_columnconfigure(1, weight=1)  
         # Button to generate a random matrix
         self.generate_button = tk.Button(matrix_frame, text="Generate Random Matrix", command=self.generate_random_matrix)
-        self.generate_button.grid(row=2, column=0, columnspan=2, sticky='ew', **padding)
+        self.generate_button.grid(row=5, column=0, columnspan=2, sticky='ew', **padding)
+
+        self.generated_matrix = None  # Large generated array, shown only as a preview.
+        self.generated_text = None  # The preview text of generated_matrix.
         
         
         matrix_input_frame = tk.Frame(self.root)
@@ -62,6 +111,16 @@ class MatrixView:
          # Add a button to trigger the performance comparison
         self.compare_performance_button = tk.Button(action_button_frame, text="Compare Performance" )
         self.compare_performance_button.pack(side='left', expand=True, **padding) # or grid() depending on your layout
+        # Button to save the metrics of every run as JSON; the command is set by the controller
+        self.export_metrics_button = tk.Button(action_button_frame, text="Export Metrics")
+        self.export_metrics_button.pack(side='left', expand=True, **padding)
+        # Button to stop a running calculation; enabled only while one is running
+        self.cancel_button = tk.Button(action_button_frame, text="Cancel", state=tk.DISABLED)
+        self.cancel_button.pack(side='left', expand=True, **padding)
+
+        # Progress of the running calculation
+        self.progress_var = tk.StringVar()
+        tk.Label(self.root, textvariable=self.progress_var, anchor='w').pack(fill='x', **padding)
         
         
        
@@ -70,21 +129,40 @@ class MatrixView:
 
     def generate_random_matrix(self):
         """
-        Generates a random matrix based on the input dimensions and range.
+        Generates a random matrix based on the input dimensions, density, seed and family.
+
+        Small matrices are written to the text area. Larger ones are kept as an array
+        and handed to the model as is, with only a preview in the text area.
         """
         try:
             rows = int(self.rows_input.get())
             cols = int(self.columns_input.get())
-         
+            density = float(self.density_input.get())
+            seed_text = self.seed_input.get().strip()
+            seed = int(seed_text) if seed_text else None
 
-            if rows <= 0 or cols <= 0:
-                raise ValueError("Number of rows and columns must be positive integers.")
-  
             # Generate the random matrix
-            matrix = [[random.randint(0, 1) for _ in range(cols)] for _ in range(rows)]
+            family = self.family_var.get()
+            if family == "Feasible":
+                matrix = feasible_matrix(rows, cols, density, seed)
+            elif family == "Planted optimum":
+                # A cover of a tenth of the rows or columns, known to be minimum
+                matrix, _ = planted_matrix(rows, cols, max(1, min(rows, cols) // 10), density, seed)
+            else:
+                matrix = random_matrix(rows, cols, density, seed)
 
-            # Convert the matrix to a string format and set it in the matrix_input text field
-            matrix_str = '\n'.join([' '.join(map(str, row)) for row in matrix])
+            if matrix.size > MAX_TEXT_CELLS:
+                self.generated_matrix = matrix
+                preview = matrix[:PREVIEW_ROWS, :PREVIEW_COLS]
+                matrix_str = '\n'.join(' '.join(map(str, row)) for row in preview.tolist())
+                matrix_str = (f"# Generated {rows}x{cols} matrix; only the top-left corner is shown.\n"
+                              f"# Replace this text to enter another matrix.\n{matrix_str}")
+            else:
+                self.generated_matrix = None
+                matrix_str = '\n'.join(' '.join(map(str, row)) for row in matrix.tolist())
+            self.generated_text = matrix_str
+
+            # Set the matrix string in the matrix_input text field
             self.matrix_input.delete("1.0", tk.END)  # Clear the current content
             self.matrix_input.insert("1.0", matrix_str)  # Insert the new random matrix
 
@@ -96,10 +174,15 @@ class MatrixView:
     def get_matrix_input(self):
         """
         Retrieves and processes the matrix input from the GUI.
+
+        :return: A list of lists, or the generated NumPy array while its preview is
+                 shown unchanged.
         """
         try:
             # Get input from Text widget and convert to 2D list (matrix).
             matrix_str = self.matrix_input.get("1.0", tk.END).strip()
+            if self.generated_matrix is not None and matrix_str == self.generated_text:
+                return self.generated_matrix
             matrix = [list(map(int, row.split())) for row in matrix_str.split('\n') if row]
             return matrix
         except ValueError:
@@ -113,12 +196,69 @@ class MatrixView:
         """
         return [self.algorithm_options[index] for index in self.algorithm_listbox.curselection()]
 
+    def get_time_limit(self):
+        """
+        Retrieves the time limit per algorithm entered by the user.
+
+        :return: The time limit in seconds, or None when the field is empty.
+        """
+        text = self.time_limit_input.get().strip()
+        if not text:
+            return None
+        try:
+            time_limit = float(text)
+        except ValueError:
+            raise ValueError("Time limit must be a number of seconds")
+        if time_limit <= 0:
+            raise ValueError("Time limit must be positive")
+        return time_limit
+
+    def get_improve(self):
+        """
+        Whether the covers should be improved by local search after solving.
+        """
+        return self.improve_var.get()
+
+    def get_trace_memory(self):
+        """
+        Whether the peak memory of the solvers should be measured.
+        """
+        return self.trace_memory_var.get()
+
+    def ask_metrics_path(self):
+        """
+        Asks where to save the metrics.
+
+        :return: The chosen path, or an empty string when cancelled.
+        """
+        return filedialog.asksaveasfilename(title="Export Metrics", defaultextension=".json",
+                                            filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+
+    def get_concurrent(self):
+        """
+        Whether the selected algorithms should run concurrently as a portfolio.
+        """
+        return self.concurrent_var.get()
+
     def show_result(self, message):
         """
         Displays the result message to the user.
         """
         messagebox.showinfo("Result", message)
 
+    def set_running(self, running):
+        """
+        Switch the buttons between the idle state and the calculation-running state.
+        """
+        self.submit_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
+
+    def show_progress(self, message):
+        """
+        Displays the progress of the running calculation.
+        """
+        self.progress_var.set(message)
+
     def show_error(self, message):
         """
         Displays an error message to the user.
@@ -127,26 +267,52 @@ class MatrixView:
 
     def on_visualize(self, matrix, coverage_rows):
         """
-        Trigger the visualization for the current matrix and its coverage rows.
+        Show the matrix with its coverage rows highlighted in a new window.
 
-        :param matrix: The matrix data to visualize.
+        Large matrices are drawn max-pooled; zooming or panning with the toolbar renders
+        the visible part again in more detail.
+
+        :param matrix: The CoverMatrix to visualize.
         :param coverage_rows: The rows in the matrix that are part of the coverage.
         """
-        visualize_matrix(matrix, coverage_rows)  # Call the visualization function with the provided data
+        plot_window = tk.Toplevel(self.root)
+        plot_window.title("Matrix Coverage")
+
+        # A standalone Figure, not pyplot, so closing the window frees it
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.set_title(f"{matrix.num_rows}x{matrix.num_cols} matrix, {len(coverage_rows)} coverage rows")
+        canvas = FigureCanvasTkAgg(fig, master=plot_window)
+        # Keep the plot alive with its window; it re-renders on zoom and pan
+        plot_window.raster_plot = MatrixRasterPlot(ax, matrix, coverage_rows)
+        NavigationToolbar2Tk(canvas, plot_window).update()
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill='both', expand=True)
     # You might also have a function to trigger the performance comparison visualization
   
 
-    def display_performance_plot(self, names, values):
+    def display_performance_plot(self, metrics, metric_names):
+        """
+        Chart several metrics side by side for any number of algorithms.
+
+        :param metrics: Dictionary of algorithm names to their metrics dictionaries.
+        :param metric_names: List of (metric key, axis label) pairs, one chart each.
+        """
         # Create a new top-level window for the plot
         plot_window = tk.Toplevel(self.root)
         plot_window.title("Performance Comparison")
-        
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.bar(names, values, color=['red', 'green', 'blue', 'cyan'])
-        ax.set_ylabel('Execution Time (s)')
-        ax.set_xlabel('Algorithms')
-        ax.set_title('Performance Comparison')
+
+        names = list(metrics)
+        colors = plt.cm.tab10.colors
+        fig = Figure(figsize=(4 * len(metric_names), 4.5))
+        for index, (key, label) in enumerate(metric_names):
+            ax = fig.add_subplot(1, len(metric_names), index + 1)
+            values = [metrics[name].get(key) or 0 for name in names]
+            ax.bar(range(len(names)), values, color=[colors[i % len(colors)] for i in range(len(names))])
+            ax.set_xticks(range(len(names)), names, rotation=30, ha='right')
+            ax.set_title(label)
+        fig.tight_layout()
 
         canvas = FigureCanvasTkAgg(fig, master=plot_window)  # Creating the canvas to embed the plot in the tkinter window
         canvas.draw()
-        canvas.get_tk_widget().pack()
\ No newline at end of file
+        canvas.get_tk_widget().pack(fill='both', expand=True)